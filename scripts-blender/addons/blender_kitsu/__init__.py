@@ -24,6 +24,7 @@ from blender_kitsu import (
     lookdev,
     bkglobals,
     types,
+    background,
     cache,
     models,
     playblast,
@@ -66,6 +67,7 @@ if _need_reload:
 
     lookdev.reload()
     bkglobals = importlib.reload(bkglobals)
+    background = importlib.reload(background)
     cache = importlib.reload(cache)
     types = importlib.reload(types)
     models = importlib.reload(models)
@@ -86,6 +88,7 @@ if _need_reload:
 def register():
     lookdev.register()
     prefs.register()
+    background.register()
     cache.register()
     props.register()
     sqe.register()
@@ -111,6 +114,7 @@ def unregister():
     sqe.unregister()
     props.unregister()
     cache.unregister()
+    background.unregister()
     prefs.unregister()
     lookdev.unregister()
     playblast.unregister()
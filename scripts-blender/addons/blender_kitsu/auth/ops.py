@@ -60,6 +60,12 @@ class KITSU_OT_session_start(bpy.types.Operator):
             logger.error("Login data not correct")
             return {"CANCELLED"}
 
+        # Init persistent cache before anything is fetched.
+        cache.init_persistent_cache(context)
+
+        # Keep cache in sync with changes made on the server.
+        cache.event_listener_start()
+
         # Init cache variables, will skip if cache already initiated.
         cache.init_cache_variables()
 
@@ -117,6 +123,8 @@ class KITSU_OT_session_end(bpy.types.Operator):
     def execute(self, context: bpy.types.Context) -> Set[str]:
         session = prefs.session_get(context)
         session.end()
+        cache.event_listener_stop()
+        gazu.cache.disable_persistent()
 
         # Clear cache variables.
         cache.clear_cache_variables()
@@ -0,0 +1,244 @@
+# ***** BEGIN GPL LICENSE BLOCK *****
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# ***** END GPL LICENCE BLOCK *****
+#
+# (c) 2021, Blender Foundation - Paul Golter
+
+"""
+Runs Kitsu requests on worker threads so they don't freeze the interface.
+
+A job function runs on a worker thread and must not touch Blender data. Its
+result is handed to the on_done callback, which is called on the main thread
+by a bpy.app.timers function, where it is safe to write Blender data.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import bpy
+
+from blender_kitsu import bkglobals, util
+from blender_kitsu.logger import LoggerFactory
+
+logger = LoggerFactory.getLogger()
+
+_executor: Optional[ThreadPoolExecutor] = None
+_jobs: Dict[str, "BackgroundJob"] = {}
+_status_bar_state: Tuple[Tuple[str, float, str], ...] = ()
+
+
+class JobCancelledException(Exception):
+    """
+    Raised by BackgroundJob.check_cancelled() to stop a cancelled job.
+    """
+
+    pass
+
+
+class BackgroundJob:
+    """
+    Handle of a function running on a worker thread. The function gets the job
+    as first argument to report progress and check for cancellation.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ):
+        self.name = name
+        self.func = func
+        self.on_done = on_done
+        self.on_error = on_error
+        self.progress = 0.0
+        self.progress_text = ""
+        self.future: Optional[Future] = None
+        self._cancel_event = threading.Event()
+
+    def report_progress(self, progress: float, text: str = "") -> None:
+        """
+        Sets progress of the job between 0 and 1. Can be called from the
+        worker thread.
+        """
+        self.progress = progress
+        self.progress_text = text
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+        if self.future:
+            self.future.cancel()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self) -> None:
+        if self.is_cancelled:
+            raise JobCancelledException(self.name)
+
+    @property
+    def is_done(self) -> bool:
+        return bool(self.future and self.future.done())
+
+    def _run(self, *args: Any, **kwargs: Any) -> Any:
+        self.check_cancelled()
+        return self.func(self, *args, **kwargs)
+
+    def _finish(self) -> None:
+        """
+        Calls the callbacks of a done job, on the main thread.
+        """
+        if self.is_cancelled:
+            logger.debug("Background job %s cancelled", self.name)
+            return
+
+        exception = self.future.exception()
+        if exception is None:
+            logger.debug("Background job %s finished", self.name)
+            if self.on_done:
+                self.on_done(self.future.result())
+        elif isinstance(exception, JobCancelledException):
+            logger.debug("Background job %s cancelled", self.name)
+        elif self.on_error:
+            self.on_error(exception)
+        else:
+            logger.error(
+                "Background job %s failed",
+                self.name,
+                exc_info=(type(exception), exception, exception.__traceback__),
+            )
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=bkglobals.BACKGROUND_MAX_WORKERS,
+            thread_name_prefix="blender_kitsu",
+        )
+    return _executor
+
+
+def _pump() -> Optional[float]:
+    """
+    Timer function that finishes done jobs on the main thread. Unregisters
+    itself when no job is left.
+    """
+    for name, job in list(_jobs.items()):
+        if not job.is_done:
+            continue
+        if _jobs.get(name) is job:
+            del _jobs[name]
+        try:
+            job._finish()
+        except Exception:
+            logger.exception("Failed to finish background job %s", name)
+        util.ui_redraw()
+
+    _update_status_bar()
+
+    if not _jobs:
+        return None
+    return bkglobals.BACKGROUND_PUMP_INTERVAL
+
+
+def _update_status_bar() -> None:
+    """
+    Redraws the status bar, which shows the running jobs, if one of them
+    changed. It isn't part of the screen areas, setting its text redraws it.
+    """
+    global _status_bar_state
+
+    state = tuple((job.name, job.progress, job.progress_text) for job in _jobs.values())
+    if state == _status_bar_state:
+        return
+    _status_bar_state = state
+
+    for window in bpy.context.window_manager.windows:
+        window.workspace.status_text_set_internal(None)
+
+
+def submit(
+    name: str,
+    func: Callable[..., Any],
+    *args: Any,
+    on_done: Optional[Callable[[Any], None]] = None,
+    on_error: Optional[Callable[[Exception], None]] = None,
+    **kwargs: Any,
+) -> BackgroundJob:
+    """
+    Runs func(job, *args, **kwargs) on a worker thread. A running job with the
+    same name is cancelled, its callbacks won't be called anymore.
+    """
+    cancel(name)
+
+    job = BackgroundJob(name, func, on_done=on_done, on_error=on_error)
+    _jobs[name] = job
+    job.future = _get_executor().submit(job._run, *args, **kwargs)
+
+    if not bpy.app.timers.is_registered(_pump):
+        # Persistent, jobs keep running when another file is loaded.
+        bpy.app.timers.register(
+            _pump, first_interval=bkglobals.BACKGROUND_PUMP_INTERVAL, persistent=True
+        )
+    logger.debug("Submitted background job %s", name)
+    return job
+
+
+def get_job(name: str) -> Optional[BackgroundJob]:
+    return _jobs.get(name)
+
+
+def is_running(name: str) -> bool:
+    return name in _jobs
+
+
+def get_running_jobs() -> List[BackgroundJob]:
+    return list(_jobs.values())
+
+
+def cancel(name: str) -> None:
+    job = _jobs.pop(name, None)
+    if job:
+        job.cancel()
+        logger.debug("Cancelled background job %s", name)
+
+
+def cancel_all() -> None:
+    for name in list(_jobs):
+        cancel(name)
+
+
+# ---------REGISTER ----------.
+
+
+def register():
+    pass
+
+
+def unregister():
+    global _executor
+
+    cancel_all()
+    if bpy.app.timers.is_registered(_pump):
+        bpy.app.timers.unregister(_pump)
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
@@ -25,6 +25,28 @@ FPS = 24
 VERSION_PATTERN = r"v\d\d\d"
 FRAME_START = 101
 
+# Maximum number of concurrent requests when syncing many shots with the server.
+SQE_SYNC_MAX_WORKERS = 8
+
+# Time in seconds after which the index of the active project is loaded again.
+PROJECT_INDEX_EXPIRE = 120
+
+# Time in seconds to wait before loading the index again after loading failed.
+PROJECT_INDEX_RETRY_DELAY = 30
+
+# Time in seconds between two requests for new events on the server, which are
+# used to invalidate the cache entries of changed entities.
+EVENT_POLL_INTERVAL = 10
+
+# Number of worker threads for Kitsu requests running in the background and time
+# in seconds between two checks for finished requests on the main thread.
+BACKGROUND_MAX_WORKERS = 4
+BACKGROUND_PUMP_INTERVAL = 0.1
+
+# Maximum number of media folders that are listed at the same time when scanning
+# for media updates.
+MEDIA_SCAN_MAX_WORKERS = 8
+
 SHOT_DIR_NAME = "shots"
 ASSET_DIR_NAME = "lib"
 
@@ -82,3 +104,24 @@ RES_DIR_PATH = Path(os.path.abspath(__file__)).parent.joinpath("res")
 
 SCENE_NAME_PLAYBLAST = "playblast_playback"
 PLAYBLAST_DEFAULT_STATUS = "Todo"
+
+# Encoder settings of background playblasts, matching the H264 'High Quality'
+# preset of Blender. Pad filter makes sure the resolution is divisible by 2.
+PLAYBLAST_FFMPEG_VIDEO_ARGS = [
+    "-c:v",
+    "libx264",
+    "-crf",
+    "20",
+    "-preset",
+    "fast",
+    "-pix_fmt",
+    "yuv420p",
+    "-vf",
+    "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+]
+PLAYBLAST_FFMPEG_AUDIO_ARGS = ["-c:a", "aac", "-b:a", "192k"]
+
+# Image format and PNG compression of frames rendered for background playblasts.
+# Low compression as frames are deleted right after encoding.
+PLAYBLAST_FRAME_FILE_FORMAT = "PNG"
+PLAYBLAST_FRAME_COMPRESSION = 0
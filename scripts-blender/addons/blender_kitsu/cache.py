@@ -18,7 +18,10 @@
 #
 # (c) 2021, Blender Foundation - Paul Golter
 
-from typing import Any, List, Union, Dict, Tuple
+import queue
+import threading
+import time
+from typing import Any, List, Optional, Union, Dict, Tuple
 
 import bpy
 
@@ -36,7 +39,9 @@ from blender_kitsu.types import (
     TaskStatus,
     Cache,
     User,
+    ProjectIndex,
 )
+from blender_kitsu import gazu, bkglobals, background
 from blender_kitsu.logger import LoggerFactory
 from blender_kitsu.gazu.exception import RouteNotFoundException
 
@@ -52,8 +57,31 @@ _asset_type_active: AssetType = AssetType()
 _task_type_active: TaskType = TaskType()
 _user_active: User = User()
 _user_all_tasks: List[Task] = []
+# Validators of the last response for the tasks of the active user, to only
+# update the tasks when they changed on the server.
+_user_all_tasks_validators: Dict[str, Optional[str]] = {}
+_project_index: Optional[ProjectIndex] = None
+# Time the index of the active project last failed to load, 0 if it didn't.
+_project_index_failed_at: float = 0.0
 
 _cache_initialized: bool = False
+
+# EVENT LISTENER
+# date of the last server event that was applied, None if listener is stopped
+_event_cursor: Optional[str] = None
+_event_thread: Optional[threading.Thread] = None
+# results of _fetch_server_events, applied on the main thread
+_event_results: "queue.Queue[Tuple[Any, ...]]" = queue.Queue()
+# active entities that are fetched again when an event changed them:
+# (entity type, name of the cache variable, name for logging)
+_event_active_entities: List[Tuple[Any, str, str]] = [
+    (Project, "_project_active", "project"),
+    (Sequence, "_sequence_active", "sequence"),
+    (Shot, "_shot_active", "shot"),
+    (Asset, "_asset_active", "asset"),
+    (AssetType, "_asset_type_active", "asset type"),
+    (TaskType, "_task_type_active", "task type"),
+]
 _cache_startup_initialized: bool = False
 
 _sequence_enum_list: List[Tuple[str, str, str]] = []
@@ -86,6 +114,84 @@ def project_active_get() -> Project:
     return _project_active
 
 
+def project_index_get() -> Optional[ProjectIndex]:
+    """
+    Returns the index of the active project. It is loaded in the background on
+    first access and when the active project changed or the index expired.
+    Never blocks, so it can be used in draw code and enum callbacks. Returns
+    the expired index or None while loading, callers fall back to requests.
+    """
+    if not _project_active:
+        return None
+
+    index = _project_index
+    if index is not None and index.project.id != _project_active.id:
+        index = None
+
+    if index is None or index.is_expired(bkglobals.PROJECT_INDEX_EXPIRE):
+        project_index_load_background()
+
+    return index
+
+
+def _load_project_index(
+    job: background.BackgroundJob, project: Project
+) -> ProjectIndex:
+    return ProjectIndex(project)
+
+
+def _set_project_index(index: ProjectIndex) -> None:
+    global _project_index
+    global _project_index_failed_at
+
+    # Active project might have changed while loading.
+    if index.project.id == _project_active.id:
+        _project_index = index
+        _project_index_failed_at = 0.0
+
+
+def _on_project_index_error(exception: Exception) -> None:
+    global _project_index_failed_at
+
+    _project_index_failed_at = time.time()
+    logger.error(
+        "Failed to load index of %s. Retrying in %is",
+        _project_active.name,
+        bkglobals.PROJECT_INDEX_RETRY_DELAY,
+        exc_info=(type(exception), exception, exception.__traceback__),
+    )
+
+
+def project_index_load_background() -> None:
+    """
+    Loads the index of the active project on a worker thread, so selecting a
+    project doesn't block the interface. Does nothing if it is already loading
+    or loading failed recently.
+    """
+    if not _project_active or background.is_running("project_index"):
+        return
+
+    if time.time() < _project_index_failed_at + bkglobals.PROJECT_INDEX_RETRY_DELAY:
+        return
+
+    background.submit(
+        "project_index",
+        _load_project_index,
+        _project_active,
+        on_done=_set_project_index,
+        on_error=_on_project_index_error,
+    )
+
+
+def project_index_reset() -> None:
+    global _project_index
+    global _project_index_failed_at
+    background.cancel("project_index")
+    _project_index = None
+    _project_index_failed_at = 0.0
+    logger.debug("Reset project index")
+
+
 def project_active_set_by_id(context: bpy.types.Context, entity_id: str) -> None:
     global _project_active
 
@@ -93,11 +199,16 @@ def project_active_set_by_id(context: bpy.types.Context, entity_id: str) -> None
     _addon_prefs_get(context).project_active_id = entity_id
     logger.debug("Set active project to %s", _project_active.name)
 
+    if _project_index is None or _project_index.project.id != entity_id:
+        project_index_reset()
+        project_index_load_background()
+
 
 def project_active_reset(context: bpy.types.Context) -> None:
     global _project_active
     _project_active = Project()
     _addon_prefs_get(context).project_active_id = ""
+    project_index_reset()
     logger.debug("Reset active project")
 
 
@@ -108,7 +219,9 @@ def sequence_active_get() -> Sequence:
 def sequence_active_set_by_id(context: bpy.types.Context, entity_id: str) -> None:
     global _sequence_active
 
-    _sequence_active = Sequence.by_id(entity_id)
+    index = project_index_get()
+    entity = index.get_sequence(entity_id) if index else None
+    _sequence_active = entity or Sequence.by_id(entity_id)
     context.scene.kitsu.sequence_active_id = entity_id
     logger.debug("Set active sequence to %s", _sequence_active.name)
 
@@ -138,7 +251,9 @@ def shot_active_pull_update() -> Shot:
 def shot_active_set_by_id(context: bpy.types.Context, entity_id: str) -> None:
     global _shot_active
 
-    _shot_active = Shot.by_id(entity_id)
+    index = project_index_get()
+    entity = index.get_shot(entity_id) if index else None
+    _shot_active = entity or Shot.by_id(entity_id)
     context.scene.kitsu.shot_active_id = entity_id
     logger.debug("Set active shot to %s", _shot_active.name)
 
@@ -160,7 +275,9 @@ def asset_active_get() -> Asset:
 def asset_active_set_by_id(context: bpy.types.Context, entity_id: str) -> None:
     global _asset_active
 
-    _asset_active = Asset.by_id(entity_id)
+    index = project_index_get()
+    entity = index.get_asset(entity_id) if index else None
+    _asset_active = entity or Asset.by_id(entity_id)
     context.scene.kitsu.asset_active_id = entity_id
     logger.debug("Set active asset to %s", _asset_active.name)
 
@@ -182,7 +299,9 @@ def asset_type_active_get() -> AssetType:
 def asset_type_active_set_by_id(context: bpy.types.Context, entity_id: str) -> None:
     global _asset_type_active
 
-    _asset_type_active = AssetType.by_id(entity_id)
+    index = project_index_get()
+    entity = index.get_asset_type(entity_id) if index else None
+    _asset_type_active = entity or AssetType.by_id(entity_id)
     context.scene.kitsu.asset_type_active_id = entity_id
     logger.debug("Set active asset type to %s", _asset_type_active.name)
 
@@ -204,7 +323,9 @@ def task_type_active_get() -> TaskType:
 def task_type_active_set_by_id(context: bpy.types.Context, entity_id: str) -> None:
     global _task_type_active
 
-    _task_type_active = TaskType.by_id(entity_id)
+    index = project_index_get()
+    entity = index.get_task_type(entity_id) if index else None
+    _task_type_active = entity or TaskType.by_id(entity_id)
     context.scene.kitsu.task_type_active_id = entity_id
     logger.debug("Set active task type to %s", _task_type_active.name)
 
@@ -242,13 +363,13 @@ def get_sequences_enum_list(
     if not project_active:
         return []
 
-    _sequence_enum_list.clear()
-    _sequence_enum_list.extend(
-        [
-            (s.id, s.name, s.description or "")
-            for s in project_active.get_sequences_all()
-        ]
+    index = project_index_get()
+    sequences = (
+        index.get_sequences_all() if index else project_active.get_sequences_all()
     )
+
+    _sequence_enum_list.clear()
+    _sequence_enum_list.extend([(s.id, s.name, s.description or "") for s in sequences])
     return _sequence_enum_list
 
 
@@ -262,10 +383,14 @@ def get_shots_enum_for_active_seq(
     if not zseq_active:
         return []
 
+    index = project_index_get()
+    if index:
+        shots = index.get_shots_for_sequence(zseq_active)
+    else:
+        shots = zseq_active.get_all_shots()
+
     _shot_enum_list.clear()
-    _shot_enum_list.extend(
-        [(s.id, s.name, s.description or "") for s in zseq_active.get_all_shots()]
-    )
+    _shot_enum_list.extend([(s.id, s.name, s.description or "") for s in shots])
     return _shot_enum_list
 
 
@@ -278,10 +403,14 @@ def get_assetypes_enum_list(
     if not project_active:
         return []
 
+    index = project_index_get()
+    if index:
+        asset_types = index.get_all_asset_types()
+    else:
+        asset_types = project_active.get_all_asset_types()
+
     _asset_types_enum_list.clear()
-    _asset_types_enum_list.extend(
-        [(at.id, at.name, "") for at in project_active.get_all_asset_types()]
-    )
+    _asset_types_enum_list.extend([(at.id, at.name, "") for at in asset_types])
     return _asset_types_enum_list
 
 
@@ -296,13 +425,14 @@ def get_assets_enum_for_active_asset_type(
     if not project_active or not asset_type_active:
         return []
 
+    index = project_index_get()
+    if index:
+        assets = index.get_all_assets_for_type(asset_type_active)
+    else:
+        assets = project_active.get_all_assets_for_type(asset_type_active)
+
     _asset_enum_list.clear()
-    _asset_enum_list.extend(
-        [
-            (a.id, a.name, a.description or "")
-            for a in project_active.get_all_assets_for_type(asset_type_active)
-        ]
-    )
+    _asset_enum_list.extend([(a.id, a.name, a.description or "") for a in assets])
     return _asset_enum_list
 
 
@@ -312,11 +442,20 @@ def get_task_types_enum_for_current_context(
     global _task_types_enum_list
 
     items = []
+    index = project_index_get()
     if context.scene.kitsu.category == "SHOTS":
-        items = [(t.id, t.name, "") for t in TaskType.all_shot_task_types()]
+        if index:
+            task_types = index.get_task_types_for_entity("Shot")
+        else:
+            task_types = TaskType.all_shot_task_types()
+        items = [(t.id, t.name, "") for t in task_types]
 
     if context.scene.kitsu.category == "ASSETS":
-        items = [(t.id, t.name, "") for t in TaskType.all_asset_task_types()]
+        if index:
+            task_types = index.get_task_types_for_entity("Asset")
+        else:
+            task_types = TaskType.all_asset_task_types()
+        items = [(t.id, t.name, "") for t in task_types]
 
     _task_types_enum_list.clear()
     _task_types_enum_list.extend(items)
@@ -329,7 +468,12 @@ def get_shot_task_types_enum(
 ) -> List[Tuple[str, str, str]]:
     global _task_types_shots_enum_list
 
-    items = [(t.id, t.name, "") for t in TaskType.all_shot_task_types()]
+    index = project_index_get()
+    if index:
+        task_types = index.get_task_types_for_entity("Shot")
+    else:
+        task_types = TaskType.all_shot_task_types()
+    items = [(t.id, t.name, "") for t in task_types]
 
     _task_types_shots_enum_list.clear()
     _task_types_shots_enum_list.extend(items)
@@ -342,7 +486,12 @@ def get_all_task_statuses_enum(
 ) -> List[Tuple[str, str, str]]:
     global _task_statuses_enum_list
 
-    items = [(t.id, t.name, "") for t in TaskStatus.all_task_statuses()]
+    index = project_index_get()
+    if index:
+        task_statuses = index.get_task_statuses_all()
+    else:
+        task_statuses = TaskStatus.all_task_statuses()
+    items = [(t.id, t.name, "") for t in task_statuses]
 
     _task_statuses_enum_list.clear()
     _task_statuses_enum_list.extend(items)
@@ -351,42 +500,112 @@ def get_all_task_statuses_enum(
 
 
 def load_user_all_tasks(context: bpy.types.Context) -> List[Task]:
-    global _user_all_tasks
     global _user_active
 
-    tasks = _user_active.all_tasks_to_do()
+    _set_user_all_tasks_if_changed(
+        _user_active.all_tasks_to_do_if_changed(_user_all_tasks_validators), context
+    )
+    return _user_all_tasks
+
+
+def _fetch_user_all_tasks(
+    job: background.BackgroundJob, user: User, validators: Dict[str, Optional[str]]
+) -> Tuple[Optional[List[Task]], Dict[str, Optional[str]]]:
+    return user.all_tasks_to_do_if_changed(validators)
+
+
+def _set_user_all_tasks_if_changed(
+    result: Tuple[Optional[List[Task]], Dict[str, Optional[str]]],
+    context: Optional[bpy.types.Context] = None,
+) -> None:
+    global _user_all_tasks_validators
+
+    tasks, _user_all_tasks_validators = result
+    if tasks is None:
+        logger.debug("Assigned tasks unchanged for: %s", _user_active.full_name)
+        return
+    _set_user_all_tasks(tasks, context)
+
+
+def _set_user_all_tasks(
+    tasks: List[Task], context: Optional[bpy.types.Context] = None
+) -> None:
+    global _user_all_tasks
+
     _user_all_tasks.clear()
     _user_all_tasks.extend(tasks)
 
-    _update_tasks_collection_prop(context)
+    _update_tasks_collection_prop(context or bpy.context)
 
     logger.debug("Loaded assigned tasks for: %s", _user_active.full_name)
 
-    return _user_all_tasks
+
+def load_user_all_tasks_background() -> background.BackgroundJob:
+    """
+    Same as load_user_all_tasks() but fetches the tasks on a worker thread.
+    The tasks collection property is updated once they are loaded.
+    """
+    return background.submit(
+        "user_all_tasks",
+        _fetch_user_all_tasks,
+        _user_active,
+        dict(_user_all_tasks_validators),
+        on_done=_set_user_all_tasks_if_changed,
+    )
+
+
+def _update_task_item(item: Any, task: Task) -> None:
+    # Only write changed values, every write triggers property updates and redraws.
+    for attr in ("id", "entity_id", "entity_name", "task_type_id", "task_type_name"):
+        value = getattr(task, attr) or ""
+        if getattr(item, attr) != value:
+            setattr(item, attr, value)
 
 
 def _update_tasks_collection_prop(context: bpy.types.Context) -> None:
+    """
+    Updates the tasks collection property to match _user_all_tasks. Items are
+    diffed by task id, so only removed, added or changed tasks are touched and
+    the active task stays selected.
+    """
     global _user_all_tasks
     addon_prefs = _addon_prefs_get(bpy.context)
     tasks_coll_prop = addon_prefs.tasks
-
-    # Get current index.
-    idx = context.window_manager.kitsu.tasks_index
-
-    # Clear all old tasks.
-    tasks_coll_prop.clear()
-
-    # Populate with new tasks.
-    for task in _user_all_tasks:
-        item = tasks_coll_prop.add()
-        item.id = task.id
-        item.entity_id = task.entity_id
-        item.entity_name = task.entity_name
-        item.task_type_id = task.task_type_id
-        item.task_type_name = task.task_type_name
-
-    # Update index.
-    idx = len(tasks_coll_prop) - 1
+    wm_kitsu = context.window_manager.kitsu
+
+    # Remember active task.
+    idx = wm_kitsu.tasks_index
+    active_id = tasks_coll_prop[idx].id if 0 <= idx < len(tasks_coll_prop) else ""
+
+    # Remove tasks that are gone, from the back so indices stay valid.
+    task_ids = {task.id for task in _user_all_tasks}
+    for i in reversed(range(len(tasks_coll_prop))):
+        if tasks_coll_prop[i].id not in task_ids:
+            tasks_coll_prop.remove(i)
+
+    # Add or update tasks in order of the incoming list.
+    item_indices = {item.id: i for i, item in enumerate(tasks_coll_prop)}
+    for i, task in enumerate(_user_all_tasks):
+        if i < len(tasks_coll_prop) and tasks_coll_prop[i].id == task.id:
+            _update_task_item(tasks_coll_prop[i], task)
+            continue
+
+        current = item_indices.get(task.id)
+        if current is None:
+            tasks_coll_prop.add()
+            current = len(tasks_coll_prop) - 1
+        if current != i:
+            tasks_coll_prop.move(current, i)
+            # Moving shifts all items in between, index them again.
+            item_indices = {item.id: j for j, item in enumerate(tasks_coll_prop)}
+        _update_task_item(tasks_coll_prop[i], task)
+
+    # Restore active task.
+    for i, item in enumerate(tasks_coll_prop):
+        if item.id == active_id:
+            if wm_kitsu.tasks_index != i:
+                wm_kitsu.tasks_index = i
+            break
 
 
 def get_user_all_tasks_enum(
@@ -428,6 +647,216 @@ def _init_cache_entity(
             )
 
 
+def init_persistent_cache(context: bpy.types.Context) -> None:
+    addon_prefs = _addon_prefs_get(context)
+
+    if not addon_prefs.use_persistent_cache:
+        gazu.cache.disable_persistent()
+        return
+
+    gazu.cache.enable_persistent(
+        addon_prefs.get_persistent_cache_path(),
+        default_ttl=addon_prefs.persistent_cache_ttl,
+    )
+    try:
+        removed = gazu.cache.revalidate_persistent()
+    except Exception:
+        # Without the events we can't tell what is outdated.
+        logger.exception("Failed to revalidate persistent cache. Clearing it")
+        removed = gazu.cache.invalidate_persistent()
+    logger.debug("Revalidated persistent cache. Removed %i entries", removed)
+
+
+def _get_event_date(event: Dict[str, Any]) -> str:
+    return event["created_at"][:19]
+
+
+def _get_last_event_date() -> str:
+    """
+    Returns the date of the newest event on the server, empty string if there
+    is none. Used as first cursor, as the local clock can differ from the
+    server clock.
+    """
+    events = gazu.sync.get_last_events(page_size=1)
+    dates = [_get_event_date(e) for e in events if e.get("created_at")]
+    return max(dates, default="")
+
+
+def _get_active_entity_ids() -> Dict[str, str]:
+    return {
+        variable_name: globals()[variable_name].id
+        for _, variable_name, _ in _event_active_entities
+        if globals()[variable_name]
+    }
+
+
+def _fetch_server_events(
+    cursor: str, project_id: str, active_ids: Dict[str, str]
+) -> Tuple[str, List[Dict[str, Any]], Any, Dict[str, Tuple[str, Any]]]:
+    """
+    Fetches the events that occured on the server after cursor and the entities
+    they changed. Only makes requests, so it can run on a worker thread.
+    Returns the date of the last event, which is the cursor for the next
+    request, the events, the updates for the index of given project and the
+    changed active entities by cache variable name, see apply_server_events.
+    """
+    events = gazu.sync.get_last_events(after=cursor or None)
+    dates = [_get_event_date(e) for e in events if e.get("created_at")]
+    cursor = max(dates + [cursor])
+    if not events:
+        return cursor, events, [], {}
+
+    # Changed entities need to be fetched from the server, not the cache.
+    Cache.invalidate_events(events)
+
+    index_updates = ProjectIndex.fetch_event_updates(project_id, events)
+
+    ids = set()
+    for event in events:
+        ids.update(gazu.cache.get_event_entity_ids(event))
+
+    active_entities: Dict[str, Tuple[str, Any]] = {}
+    for entity_type, variable_name, _ in _event_active_entities:
+        entity_id = active_ids.get(variable_name)
+        if entity_id not in ids:
+            continue
+        try:
+            entity = entity_type.by_id(entity_id)
+        except RouteNotFoundException:
+            # Entity was deleted on the server.
+            entity = entity_type()
+        active_entities[variable_name] = (entity_id, entity)
+
+    return cursor, events, index_updates, active_entities
+
+
+def _fetch_server_events_thread(
+    cursor: str, project_id: str, active_ids: Dict[str, str]
+) -> None:
+    try:
+        _event_results.put(_fetch_server_events(cursor, project_id, active_ids))
+    except Exception:
+        logger.exception("Failed to fetch server events")
+
+
+def apply_server_events(
+    cursor: str,
+    events: List[Dict[str, Any]],
+    index_updates: Optional[List[Tuple[str, str, Any]]],
+    active_entities: Dict[str, Tuple[str, Any]],
+) -> None:
+    """
+    Applies the result of _fetch_server_events to the project index and the
+    active entities. Doesn't make any requests, needs to run on the main thread.
+    """
+    global _event_cursor
+
+    if _event_cursor is not None:
+        _event_cursor = max(_event_cursor, cursor)
+
+    if not events:
+        return
+
+    # Index might have been reloaded for another project in the meantime.
+    if _project_index is not None and _project_index.project.id == _project_active.id:
+        if index_updates is None:
+            project_index_reset()
+        else:
+            _project_index.apply_updates(index_updates)
+
+    for _, variable_name, cache_name in _event_active_entities:
+        if variable_name not in active_entities:
+            continue
+        entity_id, entity = active_entities[variable_name]
+        # Active entity might have changed while the events were fetched.
+        if globals()[variable_name].id == entity_id:
+            globals()[variable_name] = entity
+            logger.debug("Refreshed active %s cache", cache_name)
+
+    logger.debug("Applied %i server events", len(events))
+
+
+def server_events_sync() -> None:
+    """
+    Applies the server events that occured since the last poll, so the cache is
+    up to date before an operator reads from it. Clears the whole cache if the
+    event listener is not running or the events can't be fetched.
+    """
+    if _event_cursor is None:
+        Cache.clear_all()
+        project_index_reset()
+        return
+
+    try:
+        results = _fetch_server_events(
+            _event_cursor, _project_active.id, _get_active_entity_ids()
+        )
+    except Exception:
+        logger.exception("Failed to fetch server events. Clearing cache")
+        Cache.clear_all()
+        project_index_reset()
+        return
+
+    apply_server_events(*results)
+
+
+def _event_listener_timer() -> Optional[float]:
+    global _event_thread
+
+    if _event_cursor is None:
+        logger.debug("Stopped event listener")
+        return None
+
+    while not _event_results.empty():
+        apply_server_events(*_event_results.get())
+
+    if _event_thread is None or not _event_thread.is_alive():
+        _event_thread = threading.Thread(
+            target=_fetch_server_events_thread,
+            args=(_event_cursor, _project_active.id, _get_active_entity_ids()),
+            daemon=True,
+        )
+        _event_thread.start()
+
+    return bkglobals.EVENT_POLL_INTERVAL
+
+
+def event_listener_start() -> None:
+    """
+    Starts polling the server for events, changes made by other users or tools
+    only invalidate the cache entries of the changed entities.
+    """
+    global _event_cursor
+
+    if _event_cursor is not None:
+        return
+
+    try:
+        _event_cursor = _get_last_event_date()
+    except Exception:
+        # Without listener the whole cache is cleared before syncing.
+        logger.exception("Failed to start event listener")
+        return
+
+    if not bpy.app.timers.is_registered(_event_listener_timer):
+        bpy.app.timers.register(
+            _event_listener_timer,
+            first_interval=bkglobals.EVENT_POLL_INTERVAL,
+            persistent=True,
+        )
+    logger.debug("Started event listener at %s", _event_cursor)
+
+
+def event_listener_stop() -> None:
+    global _event_cursor
+
+    _event_cursor = None
+    while not _event_results.empty():
+        _event_results.get()
+    if bpy.app.timers.is_registered(_event_listener_timer):
+        bpy.app.timers.unregister(_event_listener_timer)
+
+
 def init_startup_variables(context: bpy.types.Context) -> None:
     addon_prefs = _addon_prefs_get(context)
     global _cache_startup_initialized
@@ -447,8 +876,8 @@ def init_startup_variables(context: bpy.types.Context) -> None:
     logger.debug("Initiated active user cache to: %s", _user_active.full_name)
 
     # User Tasks.
-    load_user_all_tasks(context)
-    logger.debug("Initiated active user tasks")
+    load_user_all_tasks_background()
+    logger.debug("Initiated loading active user tasks")
 
     _cache_startup_initialized = True
 
@@ -461,7 +890,9 @@ def clear_startup_variables():
     _user_active = User()
     logger.debug("Cleared active user cache")
 
+    background.cancel("user_all_tasks")
     _user_all_tasks.clear()
+    _user_all_tasks_validators.clear()
     _update_tasks_collection_prop(bpy.context)
     logger.debug("Cleared active user all tasks cache")
 
@@ -535,6 +966,8 @@ def clear_cache_variables():
     _task_type_active = TaskType()
     logger.debug("Cleared active task type cache")
 
+    project_index_reset()
+
     _cache_initialized = False
 
 
@@ -559,6 +992,8 @@ def register():
 
 
 def unregister():
+    event_listener_stop()
+
     # Clear handlers.
     bpy.app.handlers.load_post.remove(load_post_handler_init_startup_variables)
     bpy.app.handlers.load_post.remove(load_post_handler_update_cache)
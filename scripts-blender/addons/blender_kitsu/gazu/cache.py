@@ -1,7 +1,13 @@
 import copy
 import datetime
 import json
+import os
+import re
+import sqlite3
+import threading
+import time
 
+from collections import OrderedDict
 from functools import wraps
 
 cache_settings = {"enabled": False}
@@ -32,80 +38,166 @@ def clear_all():
         function.clear_cache()
 
 
+def invalidate_ids(ids):
+    """
+    Remove the cached values of all decorated functions that were called with
+    one of given entity ids or that returned one of the related entities.
+
+    Returns:
+        int: Number of removed values.
+    """
+    ids = set(ids)
+    if not ids:
+        return 0
+    return sum(function.invalidate_ids(ids) for function in cached_functions)
+
+
+def get_cache_infos():
+    """
+    Returns:
+        dict: Cache infos (state, hits, misses, evictions, size) of every
+        decorated function, keyed by qualified function name.
+    """
+    return {
+        "%s.%s" % (function.__module__, function.__qualname__): (
+            function.get_cache_infos()
+        )
+        for function in cached_functions
+    }
+
+
 def remove_oldest_entry(memo, maxsize):
     """
-    Remove the oldest cache entry if there is more value stored than allowed.
+    Remove the least recently used cache entry if there is more value stored
+    than allowed. Entries are kept in access order, so this is done in
+    constant time.
 
     Params:
-        memo (dict): Cache used for function memoization.
+        memo (OrderedDict): Cache used for function memoization.
         maxsize (int): Maximum number of entries for the cache.
 
     Returns:
-        Oldest entry for given cache.
+        Key of the removed entry or None if nothing was removed.
     """
     oldest_entry = None
     if maxsize > 0 and len(memo) > maxsize:
-        oldest_entry_key = list(memo.keys())[0]
-        for entry_key in memo.keys():
-            oldest_date = memo[oldest_entry_key]["date_accessed"]
-            if memo[entry_key]["date_accessed"] < oldest_date:
-                oldest_entry_key = entry_key
-        memo.pop(oldest_entry_key)
+        oldest_entry, _ = memo.popitem(last=False)
     return oldest_entry
 
 
+def get_key_element(value):
+    """
+    Convert a function argument to a compact hashable value. Entity dicts are
+    reduced to their id, which is enough to identify them and avoids
+    serializing whole API responses for every call.
+
+    Returns:
+        A hashable representation of given value.
+    """
+    if isinstance(value, dict):
+        if "id" in value and isinstance(value["id"], str):
+            return value["id"]
+        return tuple(
+            (key, get_key_element(item))
+            for key, item in sorted(value.items(), key=lambda kv: str(kv[0]))
+        )
+    elif isinstance(value, (list, tuple)):
+        return tuple(get_key_element(item) for item in value)
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(get_key_element(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def key_contains_ids(key, ids):
+    """
+    Returns:
+        True if given cache key, built by get_cache_key, mentions one of given
+        ids.
+    """
+    if isinstance(key, (tuple, frozenset)):
+        return any(key_contains_ids(element, ids) for element in key)
+    return isinstance(key, str) and key in ids
+
+
+def value_contains_ids(value, ids):
+    """
+    Returns:
+        True if given cached value is an entity, or a list of entities, whose
+        id is one of given ids.
+    """
+    if isinstance(value, dict):
+        return value.get("id") in ids
+    elif isinstance(value, list):
+        return any(
+            isinstance(item, dict) and item.get("id") in ids for item in value
+        )
+    return False
+
+
 def get_cache_key(args, kwargs):
     """
-    Serialize arguments to get a cache key. It will be used to store function
-    results.
+    Build a hashable key from the function arguments. It will be used to store
+    function results.
 
     Returns:
-        str: generated key
+        tuple: generated key
     """
     kwargscopy = kwargs.copy()
     if "client" in kwargscopy:
         kwargscopy["client"] = kwargscopy["client"].host
     if len(args) == 0 and len(kwargscopy) == 0:
-        return ""
-    elif len(args) == 0:
-        return json.dumps(kwargscopy)
-    elif len(kwargscopy.keys()) == 0:
-        return json.dumps(args)
-    else:
-        return json.dumps([args, kwargscopy])
+        return ()
+    return (get_key_element(args), get_key_element(kwargscopy))
 
 
-def insert_value(function, cache_store, args, kwargs):
+def insert_value(function, cache_store, args, kwargs, key=None):
     """
     Serialize function call arguments and store function result in given cache
     store.
 
     Args:
         function (func): The function to cache value for.
-        cache_store (dict): The cache which will contain the value to cache.
+        cache_store (OrderedDict): The cache which will contain the value to
+        cache.
         args, kwargs: The arguments for which a cache must be set.
+        key: Precomputed cache key, built from the arguments if not given.
 
     Returns:
         The cached value.
     """
     returned_value = function(*args, **kwargs)
-    key = get_cache_key(args, kwargs)
+    if key is None:
+        key = get_cache_key(args, kwargs)
+    set_value(cache_store, key, returned_value)
+    return get_value(cache_store, key)
+
+
+def set_value(cache_store, key, value):
+    """
+    Store given value in given cache store as the most recently used entry.
+    """
     cache_store[key] = {
         "date_accessed": datetime.datetime.now(),
-        "value": returned_value,
+        "value": value,
     }
-    return get_value(cache_store, key)
+    cache_store.move_to_end(key)
 
 
 def get_value(cache_store, key):
     """
     It generates a deep copy of the requested value. It's needed because if a
     pointer is returned, the value can be changed. Which leads to a modified
-    cache and unexpected results.
+    cache and unexpected results. The entry is marked as the most recently
+    used one.
 
     Returns:
         Value matching given key inside given cache store
     """
+    cache_store.move_to_end(key)
     value = cache_store[key]["value"]
     return copy.deepcopy(value)
 
@@ -151,13 +243,31 @@ def cache(function, maxsize=300, expire=120):
         maxsize: Number of value stored in cache (300 by default).
         expire: Time to live in seconds of stored value (disabled by default)
     """
-    cache_store = {}
+    cache_store = OrderedDict()
     state = {"enabled": True, "expire": expire, "maxsize": maxsize}
 
-    statistics = {"hits": 0, "misses": 0, "expired_hits": 0}
+    statistics = {"hits": 0, "misses": 0, "expired_hits": 0, "evictions": 0}
+    lock = threading.RLock()
 
     def clear_cache():
-        cache_store.clear()
+        with lock:
+            cache_store.clear()
+
+    def invalidate_ids(ids):
+        with lock:
+            keys = [
+                key
+                for key, entry in cache_store.items()
+                if key_contains_ids(key, ids)
+                or value_contains_ids(entry["value"], ids)
+            ]
+            for key in keys:
+                del cache_store[key]
+        return len(keys)
+
+    def reset_statistics():
+        for key in statistics:
+            statistics[key] = 0
 
     def get_cache_infos():
         size = {"current_size": len(cache_store)}
@@ -172,6 +282,11 @@ def cache(function, maxsize=300, expire=120):
 
     def set_max_size(maxsize):
         state["maxsize"] = maxsize
+        with lock:
+            while (
+                remove_oldest_entry(cache_store, state["maxsize"]) is not None
+            ):
+                statistics["evictions"] += 1
 
     def enable_cache():
         state["enabled"] = True
@@ -185,21 +300,28 @@ def cache(function, maxsize=300, expire=120):
         if is_cache_enabled(state):
             key = get_cache_key(args, kwargs)
 
-            if key in cache_store:
-                if is_cache_expired(cache_store, state, key):
-                    statistics["expired_hits"] += 1
-                    return insert_value(function, cache_store, args, kwargs)
+            # The store is shared between threads, only the function call
+            # itself runs outside of the lock.
+            with lock:
+                if key in cache_store:
+                    if is_cache_expired(cache_store, state, key):
+                        statistics["expired_hits"] += 1
+                    else:
+                        statistics["hits"] += 1
+                        return get_value(cache_store, key)
                 else:
-                    statistics["hits"] += 1
-                    return get_value(cache_store, key)
+                    statistics["misses"] += 1
 
-            else:
-                statistics["misses"] += 1
-                returned_value = insert_value(
-                    function, cache_store, args, kwargs
-                )
-                remove_oldest_entry(cache_store, state["maxsize"])
-                return returned_value
+            returned_value = function(*args, **kwargs)
+
+            with lock:
+                set_value(cache_store, key, returned_value)
+                if (
+                    remove_oldest_entry(cache_store, state["maxsize"])
+                    is not None
+                ):
+                    statistics["evictions"] += 1
+                return get_value(cache_store, key)
 
         else:
             return function(*args, **kwargs)
@@ -207,9 +329,470 @@ def cache(function, maxsize=300, expire=120):
     wrapper.set_cache_expire = set_expire
     wrapper.set_cache_max_size = set_max_size
     wrapper.clear_cache = clear_cache
+    wrapper.invalidate_ids = invalidate_ids
     wrapper.enable_cache = enable_cache
     wrapper.disable_cache = disable_cache
     wrapper.get_cache_infos = get_cache_infos
+    wrapper.reset_cache_statistics = reset_statistics
 
     cached_functions.append(wrapper)
     return wrapper
+
+
+# Persistent cache.
+#
+# Optional on-disk store for raw GET responses, keyed by host, route and
+# params. It lives below the memoization layer above and survives between
+# sessions, so a cold start can read locally and only refresh stale entries.
+
+persistent_settings = {
+    "enabled": False,
+    "path": None,
+    "default_ttl": 3600,
+    "route_ttls": {},
+}
+persistent_statistics = {"hits": 0, "misses": 0, "expired_hits": 0}
+persistent_excluded_routes = ["data/events", "data/user"]
+# Writes to these routes affect the lists of several models.
+persistent_write_models = {
+    "entities": ["shot", "asset", "sequence", "episode", "edit", "scene"],
+}
+_persistent_lock = threading.RLock()
+_UUID_RE = re.compile(
+    "[a-fA-F0-9]{8}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{12}"
+)
+_persistent_connection = {"connection": None}
+
+
+def _get_persistent_connection():
+    connection = _persistent_connection["connection"]
+    if connection is None:
+        path = persistent_settings["path"]
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "host TEXT, route TEXT, params TEXT, value TEXT, stored_at REAL, "
+            "PRIMARY KEY (host, route, params))"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cursors (host TEXT PRIMARY KEY, "
+            "last_event TEXT)"
+        )
+        connection.commit()
+        _persistent_connection["connection"] = connection
+    return connection
+
+
+def enable_persistent(path, default_ttl=3600, route_ttls=None):
+    """
+    Enable the persistent cache stored in a SQLite database at given path.
+
+    Args:
+        path (str): Location of the database file.
+        default_ttl (int): Time to live in seconds of stored responses.
+        route_ttls (dict): Time to live per route prefix, overriding the
+        default one (ex: {"data/projects": 86400}).
+
+    Returns:
+        bool: True if the persistent cache is enabled.
+    """
+    with _persistent_lock:
+        if persistent_settings["path"] != path:
+            close_persistent()
+        persistent_settings["path"] = path
+        persistent_settings["default_ttl"] = default_ttl
+        persistent_settings["route_ttls"] = dict(route_ttls or {})
+        persistent_settings["enabled"] = True
+        _get_persistent_connection()
+    return persistent_settings["enabled"]
+
+
+def disable_persistent():
+    """
+    Disable the persistent cache. Stored responses are kept on disk.
+    """
+    with _persistent_lock:
+        persistent_settings["enabled"] = False
+        close_persistent()
+    return persistent_settings["enabled"]
+
+
+def close_persistent():
+    """
+    Close the connection to the persistent cache database, if any.
+    """
+    with _persistent_lock:
+        connection = _persistent_connection["connection"]
+        if connection is not None:
+            connection.close()
+            _persistent_connection["connection"] = None
+
+
+def is_persistent_enabled():
+    """
+    Returns:
+        True if the persistent cache is enabled.
+    """
+    return persistent_settings["enabled"] and cache_settings["enabled"]
+
+
+def is_route_persistent(route):
+    """
+    Returns:
+        True if responses of given route can be stored in the persistent
+        cache. Only data routes that don't depend on the logged in user are
+        stored.
+    """
+    route = route.lstrip("/")
+    if not route.startswith("data/"):
+        return False
+    return not any(
+        route.startswith(excluded) for excluded in persistent_excluded_routes
+    )
+
+
+def get_route_ttl(route):
+    """
+    Returns:
+        int: Time to live in seconds for given route. The longest matching
+        route prefix of the configured route ttls wins.
+    """
+    route = route.lstrip("/")
+    matches = [
+        prefix
+        for prefix in persistent_settings["route_ttls"]
+        if route.startswith(prefix.lstrip("/"))
+    ]
+    if not matches:
+        return persistent_settings["default_ttl"]
+    return persistent_settings["route_ttls"][max(matches, key=len)]
+
+
+def _get_params_key(params):
+    return json.dumps(params or {}, sort_keys=True, default=str)
+
+
+def get_persistent_value(host, route, params=None):
+    """
+    Args:
+        host (str): Host the request is sent to.
+        route (str): Route of the request, without params.
+        params (dict): Params of the request.
+
+    Returns:
+        tuple: (True, value) if a valid response is stored, (False, None)
+        otherwise.
+    """
+    if not is_persistent_enabled() or not is_route_persistent(route):
+        return False, None
+
+    with _persistent_lock:
+        row = (
+            _get_persistent_connection()
+            .execute(
+                "SELECT value, stored_at FROM responses "
+                "WHERE host = ? AND route = ? AND params = ?",
+                (host, route.lstrip("/"), _get_params_key(params)),
+            )
+            .fetchone()
+        )
+
+    if row is None:
+        persistent_statistics["misses"] += 1
+        return False, None
+
+    value, stored_at = row
+    ttl = get_route_ttl(route)
+    if ttl > 0 and stored_at + ttl < time.time():
+        persistent_statistics["expired_hits"] += 1
+        return False, None
+
+    persistent_statistics["hits"] += 1
+    return True, json.loads(value)
+
+
+def set_persistent_value(host, route, params, value):
+    """
+    Store given response in the persistent cache, if the route allows it.
+    """
+    if not is_persistent_enabled() or not is_route_persistent(route):
+        return
+
+    with _persistent_lock:
+        connection = _get_persistent_connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+            (
+                host,
+                route.lstrip("/"),
+                _get_params_key(params),
+                json.dumps(value, default=str),
+                time.time(),
+            ),
+        )
+        connection.commit()
+
+
+def invalidate_persistent(route_prefix="", host=None):
+    """
+    Remove stored responses whose route starts with given prefix. Without a
+    prefix, the whole persistent cache is cleared.
+
+    Args:
+        route_prefix (str): Route prefix to invalidate (ex: "data/shots").
+        host (str): Only invalidate responses of given host.
+
+    Returns:
+        int: Number of removed responses.
+    """
+    if _persistent_connection["connection"] is None and not (
+        persistent_settings["path"]
+    ):
+        return 0
+
+    query = "DELETE FROM responses WHERE route LIKE ? ESCAPE '\\'"
+    pattern = (
+        route_prefix.lstrip("/")
+        .replace("\\", "\\\\")
+        .replace("%", "\\%")
+        .replace("_", "\\_")
+        + "%"
+    )
+    values = [pattern]
+    if host is not None:
+        query += " AND host = ?"
+        values.append(host)
+
+    with _persistent_lock:
+        connection = _get_persistent_connection()
+        removed = connection.execute(query, values).rowcount
+        connection.commit()
+    return removed
+
+
+def invalidate_persistent_for_ids(ids, host=None):
+    """
+    Remove stored responses whose route or params mention one of given
+    entity ids.
+
+    Returns:
+        int: Number of removed responses.
+    """
+    ids = [entity_id for entity_id in ids if entity_id]
+    if not ids:
+        return 0
+
+    removed = 0
+    with _persistent_lock:
+        connection = _get_persistent_connection()
+        for entity_id in ids:
+            query = (
+                "DELETE FROM responses WHERE (route LIKE ? OR params LIKE ?)"
+            )
+            pattern = "%" + entity_id + "%"
+            values = [pattern, pattern]
+            if host is not None:
+                query += " AND host = ?"
+                values.append(host)
+            removed += connection.execute(query, values).rowcount
+        connection.commit()
+    return removed
+
+
+def get_event_entity_ids(event):
+    """
+    Returns:
+        list: Ids of the entities an event is about.
+    """
+    data = event.get("data") or {}
+    return [
+        value
+        for key, value in data.items()
+        if isinstance(value, str) and (key == "id" or key.endswith("_id"))
+    ]
+
+
+def get_event_model_routes(event):
+    """
+    Returns:
+        list: Route stems of the collections affected by an event. An event
+        named "shot:update" affects every route starting with "shot", which
+        covers "shots" lists too.
+    """
+    model_name = event.get("name", "").split(":")[0]
+    if not model_name:
+        return []
+    stem = model_name.replace("_", "-")
+    if stem.endswith("y"):
+        stem = stem[:-1]
+    return [stem]
+
+
+def invalidate_persistent_for_events(events, host=None):
+    """
+    Remove stored responses affected by given Kitsu events. Responses that
+    mention one of the changed entity ids are removed as well as every list
+    route of the changed models.
+
+    Returns:
+        int: Number of removed responses.
+    """
+    ids = set()
+    models = set()
+    for event in events:
+        ids.update(get_event_entity_ids(event))
+        models.update(get_event_model_routes(event))
+
+    removed = invalidate_persistent_for_ids(sorted(ids), host=host)
+    if not models:
+        return removed
+
+    with _persistent_lock:
+        connection = _get_persistent_connection()
+        for model in sorted(models):
+            query = "DELETE FROM responses WHERE (route LIKE ? OR route LIKE ?)"
+            values = ["data/" + model + "%", "%/" + model + "%"]
+            if host is not None:
+                query += " AND host = ?"
+                values.append(host)
+            removed += connection.execute(query, values).rowcount
+        connection.commit()
+    return removed
+
+
+def invalidate_persistent_for_write(host, route):
+    """
+    Remove stored responses that may be outdated by a write request sent to
+    given route: the ones mentioning an id of the route and the lists of the
+    written model. Generic entity routes affect the lists of every entity
+    model.
+
+    Returns:
+        int: Number of removed responses.
+    """
+    if not persistent_settings["enabled"]:
+        return 0
+
+    route = route.lstrip("/").split("?")[0]
+    removed = invalidate_persistent_for_ids(_UUID_RE.findall(route), host=host)
+    parts = route.split("/")
+    if len(parts) > 1 and parts[0] == "data":
+        models = persistent_write_models.get(parts[1], [parts[1].rstrip("s")])
+        removed += invalidate_persistent_for_events(
+            [{"name": model} for model in models], host=host
+        )
+    return removed
+
+
+def get_persistent_cursor(host):
+    """
+    Returns:
+        str: Date of the last event the persistent cache was revalidated
+        with, for given host. None if the cache was never revalidated.
+    """
+    with _persistent_lock:
+        row = (
+            _get_persistent_connection()
+            .execute("SELECT last_event FROM cursors WHERE host = ?", (host,))
+            .fetchone()
+        )
+    return row[0] if row else None
+
+
+def set_persistent_cursor(host, last_event):
+    with _persistent_lock:
+        connection = _get_persistent_connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO cursors VALUES (?, ?)", (host, last_event)
+        )
+        connection.commit()
+
+
+def revalidate_persistent(client=None):
+    """
+    Revalidate the persistent cache with the events that occured on the
+    server since the last revalidation. Only the stored responses affected
+    by these events are removed. If the cache was never revalidated for the
+    client host, it is fully cleared for this host.
+
+    Returns:
+        int: Number of removed responses.
+    """
+    from . import client as raw
+    from . import sync
+
+    if client is None:
+        client = raw.default_client
+    if not persistent_settings["enabled"]:
+        return 0
+
+    host = client.host
+    cursor = get_persistent_cursor(host)
+
+    if cursor is None:
+        # Start after the newest event on the server, the local clock can
+        # differ from the server clock. Empty if there are no events yet.
+        events = sync.get_last_events(page_size=1, client=client)
+        removed = invalidate_persistent(host=host)
+        set_persistent_cursor(host, get_last_event_date(events, ""))
+        return removed
+
+    events = sync.get_last_events(after=cursor or None, client=client)
+    removed = invalidate_persistent_for_events(events, host=host)
+    set_persistent_cursor(host, get_last_event_date(events, cursor))
+    return removed
+
+
+def get_last_event_date(events, default):
+    """
+    Returns:
+        str: Creation date of the newest of given events, default if there
+        is none.
+    """
+    dates = [
+        event["created_at"][:19] for event in events if event.get("created_at")
+    ]
+    return max(dates, default=default)
+
+
+def get_persistent_infos():
+    """
+    Returns:
+        dict: Persistent cache settings, statistics and number of stored
+        responses.
+    """
+    infos = {
+        "enabled": persistent_settings["enabled"],
+        "path": persistent_settings["path"],
+        "default_ttl": persistent_settings["default_ttl"],
+    }
+    infos.update(persistent_statistics)
+    if _persistent_connection["connection"] is not None:
+        with _persistent_lock:
+            infos["current_size"] = (
+                _persistent_connection["connection"]
+                .execute("SELECT COUNT(*) FROM responses")
+                .fetchone()[0]
+            )
+    return infos
+
+
+def invalidate_for_events(events, host=None):
+    """
+    Remove the values, memoized and persistent, affected by given Kitsu
+    events. Only the entries related to the changed entities are removed, the
+    rest of the cache stays valid.
+
+    Returns:
+        int: Number of removed values.
+    """
+    ids = set()
+    for event in events:
+        ids.update(get_event_entity_ids(event))
+
+    removed = invalidate_ids(ids)
+    if persistent_settings["enabled"]:
+        removed += invalidate_persistent_for_events(events, host=host)
+    return removed
@@ -1,9 +1,19 @@
 import sys
+import contextlib
+import copy
 import functools
+import hashlib
 import json
-import shutil
+import mimetypes
+import os
+import random
+import re
+import threading
+import time
 import urllib
+import uuid
 
+from . import cache
 from .encoder import CustomJSONEncoder
 
 if sys.version_info[0] == 3:
@@ -24,19 +34,203 @@ from .exception import (
     UploadFailedException,
 )
 
+DEFAULT_HTTP_SETTINGS = {
+    "pool_connections": 10,
+    "pool_maxsize": 32,
+    "max_retries": 3,
+    "backoff_factor": 0.5,
+    "backoff_max": 10.0,
+    "retry_statuses": (502, 503, 504),
+    "timeout": None,
+}
+
+# Only these methods are retried, they can be sent again without side effects.
+IDEMPOTENT_METHODS = ("GET", "HEAD")
+
+# Size in bytes of the chunks read from disk or from the network while
+# transferring files.
+TRANSFER_CHUNK_SIZE = 1024 * 1024
+
+_ID_RE = re.compile(
+    "[a-fA-F0-9]{8}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{12}"
+)
+
 
 class KitsuClient(object):
-    def __init__(self, host, ssl_verify=True, cert=None):
+    def __init__(self, host, ssl_verify=True, cert=None, **http_settings):
         self.tokens = {"access_token": "", "refresh_token": ""}
         self.session = requests.Session()
         self.session.verify = ssl_verify
         self.session.cert = cert
         self.host = host
         self.event_host = host
+        self.http_settings = dict(DEFAULT_HTTP_SETTINGS)
+        self.route_metrics = {}
+        self.metrics_lock = threading.Lock()
+        configure_http(client=self, **http_settings)
+
+
+def create_client(host, ssl_verify=True, cert=None, **http_settings):
+    return KitsuClient(host, ssl_verify, cert=cert, **http_settings)
+
+
+def configure_http(client=None, **http_settings):
+    """
+    Configure connection pooling, retries and timeout of given client. A new
+    HTTP adapter is mounted on the client session with the resulting settings.
+
+    Args:
+        pool_connections (int): Number of connection pools to cache.
+        pool_maxsize (int): Maximum number of connections kept alive per host.
+        max_retries (int): Number of retries for idempotent requests failing
+        with a connection error or a retry status.
+        backoff_factor (float): Base delay in seconds between retries. It
+        doubles after each retry and is randomized (full jitter).
+        backoff_max (float): Maximum delay in seconds between retries.
+        retry_statuses (tuple): Status codes after which a request is retried.
+        timeout (float): Timeout in seconds of each request, None to wait
+        forever.
 
+    Returns:
+        dict: The settings of the client.
+    """
+    client = client or default_client
+    unknown = set(http_settings) - set(DEFAULT_HTTP_SETTINGS)
+    if unknown:
+        raise ValueError("Unknown http settings: %s" % ", ".join(unknown))
+    client.http_settings.update(http_settings)
+
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=client.http_settings["pool_connections"],
+        pool_maxsize=client.http_settings["pool_maxsize"],
+        max_retries=0,
+    )
+    client.session.mount("http://", adapter)
+    client.session.mount("https://", adapter)
+    client.session.headers.update(
+        {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+    )
+    return client.http_settings
 
-def create_client(host, ssl_verify=True, cert=None):
-    return KitsuClient(host, ssl_verify, cert=None)
+
+def get_retry_delay(attempt, client=None):
+    """
+    Returns:
+        float: Delay in seconds before given retry attempt (starting at 0),
+        randomized between 0 and the exponential backoff to avoid all clients
+        retrying at the same time.
+    """
+    client = client or default_client
+    settings = client.http_settings
+    backoff = settings["backoff_factor"] * (2**attempt)
+    return random.uniform(0, min(settings["backoff_max"], backoff))
+
+
+def get_route_key(method, path):
+    """
+    Returns:
+        str: Metric key of a request, ids and params are removed so all
+        requests to the same route are grouped together.
+    """
+    path = path.split("?")[0].lstrip("/")
+    return "%s %s" % (method, _ID_RE.sub(":id", path))
+
+
+def record_route_metric(client, method, path, duration, failed=False):
+    key = get_route_key(method, path)
+    with client.metrics_lock:
+        metric = client.route_metrics.setdefault(
+            key,
+            {
+                "count": 0,
+                "errors": 0,
+                "retries": 0,
+                "total_time": 0.0,
+                "max_time": 0.0,
+            },
+        )
+        metric["count"] += 1
+        metric["total_time"] += duration
+        metric["max_time"] = max(metric["max_time"], duration)
+        if failed:
+            metric["errors"] += 1
+
+
+def record_route_retry(client, method, path):
+    key = get_route_key(method, path)
+    with client.metrics_lock:
+        if key in client.route_metrics:
+            client.route_metrics[key]["retries"] += 1
+
+
+def get_route_metrics(client=None):
+    """
+    Returns:
+        dict: Latency metrics per route (count, errors, retries, total, max
+        and average time in seconds).
+    """
+    client = client or default_client
+    with client.metrics_lock:
+        metrics = {
+            key: dict(metric) for key, metric in client.route_metrics.items()
+        }
+    for metric in metrics.values():
+        metric["average_time"] = metric["total_time"] / max(1, metric["count"])
+    return metrics
+
+
+def reset_route_metrics(client=None):
+    client = client or default_client
+    with client.metrics_lock:
+        client.route_metrics.clear()
+
+
+def send_request(method, path, url, client=None, max_retries=None, **kwargs):
+    """
+    Send a request with the client session. Idempotent requests failing with
+    a connection error or a retry status are retried with a jittered
+    exponential backoff, up to max_retries times (defaults to the client
+    setting). The latency of each request is recorded per route.
+
+    Returns:
+        Response: Request response object.
+    """
+    client = client or default_client
+    settings = client.http_settings
+    if max_retries is None:
+        max_retries = settings["max_retries"]
+    retries = max_retries if method in IDEMPOTENT_METHODS else 0
+    if method not in ("GET", "HEAD"):
+        # Responses memoized by a request scope might be outdated now.
+        _clear_request_scope()
+    kwargs.setdefault("timeout", settings["timeout"])
+
+    attempt = 0
+    while True:
+        start = time.perf_counter()
+        try:
+            response = client.session.request(method, url, **kwargs)
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+        ):
+            record_route_metric(
+                client, method, path, time.perf_counter() - start, True
+            )
+            if attempt >= retries:
+                raise
+        else:
+            failed = response.status_code in settings["retry_statuses"]
+            record_route_metric(
+                client, method, path, time.perf_counter() - start, failed
+            )
+            if not failed or attempt >= retries:
+                return response
+            response.close()
+
+        record_route_retry(client, method, path)
+        time.sleep(get_retry_delay(attempt, client=client))
+        attempt += 1
 
 
 default_client = None
@@ -189,26 +383,211 @@ def build_path_with_params(path, params):
     return path
 
 
+class InFlightRequest(object):
+    """
+    GET request that is running, shared by all callers asking for the same
+    path until it is done.
+    """
+
+    def __init__(self, generation):
+        self.generation = generation
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+_in_flight_lock = threading.Lock()
+_in_flight_requests = {}
+# Incremented by each write request. Responses of requests started before
+# are not memoized anymore.
+_request_scope_generation = 0
+_request_scope = threading.local()
+
+
+def _clear_request_scope():
+    global _request_scope_generation
+    with _in_flight_lock:
+        _request_scope_generation += 1
+
+
+def _get_request_scope_results():
+    """
+    Returns:
+        dict: Responses memoized by the request scope of the current thread,
+        None if no scope is open.
+    """
+    if not getattr(_request_scope, "depth", 0):
+        return None
+    if _request_scope.generation != _request_scope_generation:
+        _request_scope.results = {}
+        _request_scope.generation = _request_scope_generation
+    return _request_scope.results
+
+
+@contextlib.contextmanager
+def request_scope():
+    """
+    Memoize GET responses until the outermost scope exits, so an operation
+    resolving the same entities many times only asks the server once. Scopes
+    can be nested and are local to the thread opening them. Write requests of
+    any thread clear the memoized responses of all scopes.
+    """
+    depth = getattr(_request_scope, "depth", 0)
+    if not depth:
+        _request_scope.results = {}
+        _request_scope.generation = _request_scope_generation
+    _request_scope.depth = depth + 1
+    try:
+        yield
+    finally:
+        _request_scope.depth -= 1
+        if not _request_scope.depth:
+            _request_scope.results = {}
+
+
+def _memoize_in_request_scope(key, request):
+    results = _get_request_scope_results()
+    if results is None or request.exception is not None:
+        return
+    # Result might be outdated if a write request was sent meanwhile.
+    if request.generation == _request_scope_generation:
+        results[key] = copy.deepcopy(request.result)
+
+
+def single_flight(key, function):
+    """
+    Call function once for concurrent calls with the same key. Callers that
+    arrive while it runs wait for it and get a copy of its result.
+
+    Returns:
+        The result of function.
+    """
+    results = _get_request_scope_results()
+    if results is not None and key in results:
+        return copy.deepcopy(results[key])
+
+    with _in_flight_lock:
+        request = _in_flight_requests.get(key)
+        # Don't join requests that started before the last write request.
+        is_leader = (
+            request is None or request.generation != _request_scope_generation
+        )
+        if is_leader:
+            request = InFlightRequest(_request_scope_generation)
+            _in_flight_requests[key] = request
+
+    if not is_leader:
+        request.done.wait()
+        if request.exception is not None:
+            raise request.exception
+        _memoize_in_request_scope(key, request)
+        return copy.deepcopy(request.result)
+
+    try:
+        request.result = function()
+    except Exception as exception:
+        request.exception = exception
+        raise
+    finally:
+        with _in_flight_lock:
+            if _in_flight_requests.get(key) is request:
+                del _in_flight_requests[key]
+        _memoize_in_request_scope(key, request)
+        request.done.set()
+    return request.result
+
+
 def get(path, json_response=True, params=None, client=default_client):
     """
-    Run a get request toward given path for configured host.
+    Run a get request toward given path for configured host. Identical
+    requests running at the same time share one request and its result.
+
+    Responses of data routes are read from and stored in the persistent
+    cache when it is enabled.
 
     Returns:
         The request result.
     """
+    route = path
+    if json_response:
+        found, value = cache.get_persistent_value(client.host, route, params)
+        if found:
+            return value
+
     path = build_path_with_params(path, params)
-    response = client.session.get(
+    key = (
+        client.host,
+        client.tokens.get("access_token"),
+        path,
+        json_response,
+    )
+    return single_flight(
+        key, lambda: _get(path, route, params, json_response, client)
+    )
+
+
+def _get(path, route, params, json_response, client):
+    response = send_request(
+        "GET",
+        path,
         get_full_url(path, client=client),
+        client=client,
         headers=make_auth_header(client=client),
     )
     check_status(response, path)
 
     if json_response:
-        return response.json()
+        result = response.json()
+        cache.set_persistent_value(client.host, route, params, result)
+        return result
     else:
         return response.text
 
 
+def get_if_changed(path, validators=None, params=None, client=default_client):
+    """
+    Run a conditional get request toward given path for configured host. The
+    validators of an earlier response are sent as If-None-Match and
+    If-Modified-Since headers. Servers that don't support conditional requests
+    send the full response, which is then compared by content hash so it
+    doesn't need to be decoded when it didn't change.
+
+    Args:
+        validators (dict): Validators returned for an earlier request.
+
+    Returns:
+        tuple: The request result or None if it didn't change, and the
+        validators to send with the next request.
+    """
+    validators = validators or {}
+    headers = make_auth_header(client=client)
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    path = build_path_with_params(path, params)
+    response = send_request(
+        "GET",
+        path,
+        get_full_url(path, client=client),
+        client=client,
+        headers=headers,
+    )
+    if response.status_code == 304:
+        return None, validators
+    check_status(response, path)
+
+    new_validators = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "content_hash": hashlib.sha1(response.content).hexdigest(),
+    }
+    if new_validators["content_hash"] == validators.get("content_hash"):
+        return None, new_validators
+    return response.json(), new_validators
+
+
 def post(path, data, client=default_client):
     """
     Run a post request toward given path for configured host.
@@ -216,12 +595,16 @@ def post(path, data, client=default_client):
     Returns:
         The request result.
     """
-    response = client.session.post(
+    response = send_request(
+        "POST",
+        path,
         get_full_url(path, client),
+        client=client,
         json=data,
         headers=make_auth_header(client=client),
     )
     check_status(response, path)
+    cache.invalidate_persistent_for_write(client.host, path)
     try:
         result = response.json()
     except JSONDecodeError:
@@ -237,12 +620,16 @@ def put(path, data, client=default_client):
     Returns:
         The request result.
     """
-    response = client.session.put(
+    response = send_request(
+        "PUT",
+        path,
         get_full_url(path, client),
+        client=client,
         json=data,
         headers=make_auth_header(client=client),
     )
     check_status(response, path)
+    cache.invalidate_persistent_for_write(client.host, path)
     return response.json()
 
 
@@ -255,10 +642,15 @@ def delete(path, params=None, client=default_client):
     """
     path = build_path_with_params(path, params)
 
-    response = client.session.delete(
-        get_full_url(path, client), headers=make_auth_header(client=client)
+    response = send_request(
+        "DELETE",
+        path,
+        get_full_url(path, client),
+        client=client,
+        headers=make_auth_header(client=client),
     )
     check_status(response, path)
+    cache.invalidate_persistent_for_write(client.host, path)
     return response.text
 
 
@@ -299,7 +691,7 @@ def check_status(request, path):
         )
     elif status_code in [401, 422]:
         raise NotAuthenticatedException(path)
-    elif status_code in [500, 502]:
+    elif status_code in [500, 502, 503, 504]:
         try:
             stacktrace = request.json().get(
                 "stacktrace", "No stacktrace sent by the server"
@@ -389,22 +781,152 @@ def update(model_name, model_id, data, client=default_client):
     )
 
 
-def upload(path, file_path, data={}, extra_files=[], client=default_client):
+class MultipartFileStream(object):
     """
-    Upload file located at *file_path* to given url *path*.
+    File-like multipart/form-data request body. Form fields are encoded up
+    front, files are read while the body is sent, so they are never fully
+    loaded in memory.
+
+    Args:
+        fields (dict): Form fields to send along with the files.
+        files (list): (field name, file path) pairs.
+        progress_callback (func): Called with the number of bytes sent and the
+        total number of bytes each time a chunk is read.
+    """
+
+    def __init__(self, fields, files, progress_callback=None):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = "multipart/form-data; boundary=%s" % self.boundary
+        self.progress_callback = progress_callback
+        self.bytes_read = 0
+        self._file = None
+
+        # Encoded bytes or paths of the files to stream.
+        self._parts = []
+        for name, value in fields.items():
+            values = value if isinstance(value, (list, tuple)) else [value]
+            for value in values:
+                if not isinstance(value, bytes):
+                    value = str(value).encode("utf-8")
+                self._parts.append(
+                    self._get_part_header(name) + value + b"\r\n"
+                )
+        for name, file_path in files:
+            self._parts.append(self._get_part_header(name, file_path))
+            self._parts.append(file_path)
+            self._parts.append(b"\r\n")
+        self._parts.append(("--%s--\r\n" % self.boundary).encode("utf-8"))
+
+        self.length = sum(
+            len(part) if isinstance(part, bytes) else os.path.getsize(part)
+            for part in self._parts
+        )
+
+    def _get_part_header(self, name, file_path=None):
+        header = '--%s\r\nContent-Disposition: form-data; name="%s"' % (
+            self.boundary,
+            name,
+        )
+        if file_path is not None:
+            content_type = (
+                mimetypes.guess_type(file_path)[0]
+                or "application/octet-stream"
+            )
+            header += '; filename="%s"\r\nContent-Type: %s' % (
+                os.path.basename(file_path),
+                content_type,
+            )
+        return (header + "\r\n\r\n").encode("utf-8")
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.length - self.bytes_read
+
+        chunks = []
+        remaining = size
+        while remaining > 0 and self._parts:
+            part = self._parts[0]
+            if isinstance(part, bytes):
+                chunk = part[:remaining]
+                if len(part) > remaining:
+                    self._parts[0] = part[remaining:]
+                else:
+                    self._parts.pop(0)
+            else:
+                if self._file is None:
+                    self._file = open(part, "rb")
+                chunk = self._file.read(remaining)
+                if not chunk:
+                    self._file.close()
+                    self._file = None
+                    self._parts.pop(0)
+                    continue
+            chunks.append(chunk)
+            remaining -= len(chunk)
+
+        data = b"".join(chunks)
+        self.bytes_read += len(data)
+        if data and self.progress_callback is not None:
+            self.progress_callback(self.bytes_read, self.length)
+        return data
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __iter__(self):
+        chunk = self.read(TRANSFER_CHUNK_SIZE)
+        while chunk:
+            yield chunk
+            chunk = self.read(TRANSFER_CHUNK_SIZE)
+
+    def __len__(self):
+        return self.length
+
+
+def upload(
+    path,
+    file_path,
+    data={},
+    extra_files=[],
+    client=default_client,
+    progress_callback=None,
+):
+    """
+    Upload file located at *file_path* to given url *path*. The files are
+    streamed from disk, so it is safe to upload large movies. It can be called
+    from a thread other than the main one.
 
     Args:
         path (str): The url path to upload file.
         file_path (str): The file location on the hard drive.
+        progress_callback (func): Called with the number of bytes sent and the
+        total number of bytes while uploading.
 
     Returns:
         Response: Request response object.
     """
     url = get_full_url(path, client)
-    files = _build_file_dict(file_path, extra_files)
-    response = client.session.post(
-        url, data=data, headers=make_auth_header(client=client), files=files
+    body = MultipartFileStream(
+        data,
+        _build_file_list(file_path, extra_files),
+        progress_callback=progress_callback,
     )
+    headers = make_auth_header(client=client)
+    headers["Content-Type"] = body.content_type
+    headers["Content-Length"] = str(len(body))
+    try:
+        response = send_request(
+            "POST",
+            path,
+            url,
+            client=client,
+            data=body,
+            headers=headers,
+        )
+    finally:
+        body.close()
     check_status(response, path)
     try:
         result = response.json()
@@ -416,36 +938,185 @@ def upload(path, file_path, data={}, extra_files=[], client=default_client):
     return result
 
 
-def _build_file_dict(file_path, extra_files):
-    files = {"file": open(file_path, "rb")}
+def _build_file_list(file_path, extra_files):
+    files = [("file", file_path)]
     i = 2
     for file_path in extra_files:
-        files["file-%s" % i] = open(file_path, "rb")
+        files.append(("file-%s" % i, file_path))
         i += 1
     return files
 
 
-def download(path, file_path, params=None, client=default_client):
+def _get_download_total(response, offset):
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range and not content_range.endswith("*"):
+        return int(content_range.rsplit("/", 1)[1])
+    content_length = response.headers.get("Content-Length")
+    return offset + int(content_length) if content_length else None
+
+
+def _get_content_range(response):
+    """
+    Returns:
+        tuple: First byte and total size of a ranged response, None for
+        unknown values.
+    """
+    match = re.match(
+        r"bytes (?:(\d+)-\d+|\*)/(\d+|\*)",
+        response.headers.get("Content-Range", ""),
+    )
+    if not match:
+        return None, None
+    start, total = match.groups()
+    return (
+        int(start) if start is not None else None,
+        int(total) if total != "*" else None,
+    )
+
+
+def _get_download_validator(response):
     """
-    Download file located at *file_path* to given url *path*.
+    Returns:
+        str: Value for an If-Range header, to only resume the download if the
+        file didn't change. None if the server sends no strong validator.
+    """
+    etag = response.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return response.headers.get("Last-Modified")
+
+
+def _read_download_validator(validator_path):
+    try:
+        with open(validator_path) as validator_file:
+            return validator_file.read().strip() or None
+    except OSError:
+        return None
+
+
+def _remove_files(*file_paths):
+    for file_path in file_paths:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def download(
+    path,
+    file_path,
+    params=None,
+    client=default_client,
+    progress_callback=None,
+):
+    """
+    Download file located at *file_path* to given url *path*. Data is written
+    to a *.part* file next to the target file first. If the connection breaks,
+    the download is resumed from where it stopped with a ranged request,
+    on the next retry or on the next call. A download is only resumed if the
+    server confirms with the ETag or modification date of the file that it
+    didn't change, otherwise it starts over. It can be called from a thread
+    other than the main one.
 
     Args:
         path (str): The url path to download file from.
         file_path (str): The location to store the file on the hard drive.
+        progress_callback (func): Called with the number of bytes written and
+        the total number of bytes (None if unknown) while downloading.
 
     Returns:
         Response: Request response object.
 
     """
     path = build_path_with_params(path, params)
-    with client.session.get(
-        get_full_url(path, client),
-        headers=make_auth_header(client=client),
-        stream=True,
-    ) as response:
-        with open(file_path, "wb") as target_file:
-            shutil.copyfileobj(response.raw, target_file)
-        return response
+    url = get_full_url(path, client)
+    part_path = "%s.part" % file_path
+    validator_path = "%s.validator" % part_path
+    settings = client.http_settings
+
+    attempt = 0
+    while True:
+        validator = _read_download_validator(validator_path)
+        offset = 0
+        if validator and os.path.exists(part_path):
+            offset = os.path.getsize(part_path)
+        headers = make_auth_header(client=client)
+        # Ranges have to match the bytes on disk, not the decoded ones.
+        headers["Accept-Encoding"] = "identity"
+        if offset:
+            headers["Range"] = "bytes=%i-" % offset
+            # The server sends the whole file if it changed since.
+            headers["If-Range"] = validator
+
+        try:
+            # Retried here only, so a broken transfer resumes where it
+            # stopped.
+            with send_request(
+                "GET",
+                path,
+                url,
+                client=client,
+                max_retries=0,
+                headers=headers,
+                stream=True,
+            ) as response:
+                if (
+                    response.status_code in settings["retry_statuses"]
+                    and attempt < settings["max_retries"]
+                ):
+                    raise requests.exceptions.ConnectionError(
+                        "Server responded %i" % response.status_code
+                    )
+
+                if offset and response.status_code == 416:
+                    if _get_content_range(response)[1] == offset:
+                        # The part file is already complete.
+                        break
+                    # The part file doesn't match the file anymore.
+                    _remove_files(part_path, validator_path)
+                    continue
+
+                check_status(response, path)
+                if response.status_code == 206 and (
+                    _get_content_range(response)[0] != offset
+                ):
+                    # Range doesn't continue the part file, start over.
+                    _remove_files(part_path, validator_path)
+                    continue
+                if response.status_code != 206:
+                    # The server sends the whole file again.
+                    offset = 0
+                    _remove_files(validator_path)
+                    new_validator = _get_download_validator(response)
+                    if new_validator:
+                        with open(validator_path, "w") as validator_file:
+                            validator_file.write(new_validator)
+
+                total = _get_download_total(response, offset)
+                with open(part_path, "ab" if offset else "wb") as target_file:
+                    for chunk in response.iter_content(TRANSFER_CHUNK_SIZE):
+                        target_file.write(chunk)
+                        offset += len(chunk)
+                        if progress_callback is not None:
+                            progress_callback(offset, total)
+
+                if total is not None and offset != total:
+                    raise requests.exceptions.ConnectionError(
+                        "Received %i of %i bytes" % (offset, total)
+                    )
+            break
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.ChunkedEncodingError,
+            requests.exceptions.Timeout,
+        ):
+            if attempt >= settings["max_retries"]:
+                raise
+            record_route_retry(client, "GET", path)
+            time.sleep(get_retry_delay(attempt, client=client))
+            attempt += 1
+
+    os.replace(part_path, file_path)
+    _remove_files(validator_path)
+    return response
 
 
 def get_file_data_from_url(url, full=False, client=default_client):
@@ -1074,18 +1074,23 @@ def download_working_file(working_file, file_path=None, client=default):
     )
 
 
-def download_preview_file(preview_file, file_path, client=default):
+def download_preview_file(
+    preview_file, file_path, client=default, progress_callback=None
+):
     """
     Download given preview file and save it at given location.
 
     Args:
         preview_file (str / dict): The preview file dict or ID.
         file_path (str): Location on hard drive where to save the file.
+        progress_callback (func): Called with the number of bytes written and
+        the total number of bytes while downloading.
     """
     return raw.download(
         get_preview_file_url(preview_file),
         file_path,
         client=client,
+        progress_callback=progress_callback,
     )
 
 
@@ -846,7 +846,11 @@ def create_preview(task, comment, client=default):
 
 
 def upload_preview_file(
-    preview, file_path, normalize_movie=True, client=default
+    preview,
+    file_path,
+    normalize_movie=True,
+    client=default,
+    progress_callback=None,
 ):
     """
     Create a preview into given comment.
@@ -854,13 +858,17 @@ def upload_preview_file(
     Args:
         task (str / dict): The task dict or the task ID.
         file_path (str): Path of the file to upload as preview.
+        progress_callback (func): Called with the number of bytes sent and
+        the total number of bytes while uploading.
     """
     path = (
         "pictures/preview-files/%s" % normalize_model_parameter(preview)["id"]
     )
     if not normalize_movie:
         path += "?normalize=false"
-    return raw.upload(path, file_path, client=client)
+    return raw.upload(
+        path, file_path, client=client, progress_callback=progress_callback
+    )
 
 
 def add_preview(
@@ -870,6 +878,7 @@ def add_preview(
     preview_file_url=None,
     normalize_movie=True,
     client=default,
+    progress_callback=None,
 ):
     """
     Add a preview to given comment.
@@ -878,6 +887,8 @@ def add_preview(
         task (str / dict): The task dict or the task ID.
         comment (str / dict): The comment or the comment ID.
         preview_file_path (str): Path of the file to upload as preview.
+        progress_callback (func): Called with the number of bytes sent and
+        the total number of bytes while uploading.
 
     Returns:
         dict: Created preview file model.
@@ -893,6 +904,7 @@ def add_preview(
         preview_file_path,
         normalize_movie=normalize_movie,
         client=client,
+        progress_callback=progress_callback,
     )
 
 
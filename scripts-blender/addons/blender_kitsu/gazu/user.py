@@ -238,6 +238,23 @@ def all_tasks_to_do(client=default):
     return raw.fetch_all("user/tasks", client=client)
 
 
+def all_tasks_to_do_if_changed(validators=None, client=default):
+    """
+    Same as all_tasks_to_do() but always asks the server instead of the
+    cache, with a conditional request.
+
+    Args:
+        validators (dict): Validators returned by an earlier call.
+
+    Returns:
+        tuple: Tasks assigned to current user which are not complete, None if
+        they didn't change since the earlier call, and the new validators.
+    """
+    return raw.get_if_changed(
+        "data/user/tasks", validators=validators, client=client
+    )
+
+
 @cache
 def all_done_tasks(client=default):
     """
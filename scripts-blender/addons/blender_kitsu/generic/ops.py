@@ -26,6 +26,7 @@ from typing import Dict, List, Set, Optional, Tuple, Any
 
 import bpy
 
+from blender_kitsu import background
 from blender_kitsu.logger import LoggerFactory
 
 
@@ -80,16 +81,52 @@ class KITSU_OT_open_path(bpy.types.Operator):
             return self._find_latest_existing_folder(path.parent)
 
 
+class KITSU_OT_background_job_cancel(bpy.types.Operator):
+    bl_idname = "kitsu.background_job_cancel"
+    bl_label = "Cancel"
+    bl_description = "Cancels this Kitsu request running in the background"
+
+    name: bpy.props.StringProperty(  # type: ignore
+        name="Name",
+        description="Name of the background job to cancel",
+        default="",
+    )
+
+    def execute(self, context: bpy.types.Context) -> Set[str]:
+        if not background.is_running(self.name):
+            self.report({"WARNING"}, f"Background job {self.name} isn't running")
+            return {"CANCELLED"}
+
+        background.cancel(self.name)
+        self.report({"INFO"}, f"Cancelled background job {self.name}")
+        return {"FINISHED"}
+
+
+def statusbar_background_jobs_draw_handler(
+    self: Any, context: bpy.types.Context
+) -> None:
+    for job in background.get_running_jobs():
+        text = job.progress_text or job.name.replace("_", " ").title()
+        if job.progress:
+            text += f" {job.progress:.0%}"
+
+        row = self.layout.row(align=True)
+        row.label(text=text, icon="URL")
+        row.operator("kitsu.background_job_cancel", text="", icon="X").name = job.name
+
+
 # ---------REGISTER ----------.
 
-classes = [KITSU_OT_open_path]
+classes = [KITSU_OT_open_path, KITSU_OT_background_job_cancel]
 
 
 def register():
     for cls in classes:
         bpy.utils.register_class(cls)
+    bpy.types.STATUSBAR_HT_header.append(statusbar_background_jobs_draw_handler)
 
 
 def unregister():
+    bpy.types.STATUSBAR_HT_header.remove(statusbar_background_jobs_draw_handler)
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
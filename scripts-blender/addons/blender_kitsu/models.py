@@ -19,6 +19,9 @@
 # (c) 2021, Blender Foundation - Paul Golter
 
 import re
+import os
+import threading
+import time
 
 from pathlib import Path
 from typing import Union, Optional, Dict, List, Tuple
@@ -28,6 +31,60 @@ from blender_kitsu.logger import LoggerFactory
 
 logger = LoggerFactory.getLogger(__name__)
 
+# Directory listings by (path, list folders), with the modification time of the
+# directory and the time it was listed at.
+_listing_cache: Dict[Tuple[str, bool], Tuple[int, float, List[str]]] = {}
+_listing_cache_lock = threading.Lock()
+
+# Modification times can be as coarse as one second, for example on network
+# storage. Listings taken within that time after a change are not trusted.
+_MTIME_RESOLUTION = 1.0
+
+
+def list_dir_cached(path: Path, folders: bool) -> List[str]:
+    """
+    Returns names of the folders or files in path, sorted in reverse order. The
+    directory is only listed again if its modification time changed.
+    """
+    key = (path.as_posix(), folders)
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return []
+
+    with _listing_cache_lock:
+        cached = _listing_cache.get(key)
+    if (
+        cached
+        and cached[0] == mtime_ns
+        and cached[1] > mtime_ns / 1e9 + _MTIME_RESOLUTION
+    ):
+        return list(cached[2])
+
+    listed_at = time.time()
+    try:
+        with os.scandir(path) as entries:
+            names = sorted(
+                [
+                    entry.name
+                    for entry in entries
+                    if (entry.is_dir() if folders else entry.is_file())
+                ],
+                reverse=True,
+            )
+    except OSError:
+        return []
+
+    with _listing_cache_lock:
+        _listing_cache[key] = (mtime_ns, listed_at, names)
+    logger.debug("Listed directory %s", path.as_posix())
+    return list(names)
+
+
+def clear_listing_cache() -> None:
+    with _listing_cache_lock:
+        _listing_cache.clear()
+
 
 class FolderListModel:
     def __init__(self):
@@ -78,10 +135,8 @@ class FolderListModel:
 
     def __detect_folders(self, path: Path) -> List[str]:
         if path.exists() and path.is_dir():
-            # Iterate through directory and return all pathes that are dirs, only return their name.
-            return sorted(
-                [str(x.name) for x in path.iterdir() if x.is_dir()], reverse=True
-            )
+            # Return name of all pathes in directory that are dirs.
+            return list_dir_cached(path, folders=True)
         else:
             return []
 
@@ -110,6 +165,7 @@ class FileListModel:
         self.__files: List[str] = []
         self.__appended: List[str] = []
         self.__combined: List[str] = []
+        self.__versions: List[str] = []
 
     def rowCount(self) -> int:
         return len(self.__combined)
@@ -152,10 +208,8 @@ class FileListModel:
 
     def __detect_files(self, path: Path) -> List[str]:
         if path.exists() and path.is_dir():
-            # Iterate through directory and return all pathes that are files, only return their name.
-            return sorted(
-                [str(x.name) for x in path.iterdir() if x.is_file()], reverse=True
-            )
+            # Return name of all pathes in directory that are files.
+            return list_dir_cached(path, folders=False)
         else:
             return []
 
@@ -168,6 +222,9 @@ class FileListModel:
         self.__combined.extend(
             sorted(list(set(self.__files + self.__appended)), reverse=True)
         )
+        # Parse versions once per change instead of on every query.
+        versions = [self._get_version(i) for i in self.__combined]
+        self.__versions = [v for v in versions if v]
 
     @property
     def items(self) -> List[str]:
@@ -189,7 +246,7 @@ class FileListModel:
 
     @property
     def versions(self) -> List[str]:
-        return [self._get_version(i) for i in self.__combined if self._get_version(i)]
+        return list(self.__versions)
 
     @property
     def versions_as_enum_list(self) -> List[Tuple[str, str, str]]:
@@ -1,10 +1,12 @@
 import bpy
 from pathlib import Path
+from typing import Callable, Optional
 
 import contextlib
 
 from blender_kitsu import (
     prefs,
+    bkglobals,
 )
 
 @contextlib.contextmanager
@@ -37,6 +39,32 @@ def override_render_format(self, context):
             rd.ffmpeg.format = ffmpeg_format
             rd.ffmpeg.audio_codec = ffmpeg_audio_codec
 
+@contextlib.contextmanager
+def override_render_frames_format(self, context):
+        """Overrides the render settings to render playblast frames as images"""
+        rd = context.scene.render
+        percentage = rd.resolution_percentage
+        file_format = rd.image_settings.file_format
+        color_mode = rd.image_settings.color_mode
+        compression = rd.image_settings.compression
+        use_file_extension = rd.use_file_extension
+
+        try:
+            rd.resolution_percentage = 100
+            rd.image_settings.file_format = bkglobals.PLAYBLAST_FRAME_FILE_FORMAT
+            rd.image_settings.color_mode = "RGB"
+            rd.image_settings.compression = bkglobals.PLAYBLAST_FRAME_COMPRESSION
+            rd.use_file_extension = True
+
+            yield
+
+        finally:
+            rd.resolution_percentage = percentage
+            rd.image_settings.file_format = file_format
+            rd.image_settings.color_mode = color_mode
+            rd.image_settings.compression = compression
+            rd.use_file_extension = use_file_extension
+
 @contextlib.contextmanager
 def override_render_path(self, context, render_file_path):
         """Overrides the render settings for playblast creation"""
@@ -238,3 +266,68 @@ def playblast_user_shading_settings(self, context, file_path):
                     # Make opengl render.
                     bpy.ops.render.opengl(animation=True)
                     return output_path
+
+
+def _render_frames(context, on_frame, on_progress=None):
+    scene = context.scene
+    frame_current = scene.frame_current
+    frame_count = scene.frame_end - scene.frame_start + 1
+
+    try:
+        for index, frame in enumerate(range(scene.frame_start, scene.frame_end + 1)):
+            scene.frame_set(frame)
+            bpy.ops.render.opengl(write_still=True)
+            on_frame(Path(bpy.path.abspath(scene.render.frame_path(frame=frame))))
+            if on_progress:
+                on_progress((index + 1) / frame_count)
+    finally:
+        scene.frame_set(frame_current)
+
+
+def playblast_frames(
+    self,
+    context,
+    frame_dir: Path,
+    on_frame: Callable[[Path], None],
+    use_user_shading: bool = True,
+    on_progress: Optional[Callable[[float], None]] = None,
+):
+    """
+    Renders playblast frame by frame to images in frame_dir and calls on_frame
+    with the path of each image as soon as it is written, so it can be encoded
+    while the next frames are rendered.
+    """
+    frame_dir.mkdir(parents=True, exist_ok=True)
+    frames_path = frame_dir.joinpath("frame_######").as_posix()
+
+    with override_render_path(self, context, frames_path):
+        with override_render_frames_format(self, context):
+            with override_metadata_stamp_settings(self, context):
+                with override_hide_viewport_gizmos(self, context):
+                    if use_user_shading:
+                        _render_frames(context, on_frame, on_progress)
+                        return
+
+                    with override_viewport_shading(self, context):
+                        _render_frames(context, on_frame, on_progress)
+
+
+def mixdown_audio(context, file_path: Path) -> Optional[Path]:
+    """
+    Writes the sound of the scene to a wave file, to be muxed into playblasts
+    that are encoded outside of Blender. None if scene has no sound strips.
+    """
+    sequence_editor = context.scene.sequence_editor
+    if not sequence_editor or not any(
+        s.type == "SOUND" and not s.mute for s in sequence_editor.sequences_all
+    ):
+        return None
+
+    bpy.ops.sound.mixdown(
+        filepath=file_path.as_posix(),
+        check_existing=False,
+        relative_path=False,
+        container="WAV",
+        codec="PCM",
+    )
+    return file_path
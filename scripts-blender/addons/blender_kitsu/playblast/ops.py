@@ -18,9 +18,12 @@
 #
 # (c) 2023, Blender Foundation
 
+import shutil
+import tempfile
 import webbrowser
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Tuple, Any
+from typing import Callable, Dict, List, Set, Optional, Tuple, Any
 
 import bpy
 from bpy.app.handlers import persistent
@@ -28,6 +31,7 @@ from bpy.app.handlers import persistent
 from blender_kitsu import bkglobals
 
 from blender_kitsu import (
+    background,
     cache,
     util,
     prefs,
@@ -43,12 +47,202 @@ from blender_kitsu.types import (
 from blender_kitsu.playblast.core import (
     playblast_with_shading_settings,
     playblast_user_shading_settings,
+    playblast_frames,
+    mixdown_audio,
 )
+from blender_kitsu.playblast.pipeline import FrameEncoder, find_ffmpeg
 from blender_kitsu.playblast import opsdata
 
 logger = LoggerFactory.getLogger()
 
 
+def _upload_playblast(
+    shot: Shot,
+    task_type_name: str,
+    task_status_id: str,
+    comment_text: str,
+    filepath: Path,
+    thumbnail_frame: int,
+    progress_callback: Optional[Callable[[int, Optional[int]], None]] = None,
+) -> None:
+    # Get task status 'wip' and task type 'Animation'.
+    task_status = TaskStatus.by_id(task_status_id)
+    task_type = TaskType.by_name(task_type_name)
+
+    if not task_type:
+        raise RuntimeError(
+            "Failed to upload playblast. Task type: 'Animation' is missing"
+        )
+
+    # Find / get latest task
+    task = Task.by_name(shot, task_type)
+    if not task:
+        # An Entity on the server can have 0 tasks even tough task types exist.
+        # We have to create a task first before being able to upload a thumbnail.
+        task = Task.new_task(shot, task_type, task_status=task_status)
+
+    # Create a comment
+    comment = task.add_comment(
+        task_status,
+        comment=comment_text,
+    )
+
+    # Add_preview_to_comment
+    task.add_preview_to_comment(
+        comment,
+        filepath.as_posix(),
+        thumbnail_frame,
+        progress_callback=progress_callback,
+    )
+
+    # Preview.set_main_preview()
+    logger.info(f"Uploaded playblast for shot: {shot.name} under: {task_type.name}")
+
+
+def _encode_and_upload_playblast(
+    job: background.BackgroundJob,
+    encoder: FrameEncoder,
+    temp_dir: Path,
+    shot: Shot,
+    task_type_name: str,
+    task_status_id: str,
+    comment_text: str,
+    thumbnail_frame: int,
+) -> Path:
+    """
+    Waits for the encoder to write the playblast and uploads it to Kitsu.
+    Runs on a worker thread.
+    """
+    try:
+        job.report_progress(0.0, f"Encoding {encoder.output_path.name}")
+        filepath = encoder.finish()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    job.check_cancelled()
+
+    def progress_callback(done: int, total: Optional[int]) -> None:
+        if total:
+            job.report_progress(done / total, f"Uploading {filepath.name}")
+
+    _upload_playblast(
+        shot,
+        task_type_name,
+        task_status_id,
+        comment_text,
+        filepath,
+        thumbnail_frame,
+        progress_callback=progress_callback,
+    )
+    return filepath
+
+
+def _on_background_playblast_done(shot: Shot, filepath: Path) -> None:
+    logger.info("Created and uploaded playblast for %s", shot.name)
+    logger.info("-END- Creating Playblast")
+
+    context = bpy.context
+    # Timers run without window in context, use the first one to open results.
+    with context.temp_override(window=context.window_manager.windows[0]):
+        _post_playblast(bpy.context, filepath, shot)
+
+
+def _on_background_playblast_error(shot_name: str, exception: Exception) -> None:
+    logger.error(
+        "Failed to create playblast for %s",
+        shot_name,
+        exc_info=(type(exception), exception, exception.__traceback__),
+    )
+
+
+def _post_playblast(context: bpy.types.Context, filepath: Path, shot: Shot) -> None:
+    addon_prefs = prefs.addon_prefs_get(context)
+
+    # Redraw UI
+    util.ui_redraw()
+
+    # Open web browser
+    if addon_prefs.pb_open_webbrowser:
+        _open_webbrowser(shot)
+
+    # Open playblast in second scene video sequence editor.
+    if addon_prefs.pb_open_vse:
+        _open_vse(context, filepath)
+
+
+def _open_vse(context: bpy.types.Context, filepath: Path) -> None:
+    # Create new scene.
+    try:
+        scene_pb = bpy.data.scenes[bkglobals.SCENE_NAME_PLAYBLAST]
+    except KeyError:
+        # Create scene.
+        bpy.ops.scene.new(type="EMPTY")  # changes active scene
+        scene_pb = bpy.context.scene
+        scene_pb.name = bkglobals.SCENE_NAME_PLAYBLAST
+
+        logger.info("Created new scene for playblast playback: %s", scene_pb.name)
+    else:
+        logger.info("Use existing scene for playblast playback: %s", scene_pb.name)
+        # Change scene.
+        context.window.scene = scene_pb
+
+    # Init video sequence editor.
+    if not context.scene.sequence_editor:
+        context.scene.sequence_editor_create()  # what the hell
+
+    # Setup video sequence editor space.
+    if "Video Editing" not in [ws.name for ws in bpy.data.workspaces]:
+        scripts_path = bpy.utils.script_paths(use_user=False)[0]
+        template_path = "/startup/bl_app_templates_system/Video_Editing/startup.blend"
+        ws_filepath = Path(scripts_path + template_path)
+        bpy.ops.workspace.append_activate(
+            idname="Video Editing",
+            filepath=ws_filepath.as_posix(),
+        )
+    else:
+        context.window.workspace = bpy.data.workspaces["Video Editing"]
+
+    # Add movie strip
+    # load movie strip file in sequence editor
+    # in this case we make use of ops.sequencer.movie_strip_add because
+    # it provides handy auto placing,would be hard to achieve with
+    # context.scene.sequence_editor.sequences.new_movie().
+    override = context.copy()
+    for window in bpy.context.window_manager.windows:
+        screen = window.screen
+
+        for area in screen.areas:
+            if area.type == "SEQUENCE_EDITOR":
+                override["window"] = window
+                override["screen"] = screen
+                override["area"] = area
+
+    bpy.ops.sequencer.movie_strip_add(
+        override,
+        filepath=filepath.as_posix(),
+        frame_start=context.scene.frame_start,
+    )
+
+    # Playback.
+    context.scene.frame_current = context.scene.frame_start
+    bpy.ops.screen.animation_play()
+
+
+def _open_webbrowser(shot: Shot) -> None:
+    addon_prefs = prefs.addon_prefs_get(bpy.context)
+    # https://staging.kitsu.blender.cloud/productions/7838e728-312b-499a-937b-e22273d097aa/shots?search=010_0010_A
+
+    host_url = addon_prefs.host
+    if host_url.endswith("/api"):
+        host_url = host_url[:-4]
+
+    if host_url.endswith("/"):
+        host_url = host_url[:-1]
+
+    url = f"{host_url}/productions/{shot.project_id}/shots?search={shot.name}"
+    webbrowser.open(url)
+
+
 class KITSU_OT_playblast_create(bpy.types.Operator):
     bl_idname = "kitsu.playblast_create"
     bl_label = "Create Playblast"
@@ -87,6 +281,7 @@ class KITSU_OT_playblast_create(bpy.types.Operator):
             and context.scene.kitsu.playblast_file
         )
 
+    @util.kitsu_request_scope
     def execute(self, context: bpy.types.Context) -> Set[str]:
         addon_prefs = prefs.addon_prefs_get(context)
 
@@ -114,7 +309,13 @@ class KITSU_OT_playblast_create(bpy.types.Operator):
 
         logger.info("-START- Creating Playblast")
 
-        context.window_manager.progress_begin(0, 2)
+        if addon_prefs.pb_background_encode:
+            ffmpeg = find_ffmpeg(bpy.path.abspath(addon_prefs.pb_ffmpeg_path))
+            if ffmpeg:
+                return self._playblast_background(context, ffmpeg)
+            logger.warning("Failed to find ffmpeg, encoding playblast in Blender")
+
+        context.window_manager.progress_begin(0, 1)
         context.window_manager.progress_update(0)
 
         # Render and save playblast
@@ -130,89 +331,16 @@ class KITSU_OT_playblast_create(bpy.types.Operator):
             )
 
         context.window_manager.progress_update(1)
+        context.window_manager.progress_end()
 
-        # Upload playblast
+        # Upload playblast, shows its own progress.
         self._upload_playblast(context, output_path)
 
-        context.window_manager.progress_update(2)
-        context.window_manager.progress_end()
-
         self.report({"INFO"}, f"Created and uploaded playblast for {shot_active.name}")
         logger.info("-END- Creating Playblast")
 
-        # Redraw UI
-        util.ui_redraw()
-
         # Post playblast
-
-        # Open web browser
-        if addon_prefs.pb_open_webbrowser:
-            self._open_webbrowser()
-
-        # Open playblast in second scene video sequence editor.
-        if addon_prefs.pb_open_vse:
-            # Create new scene.
-            scene_orig = bpy.context.scene
-            try:
-                scene_pb = bpy.data.scenes[bkglobals.SCENE_NAME_PLAYBLAST]
-            except KeyError:
-                # Create scene.
-                bpy.ops.scene.new(type="EMPTY")  # changes active scene
-                scene_pb = bpy.context.scene
-                scene_pb.name = bkglobals.SCENE_NAME_PLAYBLAST
-
-                logger.info(
-                    "Created new scene for playblast playback: %s", scene_pb.name
-                )
-            else:
-                logger.info(
-                    "Use existing scene for playblast playback: %s", scene_pb.name
-                )
-                # Change scene.
-                context.window.scene = scene_pb
-
-            # Init video sequence editor.
-            if not context.scene.sequence_editor:
-                context.scene.sequence_editor_create()  # what the hell
-
-            # Setup video sequence editor space.
-            if "Video Editing" not in [ws.name for ws in bpy.data.workspaces]:
-                scripts_path = bpy.utils.script_paths(use_user=False)[0]
-                template_path = (
-                    "/startup/bl_app_templates_system/Video_Editing/startup.blend"
-                )
-                ws_filepath = Path(scripts_path + template_path)
-                bpy.ops.workspace.append_activate(
-                    idname="Video Editing",
-                    filepath=ws_filepath.as_posix(),
-                )
-            else:
-                context.window.workspace = bpy.data.workspaces["Video Editing"]
-
-            # Add movie strip
-            # load movie strip file in sequence editor
-            # in this case we make use of ops.sequencer.movie_strip_add because
-            # it provides handy auto placing,would be hard to achieve with
-            # context.scene.sequence_editor.sequences.new_movie().
-            override = context.copy()
-            for window in bpy.context.window_manager.windows:
-                screen = window.screen
-
-                for area in screen.areas:
-                    if area.type == "SEQUENCE_EDITOR":
-                        override["window"] = window
-                        override["screen"] = screen
-                        override["area"] = area
-
-            bpy.ops.sequencer.movie_strip_add(
-                override,
-                filepath=scene_orig.kitsu.playblast_file,
-                frame_start=context.scene.frame_start,
-            )
-
-            # Playback.
-            context.scene.frame_current = context.scene.frame_start
-            bpy.ops.screen.animation_play()
+        _post_playblast(context, output_path, shot_active)
 
         return {"FINISHED"}
 
@@ -242,43 +370,92 @@ class KITSU_OT_playblast_create(bpy.types.Operator):
         row.prop(self, "use_user_shading")
         row.prop(self, "thumbnail_frame")
 
-    def _upload_playblast(self, context: bpy.types.Context, filepath: Path) -> None:
-        # Get shot.
-        shot = cache.shot_active_get()
-        task_type_name = cache.task_type_active_get().name
-
-        # Get task status 'wip' and task type 'Animation'.
-        task_status = TaskStatus.by_id(self.task_status)
-        task_type = TaskType.by_name(task_type_name)
+    def _playblast_background(
+        self, context: bpy.types.Context, ffmpeg: str
+    ) -> Set[str]:
+        """
+        Renders the frames of the playblast while ffmpeg encodes them, then
+        uploads the playblast to Kitsu in the background. The session can be
+        used again as soon as the last frame is rendered.
+        """
+        shot_active = cache.shot_active_get()
+        output_path = Path(context.scene.kitsu.playblast_file)
+        job_name = f"playblast_{output_path.name}"
 
-        if not task_type:
-            raise RuntimeError(
-                "Failed to upload playblast. Task type: 'Animation' is missing"
+        if background.is_running(job_name):
+            self.report(
+                {"ERROR"},
+                f"Failed to create playblast. {output_path.name} is still uploading",
             )
+            return {"CANCELLED"}
 
-        # Find / get latest task
-        task = Task.by_name(shot, task_type)
-        if not task:
-            # An Entity on the server can have 0 tasks even tough task types exist.
-            # We have to create a task first before being able to upload a thumbnail.
-            task = Task.new_task(shot, task_type, task_status=task_status)
-
-        # Create a comment
-        comment_text = self._gen_comment_text(context, shot)
-        comment = task.add_comment(
-            task_status,
-            comment=comment_text,
+        temp_dir = Path(tempfile.mkdtemp(prefix="blender_kitsu_playblast_"))
+        rd = context.scene.render
+        encoder: Optional[FrameEncoder] = None
+
+        wm = context.window_manager
+        wm.progress_begin(0, 1)
+        try:
+            encoder = FrameEncoder(
+                ffmpeg,
+                output_path,
+                rd.fps / rd.fps_base,
+                audio_path=mixdown_audio(context, temp_dir.joinpath("audio.wav")),
+                log_path=temp_dir.joinpath("ffmpeg.log"),
+            )
+            encoder.start()
+            playblast_frames(
+                self,
+                context,
+                temp_dir.joinpath("frames"),
+                encoder.add_frame,
+                use_user_shading=self.use_user_shading,
+                on_progress=wm.progress_update,
+            )
+        except Exception as e:
+            if encoder:
+                encoder.abort()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            logger.exception("Failed to render playblast")
+            self.report({"ERROR"}, f"Failed to render playblast: {e}")
+            return {"CANCELLED"}
+        finally:
+            wm.progress_end()
+
+        background.submit(
+            job_name,
+            _encode_and_upload_playblast,
+            encoder,
+            temp_dir,
+            shot_active,
+            cache.task_type_active_get().name,
+            self.task_status,
+            self._gen_comment_text(context, shot_active),
+            self.thumbnail_frame_final,
+            on_done=partial(_on_background_playblast_done, shot_active),
+            on_error=partial(_on_background_playblast_error, shot_active.name),
         )
 
-        # Add_preview_to_comment
-        task.add_preview_to_comment(
-            comment,
-            filepath.as_posix(),
-            self.thumbnail_frame_final,
+        self.report(
+            {"INFO"},
+            f"Rendered playblast for {shot_active.name}, uploading in background",
         )
+        return {"FINISHED"}
 
-        # Preview.set_main_preview()
-        logger.info(f"Uploaded playblast for shot: {shot.name} under: {task_type.name}")
+    def _upload_playblast(self, context: bpy.types.Context, filepath: Path) -> None:
+        shot = cache.shot_active_get()
+        with util.transfer_progress(
+            context, f"Uploading {filepath.name}"
+        ) as progress_callback:
+            _upload_playblast(
+                shot,
+                cache.task_type_active_get().name,
+                self.task_status,
+                self._gen_comment_text(context, shot),
+                filepath,
+                self.thumbnail_frame_final,
+                progress_callback=progress_callback,
+            )
 
     def _gen_comment_text(self, context: bpy.types.Context, shot: Shot) -> str:
         header = f"Playblast {shot.name}: {context.scene.kitsu.playblast_version}"
@@ -286,20 +463,6 @@ class KITSU_OT_playblast_create(bpy.types.Operator):
             return header + f"\n\n{self.comment}"
         return header
 
-    def _open_webbrowser(self) -> None:
-        addon_prefs = prefs.addon_prefs_get(bpy.context)
-        # https://staging.kitsu.blender.cloud/productions/7838e728-312b-499a-937b-e22273d097aa/shots?search=010_0010_A
-
-        host_url = addon_prefs.host
-        if host_url.endswith("/api"):
-            host_url = host_url[:-4]
-
-        if host_url.endswith("/"):
-            host_url = host_url[:-1]
-
-        url = f"{host_url}/productions/{cache.project_active_get().id}/shots?search={cache.shot_active_get().name}"
-        webbrowser.open(url)
-
 
 class KITSU_OT_playblast_set_version(bpy.types.Operator):
     bl_idname = "kitsu.anim_set_playblast_version"
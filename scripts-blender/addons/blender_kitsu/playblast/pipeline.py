@@ -0,0 +1,194 @@
+# ***** BEGIN GPL LICENSE BLOCK *****
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# ***** END GPL LICENCE BLOCK *****
+#
+# (c) 2023, Blender Foundation
+
+"""
+Encodes playblast frames with ffmpeg while they are being rendered.
+
+The viewport render has to run on the main thread, but each rendered frame is
+handed to an ffmpeg process on a worker thread right away. The movie file is
+done shortly after the last frame, and the upload to Kitsu can start without
+waiting for Blender to encode the whole shot.
+"""
+
+import queue
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+from blender_kitsu import bkglobals
+from blender_kitsu.logger import LoggerFactory
+
+logger = LoggerFactory.getLogger()
+
+
+def find_ffmpeg(ffmpeg_path: str = "") -> Optional[str]:
+    """
+    Returns path to the ffmpeg executable, ffmpeg_path if set, otherwise
+    ffmpeg on PATH. None if it can't be found.
+    """
+    return shutil.which(ffmpeg_path or "ffmpeg")
+
+
+class FrameEncoder:
+    """
+    Pipes rendered image files into an ffmpeg process that encodes them into
+    an H264 movie. Frame files are deleted once they are encoded.
+    """
+
+    def __init__(
+        self,
+        ffmpeg: str,
+        output_path: Path,
+        fps: float,
+        audio_path: Optional[Path] = None,
+        log_path: Optional[Path] = None,
+    ):
+        self.ffmpeg = ffmpeg
+        self.output_path = output_path
+        self.fps = fps
+        self.audio_path = audio_path
+        self.log_path = log_path
+        self.frame_count = 0
+        self._queue: "queue.Queue[Optional[Path]]" = queue.Queue()
+        self._process: Optional[subprocess.Popen] = None
+        self._thread: Optional[threading.Thread] = None
+        self._exception: Optional[Exception] = None
+        self._log_file = None
+
+    def _get_command(self) -> List[str]:
+        cmd = [
+            self.ffmpeg,
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "image2pipe",
+            "-framerate",
+            f"{self.fps:g}",
+            "-i",
+            "-",
+        ]
+        if self.audio_path:
+            cmd.extend(["-i", self.audio_path.as_posix()])
+
+        cmd.extend(bkglobals.PLAYBLAST_FFMPEG_VIDEO_ARGS)
+        if self.audio_path:
+            cmd.extend(bkglobals.PLAYBLAST_FFMPEG_AUDIO_ARGS)
+            # Audio mixdown can be longer than the frame range by a few samples.
+            cmd.append("-shortest")
+
+        cmd.append(self.output_path.as_posix())
+        return cmd
+
+    def start(self) -> None:
+        cmd = self._get_command()
+        logger.debug("Starting encoder: %s", " ".join(cmd))
+
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.log_path:
+            self._log_file = open(self.log_path, "wb")
+
+        self._process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=self._log_file or subprocess.DEVNULL,
+        )
+        self._thread = threading.Thread(
+            target=self._encode_frames, name="blender_kitsu_encoder", daemon=True
+        )
+        self._thread.start()
+
+    def _encode_frames(self) -> None:
+        while True:
+            frame_path = self._queue.get()
+            if frame_path is None:
+                break
+
+            # Keep draining the queue after an error, so frame files are removed.
+            if self._exception is None:
+                try:
+                    self._process.stdin.write(frame_path.read_bytes())
+                except Exception as e:
+                    self._exception = e
+            frame_path.unlink(missing_ok=True)
+
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+
+    def add_frame(self, frame_path: Path) -> None:
+        """
+        Queues an image file for encoding. Frames are encoded in the order
+        they are added.
+        """
+        if self._exception:
+            raise RuntimeError(
+                f"Failed to encode {self.output_path.name}"
+            ) from self._exception
+        self._queue.put(frame_path)
+        self.frame_count += 1
+
+    def finish(self) -> Path:
+        """
+        Waits until all frames are encoded and the movie is written. Can be
+        called from any thread.
+        """
+        self._queue.put(None)
+        self._thread.join()
+        returncode = self._process.wait()
+        self._close_log()
+
+        if self._exception or returncode != 0:
+            raise RuntimeError(
+                f"Failed to encode {self.output_path.name}. "
+                f"ffmpeg exited with code {returncode}: {self._read_log()}"
+            ) from self._exception
+
+        logger.info(
+            "Encoded %i frames to %s", self.frame_count, self.output_path.as_posix()
+        )
+        return self.output_path
+
+    def abort(self) -> None:
+        """
+        Stops encoding and kills ffmpeg, for example when rendering failed.
+        """
+        if self._process and self._process.poll() is None:
+            self._process.kill()
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join()
+            self._process.wait()
+        self._close_log()
+        logger.info("Aborted encoding %s", self.output_path.name)
+
+    def _close_log(self) -> None:
+        if self._log_file:
+            self._log_file.close()
+            self._log_file = None
+
+    def _read_log(self) -> str:
+        if not self.log_path or not self.log_path.exists():
+            return ""
+        return self.log_path.read_text(errors="replace").strip()
@@ -149,6 +149,12 @@ class KITSU_addon_preferences(bpy.types.AddonPreferences):
         )
         return storage_dir.absolute().as_posix()
 
+    def get_persistent_cache_path(self) -> str:
+        storage_path = (
+            self.get_datadir() / "blender_kitsu" / "cache" / "kitsu_cache.sqlite"
+        )
+        return storage_path.as_posix()
+
     def get_config_dir(self) -> str:
         if not self.is_project_root_valid:
             return ""
@@ -230,6 +236,23 @@ class KITSU_addon_preferences(bpy.types.AddonPreferences):
         default="",
     )
 
+    use_persistent_cache: bpy.props.BoolProperty(  # type: ignore
+        name="Persistent Server Cache",
+        description=(
+            "Store server responses on disk so they can be reused by the next "
+            "Blender sessions. Outdated entries are refreshed with the server "
+            "events on login"
+        ),
+        default=False,
+    )
+    persistent_cache_ttl: bpy.props.IntProperty(  # type: ignore
+        name="Persistent Cache Expiration",
+        description="Time in seconds after which stored server responses are fetched again",
+        default=86400,
+        min=0,
+        subtype="TIME_ABSOLUTE",
+    )
+
     enable_debug: bpy.props.BoolProperty(  # type: ignore
         name="Enable Debug Operators",
         description="Enables Operatots that provide debug functionality",
@@ -274,6 +297,19 @@ class KITSU_addon_preferences(bpy.types.AddonPreferences):
         default=False,
     )
 
+    pb_background_encode: bpy.props.BoolProperty(  # type: ignore
+        name="Encode and Upload Playblast in Background",
+        description="Render playblast frames to images that are encoded with ffmpeg while rendering, then upload to Kitsu in the background. Falls back to encoding in Blender if ffmpeg can't be found",
+        default=False,
+    )
+
+    pb_ffmpeg_path: bpy.props.StringProperty(  # type: ignore
+        name="FFmpeg Executable",
+        description="Path to the ffmpeg executable used to encode playblasts in the background. Uses ffmpeg on PATH if empty",
+        default="",
+        subtype="FILE_PATH",
+    )
+
     media_update_search_paths: bpy.props.CollectionProperty(
         type=KITSU_media_update_search_paths
     )
@@ -381,6 +417,10 @@ class KITSU_addon_preferences(bpy.types.AddonPreferences):
         box.row().prop(self, "playblast_root_dir")
         box.row().prop(self, "pb_open_webbrowser")
         box.row().prop(self, "pb_open_vse")
+        box.row().prop(self, "pb_background_encode")
+        row = box.row()
+        row.active = self.pb_background_encode
+        row.prop(self, "pb_ffmpeg_path")
 
         # Lookdev tools settings.
         self.lookdev.draw(context, layout)
@@ -430,6 +470,9 @@ class KITSU_addon_preferences(bpy.types.AddonPreferences):
         box.label(text="Miscellaneous", icon="MODIFIER")
         box.row().prop(self, "thumbnail_dir")
         box.row().prop(self, "sqe_render_dir")
+        box.row().prop(self, "use_persistent_cache")
+        if self.use_persistent_cache:
+            box.row().prop(self, "persistent_cache_ttl")
         box.row().prop(self, "enable_debug")
         box.row().prop(self, "show_advanced")
 
@@ -68,7 +68,11 @@ def _get_sequences(self: Any, context: bpy.types.Context) -> List[Tuple[str, str
     if not project_active or not addon_prefs.session.is_auth:
         return [("None", "None", "")]
 
-    enum_list = [(s.name, s.name, "") for s in project_active.get_sequences_all()]
+    index = cache.project_index_get()
+    sequences = (
+        index.get_sequences_all() if index else project_active.get_sequences_all()
+    )
+    enum_list = [(s.name, s.name, "") for s in sequences]
     return enum_list
 
 
@@ -7,9 +7,13 @@ from blender_kitsu.shot_builder.builder.init_shot import InitShotStep
 from blender_kitsu.shot_builder.builder.set_render_settings import SetRenderSettingsStep
 from blender_kitsu.shot_builder.builder.new_scene import NewSceneStep
 from blender_kitsu.shot_builder.builder.invoke_hook import InvokeHookStep
+from blender_kitsu.shot_builder.builder.prefetch import AssetPrefetcher
+from blender_kitsu.shot_builder.builder.report import BuildReport, StepReport, get_linked_library_files, get_file_size
 
 import bpy
 
+import pathlib
+import time
 import typing
 import logging
 
@@ -19,6 +23,9 @@ logger = logging.getLogger(__name__)
 class ShotBuilder:
     def __init__(self, context: bpy.types.Context, production: Production, task_type: TaskType, shot_name: str):
         self._steps: typing.List[BuildStep] = []
+        self._asset_paths: typing.Dict[BuildStep, pathlib.Path] = {}
+        self._asset_classes: typing.Optional[typing.Dict[str, typing.Type[Asset]]] = None
+        self.report = BuildReport(shot_name)
 
         shot = production.get_shot(context, shot_name)
         assert(shot)
@@ -28,12 +35,29 @@ class ShotBuilder:
             context=context, production=production, shot=shot, render_settings=render_settings, task_type=task_type)
 
     def __find_asset(self, asset_ref: AssetRef) -> typing.Optional[Asset]:
-        for asset_class in self.build_context.production.assets:
-            asset = typing.cast(Asset, asset_class())
-            logger.debug(f"{asset_ref.name}, {asset.name}")
-            if asset_ref.name == asset.name:
-                return asset
-        return None
+        # Index asset classes by name once, instead of creating all of them for
+        # every asset in the shot. The name can be set when the asset is
+        # created, so it is read from an instance and not from the class.
+        if self._asset_classes is None:
+            self._asset_classes = {}
+            for asset_class in self.build_context.production.assets:
+                asset = typing.cast(Asset, asset_class())
+                self._asset_classes.setdefault(asset.name, asset_class)
+
+        asset_class = self._asset_classes.get(asset_ref.name)
+        if asset_class is None:
+            return None
+        return typing.cast(Asset, asset_class())
+
+    def __resolve_asset_path(self, asset: Asset) -> typing.Optional[pathlib.Path]:
+        variables = self.build_context.as_dict()
+        variables['asset'] = asset
+        try:
+            return pathlib.Path(asset.path.format_map(variables))
+        except (AttributeError, KeyError, ValueError) as e:
+            # Path depends on data that only exists during the build.
+            logger.debug(f"cannot resolve path of {asset} before build: {e}")
+            return None
 
     def create_build_steps(self) -> None:
         self._steps.append(InitShotStep())
@@ -70,20 +94,51 @@ class ShotBuilder:
 
         # Build asset specific build steps.
         for asset in assets:
-            self._steps.append(InitAssetStep(asset))
+            step = InitAssetStep(asset)
+            self._steps.append(step)
+            asset_path = self.__resolve_asset_path(asset)
+            if asset_path:
+                self._asset_paths[step] = asset_path
             # Add asset specific hooks.
             for hook in production.hooks.filter(match_task_type=task_type.name, match_asset_type=asset.asset_type):
                 self._steps.append(InvokeHookStep(hook))
 
-    def build(self) -> None:
+    def build(self) -> BuildReport:
         num_steps = len(self._steps)
         step_number = 1
         build_context = self.build_context
         window_manager = build_context.context.window_manager
+
+        # Read asset files while the shot and scene are set up, so linking them
+        # doesn't wait on the network storage.
+        prefetcher = AssetPrefetcher(list(self._asset_paths.values()))
+        prefetcher.start()
+
         window_manager.progress_begin(min=0, max=num_steps)
-        for step in self._steps:
-            logger.info(f"Building step [{step_number}/{num_steps}]: {step} ")
-            step.execute(build_context=build_context)
-            window_manager.progress_update(value=step_number)
-            step_number += 1
-        window_manager.progress_end()
+        try:
+            for step in self._steps:
+                logger.info(f"Building step [{step_number}/{num_steps}]: {step} ")
+                step_report = StepReport(str(step))
+                asset_path = self._asset_paths.get(step)
+                if asset_path:
+                    step_report.prefetch_wait = prefetcher.wait(asset_path)
+
+                libraries_before = get_linked_library_files()
+                start_time = time.perf_counter()
+                step.execute(build_context=build_context)
+                step_report.duration = time.perf_counter() - start_time
+                step_report.io_bytes = sum(
+                    get_file_size(path) for path in get_linked_library_files() - libraries_before)
+                self.report.steps.append(step_report)
+
+                window_manager.progress_update(value=step_number)
+                step_number += 1
+        finally:
+            window_manager.progress_end()
+            prefetcher.shutdown()
+
+        self.report.prefetch_files = len(self._asset_paths)
+        self.report.prefetch_bytes = prefetcher.bytes_read
+        self.report.prefetch_duration = prefetcher.duration
+        self.report.log()
+        return self.report
@@ -0,0 +1,86 @@
+import bpy
+
+import pathlib
+import typing
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def get_linked_library_files() -> typing.Set[pathlib.Path]:
+    return {pathlib.Path(bpy.path.abspath(library.filepath)) for library in bpy.data.libraries}
+
+
+def get_file_size(path: pathlib.Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+class StepReport:
+    """
+    Timing of a single build step.
+
+    duration: wall time of the step in seconds.
+    io_bytes: size of the library files that were linked by the step.
+    prefetch_wait: time in seconds the step waited for its asset file to be prefetched.
+    """
+
+    def __init__(self, name: str, duration: float = 0.0, io_bytes: int = 0, prefetch_wait: float = 0.0):
+        self.name = name
+        self.duration = duration
+        self.io_bytes = io_bytes
+        self.prefetch_wait = prefetch_wait
+
+    def as_dict(self) -> typing.Dict[str, typing.Any]:
+        return {
+            'name': self.name,
+            'duration': self.duration,
+            'io_bytes': self.io_bytes,
+            'prefetch_wait': self.prefetch_wait,
+        }
+
+
+class BuildReport:
+    """
+    Where a shot build spent its time, per build step and for prefetching asset files.
+    """
+
+    def __init__(self, shot_name: str):
+        self.shot_name = shot_name
+        self.steps: typing.List[StepReport] = []
+        self.prefetch_files = 0
+        self.prefetch_bytes = 0
+        self.prefetch_duration = 0.0
+
+    @property
+    def duration(self) -> float:
+        return sum(step.duration for step in self.steps)
+
+    @property
+    def io_bytes(self) -> int:
+        return sum(step.io_bytes for step in self.steps)
+
+    def as_dict(self) -> typing.Dict[str, typing.Any]:
+        return {
+            'shot_name': self.shot_name,
+            'duration': self.duration,
+            'io_bytes': self.io_bytes,
+            'prefetch_files': self.prefetch_files,
+            'prefetch_bytes': self.prefetch_bytes,
+            'prefetch_duration': self.prefetch_duration,
+            'steps': [step.as_dict() for step in self.steps],
+        }
+
+    def log(self) -> None:
+        logger.info(
+            f"Build report {self.shot_name}: {self.duration:.2f}s, "
+            f"{self.io_bytes / 1024 ** 2:.1f} MiB linked")
+        for step in sorted(self.steps, key=lambda step: step.duration, reverse=True):
+            logger.info(
+                f"  {step.duration:8.2f}s {step.io_bytes / 1024 ** 2:10.1f} MiB "
+                f"(prefetch wait {step.prefetch_wait:.2f}s) {step.name}")
+        logger.info(
+            f"  prefetched {self.prefetch_files} files, "
+            f"{self.prefetch_bytes / 1024 ** 2:.1f} MiB in {self.prefetch_duration:.2f}s worker time")
@@ -44,6 +44,7 @@ def reload():
 
 
 def register():
+    opsdata.register()
     ops.register()
     ui.register()
     draw.register()
@@ -53,3 +54,4 @@ def unregister():
     ui.unregister()
     ops.unregister()
     draw.unregister()
+    opsdata.unregister()
@@ -0,0 +1,373 @@
+# ***** BEGIN GPL LICENSE BLOCK *****
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# ***** END GPL LICENCE BLOCK *****
+#
+# (c) 2021, Blender Foundation - Paul Golter
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import bpy
+
+from blender_kitsu import bkglobals, gazu
+from blender_kitsu.sqe import checkstrip
+from blender_kitsu.types import Sequence, Project, Shot, Task, TaskStatus, TaskType
+from blender_kitsu.logger import LoggerFactory
+
+logger = LoggerFactory.getLogger()
+
+# Batched server operations for sequence strips.
+# All shots and sequences of the involved projects are fetched once and
+# compared locally against the strip state. Only the shots that differ are
+# sent to the server, on a bounded thread pool. Previews are uploaded on a
+# thread pool as well. Strips are only ever read and written on the main
+# thread.
+
+
+def run_in_thread_pool(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int = bkglobals.SQE_SYNC_MAX_WORKERS,
+    progress_callback: Optional[Callable[[int], None]] = None,
+) -> List[Tuple[Any, Any, Optional[Exception]]]:
+    """
+    Calls func for each item on a thread pool. The progress callback is called
+    on the calling thread with the number of finished items.
+    Returns a list of (item, result, exception) tuples in completion order.
+    """
+    results: List[Tuple[Any, Any, Optional[Exception]]] = []
+    items = list(items)
+    if not items:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(func, item): item for item in items}
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                results.append((item, future.result(), None))
+            except Exception as exc:
+                results.append((item, None, exc))
+            if progress_callback:
+                progress_callback(len(results))
+
+    return results
+
+
+def get_linked_strips(
+    strips: Iterable[bpy.types.Sequence],
+) -> List[bpy.types.Sequence]:
+    """Returns strips of a valid type that are linked to a shot, sorted by frame"""
+    linked = [
+        strip
+        for strip in strips
+        if checkstrip.is_valid_type(strip, log=False) and strip.kitsu.linked
+    ]
+    return sorted(linked, key=lambda strip: strip.frame_final_start)
+
+
+def fetch_shots_by_id(project_ids: Iterable[str]) -> Dict[str, Shot]:
+    """Fetches all shots of given projects, one request per project"""
+    shots: Dict[str, Shot] = {}
+    for project_id in set(project_ids):
+        if not project_id:
+            continue
+        for shot in Shot.from_dicts(gazu.shot.all_shots_for_project(project_id)):
+            shots[shot.id] = shot
+    return shots
+
+
+def fetch_sequences_by_id(project_ids: Iterable[str]) -> Dict[str, Sequence]:
+    """Fetches all sequences of given projects, one request per project"""
+    sequences: Dict[str, Sequence] = {}
+    for project_id in set(project_ids):
+        if not project_id:
+            continue
+        for sequence in Sequence.from_dicts(
+            gazu.shot.all_sequences_for_project(project_id)
+        ):
+            sequences[sequence.id] = sequence
+    return sequences
+
+
+def fetch_projects_by_id(project_ids: Iterable[str]) -> Dict[str, Project]:
+    return {
+        project_id: Project.by_id(project_id)
+        for project_id in set(project_ids)
+        if project_id
+    }
+
+
+def resolve_shots(
+    strips: List[bpy.types.Sequence], shots: Dict[str, Shot]
+) -> Tuple[Dict[str, Shot], List[bpy.types.Sequence]]:
+    """
+    Maps strip names to their shot. Shots that are missing from the bulk
+    listing are looked up by id. Returns the mapping and the strips whose
+    shot does not exist on the server anymore.
+    """
+    strip_shots: Dict[str, Shot] = {}
+    missing: List[bpy.types.Sequence] = []
+
+    for strip in strips:
+        shot = shots.get(strip.kitsu.shot_id)
+        if not shot:
+            try:
+                shot = Shot.by_id(strip.kitsu.shot_id)
+            except (
+                gazu.exception.RouteNotFoundException,
+                gazu.exception.ServerErrorException,
+            ):
+                logger.info(
+                    "Strip: %s No shot found on server with ID: %s",
+                    strip.name,
+                    strip.kitsu.shot_id,
+                )
+                missing.append(strip)
+                continue
+            shots[shot.id] = shot
+        strip_shots[strip.name] = shot
+
+    return strip_shots, missing
+
+
+def get_shot_meta_changes(
+    strip: bpy.types.Sequence, shot: Shot, sequences: Dict[str, Sequence]
+) -> Dict[str, Any]:
+    """
+    Returns the shot fields that differ from the strip state, in the same way
+    push.shot_meta would write them. Returns an empty dict if the shot is up
+    to date. The returned dict always contains the shot id if not empty.
+    """
+    data = dict(shot.data or {})
+    data.setdefault("3d_start", bkglobals.FRAME_START)
+    data["frame_in"] = strip.frame_final_start
+    data["frame_out"] = strip.frame_final_end
+    data["fps"] = bkglobals.FPS
+
+    changes: Dict[str, Any] = {}
+    if shot.name != strip.kitsu.shot_name:
+        changes["name"] = strip.kitsu.shot_name
+    if (shot.description or "") != strip.kitsu.shot_description:
+        changes["description"] = strip.kitsu.shot_description
+    if shot.nb_frames != strip.frame_final_duration:
+        changes["nb_frames"] = strip.frame_final_duration
+    if data != (shot.data or {}):
+        changes["data"] = data
+
+    # If user changed the sequence the shot belongs to
+    # (can only be done by operator not by hand).
+    sequence_id = strip.kitsu.sequence_id
+    if sequence_id and sequence_id != (shot.sequence_id or shot.parent_id):
+        sequence = sequences.get(sequence_id) or Sequence.by_id(sequence_id)
+        changes["parent_id"] = sequence.id
+
+    if changes:
+        changes["id"] = shot.id
+    return changes
+
+
+def apply_shot_meta_changes(shot: Shot, changes: Dict[str, Any]) -> None:
+    """Updates the local shot instance with pushed changes"""
+    for key, value in changes.items():
+        if key == "parent_id":
+            shot.sequence_id = value
+        setattr(shot, key, value)
+
+
+def push_shot_meta_changes(
+    changes_list: List[Dict[str, Any]],
+    progress_callback: Optional[Callable[[int], None]] = None,
+) -> List[Tuple[Dict[str, Any], Any, Optional[Exception]]]:
+    """Sends given shot changes to the server on a thread pool"""
+    return run_in_thread_pool(
+        gazu.shot.update_shot,
+        changes_list,
+        progress_callback=progress_callback,
+    )
+
+
+def push_sequence_colors(
+    context: bpy.types.Context,
+    sequences: List[Sequence],
+    progress_callback: Optional[Callable[[int], None]] = None,
+) -> List[Tuple[Any, Any, Optional[Exception]]]:
+    """
+    Same as opsdata.push_sequence_color for multiple sequences. Colors are
+    read on the calling thread and pushed on a thread pool.
+    """
+    items = []
+    for sequence in sequences:
+        try:
+            item = context.scene.kitsu.sequence_colors[sequence.id]
+        except KeyError:
+            logger.info(
+                "%s failed to push sequence color. Does not exists in 'context.scene.kitsu.sequence_colors'",
+                sequence.name,
+            )
+            continue
+        items.append((sequence, list(item.color)))
+
+    results = run_in_thread_pool(
+        lambda item: item[0].update_data({"color": item[1]}),
+        items,
+        progress_callback=progress_callback,
+    )
+    for (sequence, _), _, exc in results:
+        if not exc:
+            logger.info("%s pushed sequence color", sequence.name)
+    return results
+
+
+def pull_shot_meta(
+    strip: bpy.types.Sequence,
+    shot: Shot,
+    sequences: Dict[str, Sequence],
+    projects: Dict[str, Project],
+) -> bool:
+    """
+    Same as pull.shot_meta but reads sequence and project from the prefetched
+    dicts and only writes strip properties that changed.
+    Returns True if the strip was modified.
+    """
+    seq = sequences.get(shot.parent_id) or Sequence.by_id(shot.parent_id)
+    project = projects.get(shot.project_id) or Project.by_id(shot.project_id)
+
+    values = {
+        "sequence_id": seq.id,
+        "sequence_name": seq.name,
+        "shot_id": shot.id,
+        "shot_name": shot.name,
+        "shot_description": shot.description if shot.description else "",
+        "project_id": project.id,
+        "project_name": project.name,
+        "initialized": True,
+        "linked": True,
+    }
+
+    modified = False
+    for key, value in values.items():
+        if getattr(strip.kitsu, key) != value:
+            setattr(strip.kitsu, key, value)
+            modified = True
+
+    if strip.name != shot.name:
+        strip.name = shot.name
+        modified = True
+
+    if modified:
+        logger.info("Pulled meta from shot: %s to strip: %s", shot.name, strip.name)
+    return modified
+
+
+class PreviewUploadQueue:
+    """
+    Uploads previews to the server on a thread pool while the caller keeps
+    rendering. Each file is submitted as soon as it exists. Task and task
+    status lookups are cached, so shots sharing a status only resolve it once.
+    Lookups are retried by the gazu client. Comments, previews and tasks are
+    not, as the server might have created them before the request failed.
+    """
+
+    def __init__(
+        self,
+        task_type: TaskType,
+        comment: str = "",
+        max_workers: int = bkglobals.SQE_SYNC_MAX_WORKERS,
+    ) -> None:
+        self._task_type = task_type
+        self._comment = comment
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        self._futures: Dict[Future, Path] = {}
+        self._lock = threading.Lock()
+        self._task_statuses: Dict[str, TaskStatus] = {}
+
+    def submit(self, filepath: Path, shot: Shot) -> None:
+        """Queue given file to be uploaded as preview of given shot"""
+        future = self._executor.submit(self._upload, filepath, shot)
+        self._futures[future] = filepath
+
+    def wait(
+        self, progress_callback: Optional[Callable[[int], None]] = None
+    ) -> Tuple[List[Path], List[Path]]:
+        """
+        Blocks until all queued uploads are done. The progress callback is
+        called on the calling thread with the number of finished uploads.
+        Returns the lists of uploaded and failed files.
+        """
+        succeeded: List[Path] = []
+        failed: List[Path] = []
+
+        try:
+            for idx, future in enumerate(as_completed(self._futures), 1):
+                filepath = self._futures[future]
+                try:
+                    future.result()
+                except Exception:
+                    logger.exception("Failed to upload preview: %s", filepath)
+                    failed.append(filepath)
+                else:
+                    succeeded.append(filepath)
+                if progress_callback:
+                    progress_callback(idx)
+        finally:
+            self._executor.shutdown(wait=True)
+
+        return succeeded, failed
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    def _get_task_status(self, task_status_id: str) -> TaskStatus:
+        with self._lock:
+            task_status = self._task_statuses.get(task_status_id)
+        if not task_status:
+            task_status = TaskStatus.by_id(task_status_id)
+            with self._lock:
+                self._task_statuses[task_status_id] = task_status
+        return task_status
+
+    def _get_wip_task_status(self) -> TaskStatus:
+        with self._lock:
+            task_status = self._task_statuses.get("wip")
+        if not task_status:
+            task_status = TaskStatus.by_short_name("wip")
+            with self._lock:
+                self._task_statuses["wip"] = task_status
+        return task_status
+
+    def _upload(self, filepath: Path, shot: Shot) -> None:
+        # Same steps as opsdata.upload_preview.
+        task = Task.by_name(shot, self._task_type)
+
+        if not task:
+            # Turns out a entity on the server can have 0 tasks even tough task types exist
+            # you have to create a task first before being able to upload a thumbnail.
+            task_status = self._get_wip_task_status()
+            task = Task.new_task(shot, self._task_type, task_status=task_status)
+        else:
+            task_status = self._get_task_status(task.task_status_id)
+
+        comment_obj = task.add_comment(task_status, comment=self._comment)
+
+        # Also sets the preview as main preview.
+        task.add_preview_to_comment(comment_obj, filepath.as_posix())
+        logger.info(
+            f"Uploaded preview for shot: {shot.name} under: {self._task_type.name}"
+        )
@@ -18,6 +18,7 @@
 #
 # (c) 2021, Blender Foundation - Paul Golter
 
+import bisect
 from typing import Dict, List, Set, Optional, Tuple, Any
 
 import bpy
@@ -75,6 +76,64 @@ def is_range_occupied(range_to_check: range, occupied_ranges: List[range]) -> bo
     return False
 
 
+class OccupiedRanges:
+    """
+    Index of the frame ranges occupied by strips, per channel. Gives the same
+    result as is_range_occupied() in O(log n) instead of scanning all ranges of
+    a channel, and can be updated while strips are added.
+    """
+
+    def __init__(self) -> None:
+        # Per channel: start frames in ascending order, the end frames in the same
+        # order and the running maximum of these end frames.
+        self._starts: Dict[int, List[int]] = {}
+        self._ends: Dict[int, List[int]] = {}
+        self._max_ends: Dict[int, List[int]] = {}
+
+    @classmethod
+    def from_context(cls, context: bpy.types.Context) -> "OccupiedRanges":
+        occupied_ranges = cls()
+        for strip in context.scene.sequence_editor.sequences_all:
+            occupied_ranges.add(
+                strip.channel, strip.frame_final_start, strip.frame_final_end
+            )
+        return occupied_ranges
+
+    def add(self, channel: int, frame_start: int, frame_end: int) -> None:
+        starts = self._starts.setdefault(channel, [])
+        ends = self._ends.setdefault(channel, [])
+        max_ends = self._max_ends.setdefault(channel, [])
+
+        idx = bisect.bisect_right(starts, frame_start)
+        starts.insert(idx, frame_start)
+        ends.insert(idx, frame_end)
+        max_ends.insert(idx, frame_end)
+
+        # Update running maximum from insertion point on.
+        max_end = max_ends[idx - 1] if idx else frame_end
+        for i in range(idx, len(ends)):
+            max_end = max(max_end, ends[i])
+            if i > idx and max_ends[i] == max_end:
+                break
+            max_ends[i] = max_end
+
+    def _is_frame_occupied(self, channel: int, frame: int) -> bool:
+        # First and last frame can be shared with other strips, so a frame is only
+        # occupied if it is inside a range: start < frame < end.
+        starts = self._starts.get(channel)
+        if not starts:
+            return False
+        idx = bisect.bisect_left(starts, frame)
+        return bool(idx) and self._max_ends[channel][idx - 1] > frame
+
+    def is_occupied(self, channel: int, range_to_check: range) -> bool:
+        if not range_to_check:
+            return True
+        return self._is_frame_occupied(
+            channel, range_to_check.start
+        ) or self._is_frame_occupied(channel, range_to_check[-1])
+
+
 def get_shot_strips(context: bpy.types.Context) -> List[bpy.types.Sequence]:
     shot_strips = []
     shot_strips.extend(
@@ -86,3 +145,15 @@ def get_shot_strips(context: bpy.types.Context) -> List[bpy.types.Sequence]:
         ]
     )
     return shot_strips
+
+
+def get_shot_strips_by_id(
+    context: bpy.types.Context,
+) -> Dict[str, bpy.types.Sequence]:
+    """
+    Returns a dictionary that maps shot ids to the first strip linked to that shot.
+    """
+    shot_strips: Dict[str, bpy.types.Sequence] = {}
+    for strip in get_shot_strips(context):
+        shot_strips.setdefault(strip.kitsu.shot_id, strip)
+    return shot_strips
@@ -22,8 +22,8 @@ from typing import Optional
 
 import bpy
 
-from blender_kitsu import gazu
-from blender_kitsu.types import Sequence, Project, Shot, Cache
+from blender_kitsu import gazu, cache
+from blender_kitsu.types import Sequence, Project, Shot, Cache, ProjectIndex
 from blender_kitsu.logger import LoggerFactory
 
 logger = LoggerFactory.getLogger()
@@ -31,6 +31,13 @@ logger = LoggerFactory.getLogger()
 VALID_STRIP_TYPES = {"MOVIE", "COLOR"}
 
 
+def _get_project_index(project: Project) -> Optional[ProjectIndex]:
+    """Returns index of the active project if it is the given project"""
+    if project.id != cache.project_active_get().id:
+        return None
+    return cache.project_index_get()
+
+
 def is_valid_type(strip: bpy.types.Sequence, log: bool = True) -> bool:
     if not strip.type in VALID_STRIP_TYPES:
         if log:
@@ -106,8 +113,13 @@ def seq_exists_by_name(
 
     if clear_cache:
         Cache.clear_all()
+        cache.project_index_reset()
 
-    zseq = project.get_sequence_by_name(strip.kitsu.sequence_name)
+    index = _get_project_index(project)
+    if index:
+        zseq = index.get_sequence_by_name(strip.kitsu.sequence_name)
+    else:
+        zseq = project.get_sequence_by_name(strip.kitsu.sequence_name)
     if not zseq:
         logger.info(
             "Strip: %s Sequence %s does not exist on server",
@@ -135,8 +147,13 @@ def shot_exists_by_name(
 
     if clear_cache:
         Cache.clear_all()
+        cache.project_index_reset()
 
-    shot = project.get_shot_by_name(sequence, strip.kitsu.shot_name)
+    index = _get_project_index(project)
+    if index:
+        shot = index.get_shot_by_name(sequence, strip.kitsu.shot_name)
+    else:
+        shot = project.get_shot_by_name(sequence, strip.kitsu.shot_name)
     if not shot:
         logger.info(
             "Strip: %s Shot %s does not exist on server",
@@ -25,26 +25,28 @@ import typing
 import bpy
 import bgl
 import gpu
+from bpy.app.handlers import persistent
 from gpu_extras.batch import batch_for_shader
 
 
 # Shaders and batches
 
-rect_coords = ((0, 0), (1, 0), (1, 1), (0, 1))
-
 # Setup shaders only if Blender runs in the foreground.
 # If running in the background, no handles are registered, as drawing extra UI
 # elements does not make sense.
 # See register() and unregister().
 if bpy.app.version_string.split('.')[0] == '3':
-    color_key = "2D_UNIFORM_COLOR"
+    flat_color_key = "2D_FLAT_COLOR"
 else:
-    color_key = "UNIFORM_COLOR"
+    flat_color_key = "FLAT_COLOR"
 if not bpy.app.background:
-    ucolor_2d_shader = gpu.shader.from_builtin(color_key) 
-    ucolor_2d_rect_batch = batch_for_shader(
-        ucolor_2d_shader, "TRI_FAN", {"pos": rect_coords}
-    )
+    fcolor_2d_shader = gpu.shader.from_builtin(flat_color_key)
+
+# Batch with the lines of all strips. Only rebuilt when strips changed, see
+# tag_overlay_update().
+overlay_batch = None
+overlay_batch_key = None
+overlay_needs_update = True
 
 
 Float2 = typing.Tuple[float, float]
@@ -52,21 +54,6 @@ Float3 = typing.Tuple[float, float, float]
 Float4 = typing.Tuple[float, float, float, float]
 
 
-def draw_line(position: Float2, size: Float2, color: Float4):
-    with gpu.matrix.push_pop():
-        bgl.glEnable(bgl.GL_BLEND)
-
-        gpu.matrix.translate(position)
-        gpu.matrix.scale(size)
-
-        # Render a colored rectangle
-        ucolor_2d_shader.bind()
-        ucolor_2d_shader.uniform_float("color", color)
-        ucolor_2d_rect_batch.draw(ucolor_2d_shader)
-
-        bgl.glDisable(bgl.GL_BLEND)
-
-
 def get_strip_rectf(strip) -> Float4:
     # Get x and y in terms of the grid's frames and channels.
     x1 = strip.frame_final_start
@@ -78,7 +65,7 @@ def get_strip_rectf(strip) -> Float4:
     return x1, y1, x2, y2
 
 
-def draw_line_in_strip(strip_coords: Float4, height_factor: float, color: Float4):
+def get_line_rectf_in_strip(strip_coords: Float4, height_factor: float) -> Float4:
     # Unpack strip coordinates.
     s_x1, channel, s_x2, _ = strip_coords
 
@@ -92,38 +79,118 @@ def draw_line_in_strip(strip_coords: Float4, height_factor: float, color: Float4
     width_offset = 0.2
     width = (s_x2 - s_x1) - width_offset * 2
 
-    pos = (s_x1 + width_offset, channel + line_height_in_channel)
-    scale = (width, line_thickness)
-    draw_line(pos, scale, color)
+    x1 = s_x1 + width_offset
+    y1 = channel + line_height_in_channel
+    return x1, y1, x1 + width, y1 + line_thickness
 
 
-def draw_callback_px():
-    context = bpy.context
-    sqe = context.scene.sequence_editor
-    if not sqe:
-        return
-    strips = sqe.sequences_all
+def get_strip_lines(
+    context: bpy.types.Context,
+) -> typing.List[typing.Tuple[Float4, Float4]]:
+    """
+    Returns rectangle and color of each line that is drawn on the strips.
+    """
+    lines = []
+    sequence_colors = context.scene.kitsu.sequence_colors
 
-    for strip in strips:
+    for strip in context.scene.sequence_editor.sequences_all:
         # Get corners of the strip rectangle in terms of the grid's frames and channels (virtual, not px).
         strip_coords = get_strip_rectf(strip)
 
         if strip.kitsu.initialized or strip.kitsu.linked:
-            try:
-                color = tuple(
-                    context.scene.kitsu.sequence_colors[strip.kitsu.sequence_id].color
-                )
-            except KeyError:
-                color = (1, 1, 1)
+            item = sequence_colors.get(strip.kitsu.sequence_id)
+            color = tuple(item.color) if item else (1, 1, 1)
 
             alpha = 0.75 if strip.kitsu.linked else 0.25
 
             line_color = color + (alpha,)
-            draw_line_in_strip(strip_coords, 0.0, line_color)
+            lines.append((get_line_rectf_in_strip(strip_coords, 0.0), line_color))
 
         if strip.kitsu.media_outdated:
             line_color = (1.0, 0.05, 0.145, 0.75)
-            draw_line_in_strip(strip_coords, 0.9, line_color)
+            lines.append((get_line_rectf_in_strip(strip_coords, 0.9), line_color))
+
+    return lines
+
+
+def build_overlay_batch(context: bpy.types.Context):
+    """
+    Builds one batch with two triangles per line, so all lines are drawn with a
+    single draw call.
+    """
+    positions = []
+    colors = []
+    for (x1, y1, x2, y2), color in get_strip_lines(context):
+        positions.extend(((x1, y1), (x2, y1), (x2, y2), (x1, y1), (x2, y2), (x1, y2)))
+        colors.extend((color,) * 6)
+
+    if not positions:
+        return None
+    return batch_for_shader(
+        fcolor_2d_shader, "TRIS", {"pos": positions, "color": colors}
+    )
+
+
+def tag_overlay_update() -> None:
+    global overlay_needs_update
+    overlay_needs_update = True
+
+
+def draw_callback_px():
+    global overlay_batch, overlay_batch_key, overlay_needs_update
+
+    context = bpy.context
+    sqe = context.scene.sequence_editor
+    if not sqe:
+        return
+
+    # Cheap safety net for changes that are not reported, like switching scenes.
+    key = (context.scene.as_pointer(), len(sqe.sequences_all))
+    if overlay_needs_update or key != overlay_batch_key:
+        overlay_batch = build_overlay_batch(context)
+        overlay_batch_key = key
+        overlay_needs_update = False
+
+    if not overlay_batch:
+        return
+
+    bgl.glEnable(bgl.GL_BLEND)
+    fcolor_2d_shader.bind()
+    overlay_batch.draw(fcolor_2d_shader)
+    bgl.glDisable(bgl.GL_BLEND)
+
+
+# Strip properties that change the overlay without necessarily triggering a
+# depsgraph update.
+msgbus_owner = object()
+msgbus_strip_props = ("channel", "frame_final_start", "frame_final_end", "frame_start")
+
+
+def subscribe_strip_changes() -> None:
+    bpy.msgbus.clear_by_owner(msgbus_owner)
+    for prop in msgbus_strip_props:
+        bpy.msgbus.subscribe_rna(
+            key=(bpy.types.Sequence, prop),
+            owner=msgbus_owner,
+            args=(),
+            notify=tag_overlay_update,
+        )
+
+
+@persistent
+def depsgraph_update_post_handler_tag_overlay(
+    scene: bpy.types.Scene, depsgraph: bpy.types.Depsgraph
+) -> None:
+    # Kitsu properties of strips and sequence colors are stored in the scene.
+    if depsgraph.id_type_updated("SCENE"):
+        tag_overlay_update()
+
+
+@persistent
+def load_post_handler_tag_overlay(dummy: typing.Any) -> None:
+    # Message bus subscriptions are lost when loading a file.
+    subscribe_strip_changes()
+    tag_overlay_update()
 
 
 draw_handles = []
@@ -138,11 +205,21 @@ def register():
             draw_callback_px, (), "WINDOW", "POST_VIEW"
         )
     )
+    subscribe_strip_changes()
+    bpy.app.handlers.depsgraph_update_post.append(
+        depsgraph_update_post_handler_tag_overlay
+    )
+    bpy.app.handlers.load_post.append(load_post_handler_tag_overlay)
 
 
 def unregister():
     if bpy.app.background:
         return
+    bpy.app.handlers.load_post.remove(load_post_handler_tag_overlay)
+    bpy.app.handlers.depsgraph_update_post.remove(
+        depsgraph_update_post_handler_tag_overlay
+    )
+    bpy.msgbus.clear_by_owner(msgbus_owner)
     for handle in reversed(draw_handles):
         try:
             bpy.types.SpaceSequenceEditor.draw_handler_remove(handle, "WINDOW")
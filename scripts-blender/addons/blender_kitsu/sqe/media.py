@@ -0,0 +1,123 @@
+# ***** BEGIN GPL LICENSE BLOCK *****
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# ***** END GPL LICENCE BLOCK *****
+#
+# (c) 2021, Blender Foundation - Paul Golter
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from blender_kitsu import bkglobals, models, util
+from blender_kitsu.logger import LoggerFactory
+
+logger = LoggerFactory.getLogger()
+
+# Maps file names without version string to the versioned files with that name,
+# latest version first.
+MediaGroups = Dict[str, List[Path]]
+
+
+def get_version_key(filename: str) -> Optional[str]:
+    """
+    Returns filename without its version string, which is the same for all
+    versions of a media file. None if filename has no version string.
+    """
+    version = util.get_version(filename)
+    if not version:
+        return None
+    return filename.replace(version, "")
+
+
+def group_media_files(folder: Path, filenames: List[str]) -> MediaGroups:
+    """
+    Groups the versioned files of folder by version key. Expects filenames in
+    reverse order, as returned by models.list_dir_cached.
+    """
+    groups: MediaGroups = {}
+    for filename in filenames:
+        key = get_version_key(filename)
+        if key is None:
+            continue
+        groups.setdefault(key, []).append(folder / filename)
+    return groups
+
+
+class MediaVersionIndex:
+    """
+    Versions of media files per folder. Folders are listed with
+    models.list_dir_cached, so they are only listed again when their
+    modification time changed, and only grouped again when the listing changed.
+    """
+
+    def __init__(self) -> None:
+        self._folders: Dict[Path, Tuple[List[str], MediaGroups]] = {}
+        self._lock = threading.Lock()
+
+    def _scan(self, folder: Path) -> None:
+        filenames = models.list_dir_cached(folder, folders=False)
+        with self._lock:
+            entry = self._folders.get(folder)
+        if entry and entry[0] == filenames:
+            return
+
+        groups = group_media_files(folder, filenames)
+        with self._lock:
+            self._folders[folder] = (filenames, groups)
+
+    def update(
+        self,
+        folders: Iterable[Path],
+        max_workers: int = bkglobals.MEDIA_SCAN_MAX_WORKERS,
+    ) -> None:
+        """
+        Scans given folders in parallel, unchanged folders are skipped.
+        """
+        folders = set(folders)
+        if len(folders) == 1:
+            self._scan(folders.pop())
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Consume results to raise exceptions of the workers.
+            list(executor.map(self._scan, folders))
+
+    def get_versions(self, media_path: Path) -> List[Path]:
+        """
+        Returns all versions of media_path found on disk, latest version first.
+        The folder of media_path is scanned if it changed.
+        """
+        key = get_version_key(media_path.name)
+        if key is None:
+            return []
+
+        folder = media_path.parent
+        self.update([folder])
+        with self._lock:
+            return list(self._folders[folder][1].get(key, []))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._folders.clear()
+
+
+_media_index = MediaVersionIndex()
+
+
+def get_media_index() -> MediaVersionIndex:
+    return _media_index
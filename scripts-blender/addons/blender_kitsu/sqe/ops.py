@@ -27,12 +27,20 @@ from typing import Dict, List, Set, Optional, Tuple, Any
 import datetime
 import bpy
 
-from blender_kitsu import gazu, cache, util, prefs, bkglobals
-from blender_kitsu.sqe import push, pull, checkstrip, opsdata, checksqe
+from blender_kitsu import gazu, cache, util, prefs, bkglobals, background
+from blender_kitsu.sqe import (
+    push,
+    pull,
+    checkstrip,
+    opsdata,
+    checksqe,
+    batch,
+    media,
+)
 
 from blender_kitsu.logger import LoggerFactory
 from blender_kitsu.types import (
-    Cache,
+    Project,
     Sequence,
     Shot,
     TaskType,
@@ -58,6 +66,7 @@ class KITSU_OT_sqe_push_shot_meta(bpy.types.Operator):
     def poll(cls, context: bpy.types.Context) -> bool:
         return bool(prefs.session_auth(context))
 
+    @util.kitsu_request_scope
     def execute(self, context: bpy.types.Context) -> Set[str]:
         succeeded = []
         failed = []
@@ -68,64 +77,76 @@ class KITSU_OT_sqe_push_shot_meta(bpy.types.Operator):
         if not selected_sequences:
             selected_sequences = context.scene.sequence_editor.sequences_all
 
-        # Sort strips.
-        selected_sequences = sorted(
-            selected_sequences, key=lambda strip: strip.frame_final_start
-        )
-
-        # Begin progress update.
-        context.window_manager.progress_begin(0, len(selected_sequences))
+        # Only strips linked to server, sorted by frame.
+        strips = batch.get_linked_strips(selected_sequences)
 
-        # Clear cache.
-        Cache.clear_all()
+        # Sync cache with changes on server.
+        cache.server_events_sync()
 
-        # Track sequence ids that were processed to later update sequence.data["color"] on kitu.
-        sequence_ids: List[str] = []
+        # Fetch all shots and sequences of involved projects at once.
+        project_ids = {strip.kitsu.project_id for strip in strips}
+        shots = batch.fetch_shots_by_id(project_ids)
+        sequences = batch.fetch_sequences_by_id(project_ids)
+        strip_shots, failed = batch.resolve_shots(strips, shots)
 
-        # Shots.
-        for idx, strip in enumerate(selected_sequences):
-            context.window_manager.progress_update(idx)
-
-            if not checkstrip.is_valid_type(strip):
-                # Failed.append(strip).
-                continue
-
-            # Only if strip is linked to sevrer.
-            if not checkstrip.is_linked(strip):
-                # Failed.append(strip).
-                continue
-
-            # Check if shot is still available by id.
-            shot = checkstrip.shot_exists_by_id(strip, clear_cache=False)
+        # Compare strips with shots locally, collect shots that changed.
+        changes_list: List[Dict[str, Any]] = []
+        strips_by_shot_id: Dict[str, bpy.types.Sequence] = {}
+        for strip in strips:
+            shot = strip_shots.get(strip.name)
             if not shot:
+                continue
+            # Several strips can be linked to the same shot, push it only once.
+            if shot.id in strips_by_shot_id:
+                logger.warning(
+                    "Strip: %s links to same shot as strip: %s. Skipped pushing it",
+                    strip.name,
+                    strips_by_shot_id[shot.id].name,
+                )
                 failed.append(strip)
                 continue
+            strips_by_shot_id[shot.id] = strip
+            changes = batch.get_shot_meta_changes(strip, shot, sequences)
+            if changes:
+                changes_list.append(changes)
+            else:
+                succeeded.append(strip)
 
-            # Push update to shot.
-            push.shot_meta(strip, shot)
-
-            # Append sequence id.
-            if shot.parent_id not in sequence_ids:
-                sequence_ids.append(shot.parent_id)
+        # Push changed shots in parallel, progress is updated on main thread.
+        context.window_manager.progress_begin(0, len(changes_list))
+        results = batch.push_shot_meta_changes(
+            changes_list, progress_callback=context.window_manager.progress_update
+        )
+        context.window_manager.progress_end()
 
+        for changes, _, exc in results:
+            strip = strips_by_shot_id[changes["id"]]
+            if exc:
+                logger.error("Failed to push meta of strip %s: %s", strip.name, exc)
+                failed.append(strip)
+                continue
+            shot = strip_shots[strip.name]
+            batch.apply_shot_meta_changes(shot, changes)
+            logger.info("Pushed meta to shot: %s from strip: %s", shot.name, strip.name)
             succeeded.append(strip)
 
-        # End progress update.
-        context.window_manager.progress_update(len(selected_sequences))
-        context.window_manager.progress_end()
-
         # Sequences.
+        # Track sequence ids that were processed to later update sequence.data["color"] on kitu.
+        sequence_ids: List[str] = []
+        for strip in succeeded:
+            shot = strip_shots[strip.name]
+            if shot.parent_id not in sequence_ids:
+                sequence_ids.append(shot.parent_id)
 
-        # Begin second progress update for sequences.
         context.window_manager.progress_begin(0, len(sequence_ids))
-        for idx, seq_id in enumerate(sequence_ids):
-            context.window_manager.progress_update(idx)
-
-            sequence = Sequence.by_id(seq_id)
-            opsdata.push_sequence_color(context, sequence)
-
-        # End second progress update.
-        context.window_manager.progress_update(len(sequence_ids))
+        batch.push_sequence_colors(
+            context,
+            [
+                sequences.get(seq_id) or Sequence.by_id(seq_id)
+                for seq_id in sequence_ids
+            ],
+            progress_callback=context.window_manager.progress_update,
+        )
         context.window_manager.progress_end()
 
         # Report.
@@ -141,7 +162,11 @@ class KITSU_OT_sqe_push_shot_meta(bpy.types.Operator):
         )
 
         # Log.
-        logger.info("-END- Pushing Metadata")
+        logger.info(
+            "-END- Pushing Metadata. %i of %i shots changed",
+            len(changes_list),
+            len(strips),
+        )
 
         return {"FINISHED"}
 
@@ -181,8 +206,8 @@ class KITSU_OT_sqe_push_new_shot(bpy.types.Operator):
         failed = []
         logger.info("-START- Submitting new shots to: %s", project_active.name)
 
-        # Clear cache.
-        Cache.clear_all()
+        # Sync cache with changes on server.
+        cache.server_events_sync()
 
         # Get strips.
         selected_sequences = context.selected_sequences
@@ -249,8 +274,8 @@ class KITSU_OT_sqe_push_new_shot(bpy.types.Operator):
         context.window_manager.progress_update(len(selected_sequences))
         context.window_manager.progress_end()
 
-        # Clear cache.
-        Cache.clear_all()
+        # Sync cache with changes on server.
+        cache.server_events_sync()
 
         # Report.
         report_str = f"Submitted {len(succeeded)} new shots"
@@ -352,8 +377,8 @@ class KITSU_OT_sqe_push_new_sequence(bpy.types.Operator):
         # Push sequence color.
         opsdata.push_sequence_color(context, sequence)
 
-        # Clear cache.
-        Cache.clear_all()
+        # Sync cache with changes on server.
+        cache.server_events_sync()
 
         self.report(
             {"INFO"},
@@ -653,6 +678,7 @@ class KITSU_OT_sqe_multi_edit_strip(bpy.types.Operator):
                 return False
         return True
 
+    @util.kitsu_request_scope
     def execute(self, context: bpy.types.Context) -> Set[str]:
         addon_prefs = prefs.addon_prefs_get(context)
         shot_counter_increment = addon_prefs.shot_counter_increment
@@ -742,6 +768,7 @@ class KITSU_OT_sqe_pull_shot_meta(bpy.types.Operator):
     def poll(cls, context: bpy.types.Context) -> bool:
         return bool(prefs.session_auth(context))
 
+    @util.kitsu_request_scope
     def execute(self, context: bpy.types.Context) -> Set[str]:
         succeeded = []
         failed = []
@@ -752,41 +779,37 @@ class KITSU_OT_sqe_pull_shot_meta(bpy.types.Operator):
         if not selected_sequences:
             selected_sequences = context.scene.sequence_editor.sequences_all
 
-        # Sort sequences.
-        selected_sequences = sorted(
-            selected_sequences, key=lambda strip: strip.frame_final_start
-        )
+        # Only strips linked to server, sorted by frame.
+        strips = batch.get_linked_strips(selected_sequences)
 
-        # Begin progress update.
-        context.window_manager.progress_begin(0, len(selected_sequences))
+        # Sync cache with changes on server.
+        cache.server_events_sync()
 
-        # Clear cache once.
-        Cache.clear_all()
+        # Fetch all shots, sequences and projects of involved projects at once.
+        project_ids = {strip.kitsu.project_id for strip in strips}
+        shots = batch.fetch_shots_by_id(project_ids)
+        sequences = batch.fetch_sequences_by_id(project_ids)
+        strip_shots, failed = batch.resolve_shots(strips, shots)
+        projects = batch.fetch_projects_by_id(
+            {shot.project_id for shot in strip_shots.values()}
+        )
 
         # Track sequence ids that were processed to later update sequence.data["color"] on kitu.
         sequence_ids: List[str] = []
 
+        # Begin progress update.
+        context.window_manager.progress_begin(0, len(strips))
+
         # Shots.
-        for idx, strip in enumerate(selected_sequences):
+        for idx, strip in enumerate(strips):
             context.window_manager.progress_update(idx)
 
-            if not checkstrip.is_valid_type(strip):
-                # Failed.append(strip).
-                continue
-
-            # Only if strip is linked to sevrer.
-            if not checkstrip.is_linked(strip):
-                # Failed.append(strip).
-                continue
-
-            # Check if shot is still available by id.
-            shot = checkstrip.shot_exists_by_id(strip, clear_cache=False)
+            shot = strip_shots.get(strip.name)
             if not shot:
-                failed.append(strip)
                 continue
 
-            # Push update to shot.
-            pull.shot_meta(strip, shot, clear_cache=False)
+            # Pull update to strip, only writes what changed.
+            batch.pull_shot_meta(strip, shot, sequences, projects)
 
             # Append sequence id.
             if shot.parent_id not in sequence_ids:
@@ -795,21 +818,14 @@ class KITSU_OT_sqe_pull_shot_meta(bpy.types.Operator):
             succeeded.append(strip)
 
         # End progress update.
-        context.window_manager.progress_update(len(selected_sequences))
+        context.window_manager.progress_update(len(strips))
         context.window_manager.progress_end()
 
         # Sequences.
-        # Begin second progress update for sequences.
-        context.window_manager.progress_begin(0, len(sequence_ids))
-        for idx, seq_id in enumerate(sequence_ids):
-            context.window_manager.progress_update(idx)
-            sequence = Sequence.by_id(seq_id)
+        for seq_id in sequence_ids:
+            sequence = sequences.get(seq_id) or Sequence.by_id(seq_id)
             opsdata.append_sequence_color(context, sequence)
 
-        # End second progress update.
-        context.window_manager.progress_update(len(sequence_ids))
-        context.window_manager.progress_end()
-
         # Report.
         report_str = f"Pulled metadata for {len(succeeded)} shots"
         report_state = "INFO"
@@ -955,8 +971,8 @@ class KITSU_OT_sqe_push_del_shot(bpy.types.Operator):
         failed = []
         logger.info("-START- Deleting shots")
 
-        # Clear cache.
-        Cache.clear_all()
+        # Sync cache with changes on server.
+        cache.server_events_sync()
 
         # Begin progress update.
         selected_sequences = context.selected_sequences
@@ -1112,18 +1128,21 @@ class KITSU_OT_sqe_push_render_still(bpy.types.Operator):
             prefs.session_auth(context) and context.scene.kitsu.task_type_thumbnail_id
         )
 
+    @util.kitsu_request_scope
     def execute(self, context: bpy.types.Context) -> Set[str]:
         nr_of_strips: int = len(context.selected_sequences)
         do_multishot: bool = nr_of_strips > 1
         failed = []
-        upload_queue: List[Path] = []  # Will be used as succeeded list
         # Get task type by id from user selection enum property.
         task_type = TaskType.by_id(context.scene.kitsu.task_type_thumbnail_id)
 
+        # Thumbnails are uploaded in the background while the next ones render.
+        upload_queue = batch.PreviewUploadQueue(task_type, comment="Update thumbnail")
+
         logger.info("-START- Pushing shot thumbnails")
 
-        # Clear cache.
-        Cache.clear_all()
+        # Sync cache with changes on server.
+        cache.server_events_sync()
 
         with self.override_render_settings(context):
             with self.temporary_current_frame(context) as original_curframe:
@@ -1169,7 +1188,7 @@ class KITSU_OT_sqe_push_render_still(bpy.types.Operator):
                         self.set_middle_frame(context, strip)
 
                     path = self.make_thumbnail(context, strip)
-                    upload_queue.append(path)
+                    upload_queue.submit(path, shot)
 
                 # End first progress update.
                 context.window_manager.progress_update(len(upload_queue))
@@ -1177,22 +1196,16 @@ class KITSU_OT_sqe_push_render_still(bpy.types.Operator):
 
         # ----ULPOAD THUMBNAILS ------.
 
-        # Begin second progress update.
+        # Wait for remaining uploads.
         context.window_manager.progress_begin(0, len(upload_queue))
-
-        # Process thumbnail queue.
-        for idx, filepath in enumerate(upload_queue):
-            context.window_manager.progress_update(idx)
-            opsdata.upload_preview(
-                context, filepath, task_type, comment="Update thumbnail"
-            )
-
-        # End second progress update.
-        context.window_manager.progress_update(len(upload_queue))
+        uploaded, upload_failed = upload_queue.wait(
+            progress_callback=context.window_manager.progress_update
+        )
+        failed.extend(upload_failed)
         context.window_manager.progress_end()
 
         # Report.
-        report_str = f"Created thumbnails for {len(upload_queue)} shots"
+        report_str = f"Created thumbnails for {len(uploaded)} shots"
         report_state = "INFO"
         if failed:
             report_state = "WARNING"
@@ -1299,16 +1312,21 @@ class KITSU_OT_sqe_push_render(bpy.types.Operator):
             prefs.session_auth(context) and context.scene.kitsu.task_type_sqe_render_id
         )
 
+    @util.kitsu_request_scope
     def execute(self, context: bpy.types.Context) -> Set[str]:
         failed = []
-        upload_queue: List[Path] = []  # will be used as successed list
         # Get task stype by id from user selection enum property.
         task_type = TaskType.by_id(context.scene.kitsu.task_type_sqe_render_id)
 
+        # Renders are uploaded in the background while the next ones render.
+        upload_queue = batch.PreviewUploadQueue(
+            task_type, comment="Sequence Editor Render"
+        )
+
         logger.info("-START- Pushing Sequence Render")
 
-        # Clear cache.
-        Cache.clear_all()
+        # Sync cache with changes on server.
+        cache.server_events_sync()
 
         with self.override_render_settings(context):
             # ----RENDER AND SAVE SQE ------.
@@ -1356,8 +1374,8 @@ class KITSU_OT_sqe_push_render(bpy.types.Operator):
                 # Make opengl render.
                 bpy.ops.render.opengl(animation=True, sequencer=True)
 
-                # Append path to upload queue.
-                upload_queue.append(output_path)
+                # Start uploading while the next strip renders.
+                upload_queue.submit(output_path, shot)
 
             # End first progress update.
             context.window_manager.progress_update(len(upload_queue))
@@ -1365,22 +1383,16 @@ class KITSU_OT_sqe_push_render(bpy.types.Operator):
 
         # ----UPLOAD SQE RENDER ------.
 
-        # Begin second progress update.
+        # Wait for remaining uploads.
         context.window_manager.progress_begin(0, len(upload_queue))
-
-        # Process thumbnail queue.
-        for idx, filepath in enumerate(upload_queue):
-            context.window_manager.progress_update(idx)
-            opsdata.upload_preview(
-                context, filepath, task_type, comment="Sequence Editor Render"
-            )
-
-        # End second progress update.
-        context.window_manager.progress_update(len(upload_queue))
+        uploaded, upload_failed = upload_queue.wait(
+            progress_callback=context.window_manager.progress_update
+        )
+        failed.extend(upload_failed)
         context.window_manager.progress_end()
 
         # Report.
-        report_str = f"Uploaded sequence editor render for {len(upload_queue)} shots"
+        report_str = f"Uploaded sequence editor render for {len(uploaded)} shots"
         report_state = "INFO"
         if failed:
             report_state = "WARNING"
@@ -1500,6 +1512,7 @@ class KITSU_OT_sqe_push_shot(bpy.types.Operator):
         layout.prop(self, 'task_status')
         layout.prop(self, 'comment')
 
+    @util.kitsu_request_scope
     def execute(self, context: bpy.types.Context) -> Set[str]:
         active_strip = context.scene.sequence_editor.active_strip
 
@@ -1598,7 +1611,7 @@ class KITSU_OT_sqe_debug_duplicates(bpy.types.Operator):
         return {"FINISHED"}
 
     def invoke(self, context: bpy.types.Context, event: bpy.types.Event) -> Set[str]:
-        opsdata._sqe_duplicates[:] = opsdata.sqe_update_duplicates(context)
+        opsdata.sqe_update_diagnostics(context)
         return context.window_manager.invoke_props_popup(self, event)  # type: ignore
 
 
@@ -1637,7 +1650,7 @@ class KITSU_OT_sqe_debug_not_linked(bpy.types.Operator):
         return {"FINISHED"}
 
     def invoke(self, context: bpy.types.Context, event: bpy.types.Event) -> Set[str]:
-        opsdata._sqe_not_linked[:] = opsdata.sqe_update_not_linked(context)
+        opsdata.sqe_update_diagnostics(context)
         return context.window_manager.invoke_props_popup(self, event)  # type: ignore
 
 
@@ -1676,7 +1689,7 @@ class KITSU_OT_sqe_debug_multi_project(bpy.types.Operator):
         return {"FINISHED"}
 
     def invoke(self, context: bpy.types.Context, event: bpy.types.Event) -> Set[str]:
-        opsdata._sqe_multi_project[:] = opsdata.sqe_update_multi_project(context)
+        opsdata.sqe_update_diagnostics(context)
         return context.window_manager.invoke_props_popup(self, event)  # type: ignore
 
 
@@ -1694,21 +1707,73 @@ class KITSU_OT_sqe_pull_edit(bpy.types.Operator):
         addon_prefs = prefs.addon_prefs_get(context)
         return bool(prefs.session_auth(context) and cache.project_active_get())
 
+    _job: Optional[background.BackgroundJob] = None
+
     def execute(self, context: bpy.types.Context) -> Set[str]:
-        addon_prefs = prefs.addon_prefs_get(context)
+        logger.info("-START- Pulling Edit")
+
+        job, self._job = self._job, None
+        if job and not job.is_cancelled:
+            # Started by invoke, usually done when the dialog is confirmed.
+            try:
+                sequences, shots = job.future.result()
+            except Exception as exc:
+                self.report({"ERROR"}, f"Failed to pull edit: {exc}")
+                return {"CANCELLED"}
+        else:
+            project = cache.project_active_get()
+            sequences = project.get_sequences_all()
+            shots = project.get_shots_all()
+
+        return self._pull_edit(context, sequences, shots)
+
+    def invoke(self, context: bpy.types.Context, event: bpy.types.Event) -> Set[str]:
+        # Fetch the edit in the background while the dialog is open.
+        self._job = background.submit(
+            "pull_edit", self._fetch_edit, cache.project_active_get()
+        )
+        return context.window_manager.invoke_props_dialog(  # type: ignore
+            self, width=300
+        )
+
+    def cancel(self, context: bpy.types.Context) -> None:
+        # Dialog was dismissed, the edit isn't needed anymore.
+        job, self._job = self._job, None
+        if job and background.get_job(job.name) is job:
+            background.cancel(job.name)
+
+    @staticmethod
+    def _fetch_edit(
+        job: background.BackgroundJob, project: Project
+    ) -> Tuple[List[Sequence], List[Shot]]:
+        job.report_progress(0.0, "Fetching sequences")
+        sequences = project.get_sequences_all()
+        job.check_cancelled()
+
+        job.report_progress(0.5, "Fetching shots")
+        shots = project.get_shots_all()
+        job.report_progress(1.0, "Creating strips")
+        return sequences, shots
+
+    def _pull_edit(
+        self,
+        context: bpy.types.Context,
+        sequences: List[Sequence],
+        all_shots: List[Shot],
+    ) -> Set[str]:
         failed = []
         created = []
         succeeded = []
         existing = []
         channel = context.scene.kitsu.pull_edit_channel
-        active_project = cache.project_active_get()
-        sequences = active_project.get_sequences_all()
-        shot_strips = checksqe.get_shot_strips(context)
-        occupied_ranges = checksqe.get_occupied_ranges(context)
-        all_shots = active_project.get_shots_all()
+        shot_strips = checksqe.get_shot_strips_by_id(context)
+        occupied_ranges = checksqe.OccupiedRanges.from_context(context)
         selection = context.selected_sequences
 
-        logger.info("-START- Pulling Edit")
+        # Group shots by sequence, they are sorted by name already.
+        shots_by_sequence: Dict[str, List[Shot]] = {}
+        for shot in all_shots:
+            shots_by_sequence.setdefault(shot.parent_id, []).append(shot)
 
         # Begin progress update.
         context.window_manager.progress_begin(0, len(all_shots))
@@ -1718,60 +1783,33 @@ class KITSU_OT_sqe_pull_edit(bpy.types.Operator):
         for seq in sequences:
             print("\n" * 2)
             logger.info("Processing Sequence %s", seq.name)
-            shots = seq.get_all_shots()
+            shots = shots_by_sequence.get(seq.id, [])
 
             # Extend context.scene.kitsu.sequence_colors property.
             opsdata.append_sequence_color(context, seq)
 
+            # Find space for the strips of all shots in channel.
+            placement = pull.edit_placement(
+                shots, channel, occupied_ranges, shot_strips
+            )
+
             # Process all shots for sequence.
             for shot in shots:
                 context.window_manager.progress_update(progress_idx)
                 progress_idx += 1
 
-                # Can happen, propably when shot is missing frame information on
-                # kitsu.
-                if not shot.data:
-                    logger.warning(
-                        "Shot %s, is missing 'data' dictionary. Can't determine frame_in and frame_out. Skip.",
-                        shot.name,
-                    )
+                if shot.id not in placement:
                     continue
 
-                # Get frame range information.
-                frame_start = shot.data["frame_in"]
-                frame_end = shot.data["frame_out"]
-
-                # Continue if frame range information is missing.
-                if not frame_start or not frame_end:
+                if not placement[shot.id]:
                     failed.append(shot)
-                    logger.error(
-                        "Failed to create shot %s. Missing frame range information",
-                        shot.name,
-                    )
                     continue
 
-                # Frame info comes in str format from kitsu.
-                frame_start = int(frame_start)
-                frame_end = int(frame_end)
-                shot_range = range(frame_start, frame_end + 1)
+                frame_start, frame_end = placement[shot.id]
 
                 # Try to find existing strip that is already linked to that shot.
-                strip = self._find_shot_strip(shot_strips, shot.id)
-
-                # Check if on the specified channel there is space to put the strip.
-                if str(channel) in occupied_ranges:
-                    if checksqe.is_range_occupied(
-                        shot_range, occupied_ranges[str(channel)]
-                    ):
-                        failed.append(shot)
-                        logger.error(
-                            "Failed to create shot %s. Channel: %i Range: %i - %i is occupied",
-                            shot.name,
-                            channel,
-                            frame_start,
-                            frame_end,
-                        )
-                        continue
+                strip = shot_strips.get(shot.id)
+
                 # TODO Refactor as this reuses code from KITSU_OT_sqe_create_meta_strip
                 if not strip:
                     # Create new strip.
@@ -1795,6 +1833,8 @@ class KITSU_OT_sqe_pull_edit(bpy.types.Operator):
                     logger.info("Shot %s use existing strip: %s", shot.name, strip.name)
                     existing.append(strip)
 
+                shot_strips[shot.id] = strip
+
                 # Set blend alpha.
                 strip.blend_alpha = 0
 
@@ -1831,11 +1871,6 @@ class KITSU_OT_sqe_pull_edit(bpy.types.Operator):
 
         return {"FINISHED"}
 
-    def invoke(self, context: bpy.types.Context, event: bpy.types.Event) -> Set[str]:
-        return context.window_manager.invoke_props_dialog(  # type: ignore
-            self, width=300
-        )
-
     def draw(self, context):
         layout = self.layout
 
@@ -1844,15 +1879,6 @@ class KITSU_OT_sqe_pull_edit(bpy.types.Operator):
         row = layout.row()
         row.prop(context.scene.kitsu, "pull_edit_channel")
 
-    def _find_shot_strip(
-        self, shot_strips: List[bpy.types.Sequence], shot_id: str
-    ) -> Optional[bpy.types.Sequence]:
-        for strip in shot_strips:
-            if strip.kitsu.shot_id == shot_id:
-                return strip
-
-        return None
-
     def _get_random_pastel_color_rgb(self) -> Tuple[float, float, float]:
         """Returns a randomly generated color with high brightness and low saturation"""
 
@@ -1966,7 +1992,7 @@ class KITSU_OT_sqe_create_meta_strip(bpy.types.Operator):
         addon_prefs = prefs.addon_prefs_get(context)
         failed = []
         created = []
-        occupied_ranges = checksqe.get_occupied_ranges(context)
+        occupied_ranges = checksqe.OccupiedRanges.from_context(context)
         logger.info("-START- Creating Meta Strips")
 
         selected_sequences = context.selected_sequences
@@ -1978,19 +2004,16 @@ class KITSU_OT_sqe_create_meta_strip(bpy.types.Operator):
             channel = strip.channel + 1
 
             # Check if one channel above strip there is space to put the meta strip.
-            if str(channel) in occupied_ranges:
-                if checksqe.is_range_occupied(
-                    strip_range, occupied_ranges[str(channel)]
-                ):
-                    failed.append(strip)
-                    logger.error(
-                        "Failed to create metastrip for %s. Channel: %i Range: %i - %i is occupied",
-                        strip.name,
-                        channel,
-                        strip.frame_final_start,
-                        strip.frame_final_end,
-                    )
-                    continue
+            if occupied_ranges.is_occupied(channel, strip_range):
+                failed.append(strip)
+                logger.error(
+                    "Failed to create metastrip for %s. Channel: %i Range: %i - %i is occupied",
+                    strip.name,
+                    channel,
+                    strip.frame_final_start,
+                    strip.frame_final_end,
+                )
+                continue
 
             # Create new meta strip.
             # TODO: frame range of metastrip is 1000 which is problematic because it needs to fit
@@ -2010,6 +2033,11 @@ class KITSU_OT_sqe_create_meta_strip(bpy.types.Operator):
             meta_strip.frame_final_start = strip.frame_final_start
             meta_strip.frame_final_end = strip.frame_final_end
             meta_strip.channel = strip.channel + 1
+            occupied_ranges.add(
+                meta_strip.channel,
+                meta_strip.frame_final_start,
+                meta_strip.frame_final_end,
+            )
 
             # Init start frame offst.
             opsdata.init_start_frame_offset(meta_strip)
@@ -2107,6 +2135,15 @@ class KITSU_OT_sqe_scan_for_media_updates(bpy.types.Operator):
 
         logger.info("-START- Scanning for media updates")
 
+        # Resolve include paths once for all strips.
+        search_paths = [
+            Path(os.path.abspath(bpy.path.abspath(item.filepath))).as_posix()
+            for item in addon_prefs.media_update_search_paths
+        ]
+
+        # Strips to check and their source media.
+        candidates: List[Tuple[bpy.types.Sequence, Path]] = []
+
         for strip in sequences:
             if not strip.type == "MOVIE":
                 continue
@@ -2120,17 +2157,10 @@ class KITSU_OT_sqe_scan_for_media_updates(bpy.types.Operator):
                 continue
 
             media_path_old = Path(os.path.abspath(bpy.path.abspath(strip.filepath)))
-            current_version = util.get_version(media_path_old.name)
 
             # Check if filepath is in include path.
-            included = False
-            for item in addon_prefs.media_update_search_paths:
-                filepath = Path(os.path.abspath(bpy.path.abspath(item.filepath)))
-                if media_path_old.as_posix().startswith(filepath.as_posix()):
-                    included = True
-                    break
-
-            if not included:
+            media_path_str = media_path_old.as_posix()
+            if not any(media_path_str.startswith(p) for p in search_paths):
                 logger.info(
                     "Not included in media update search list: %s", strip.filepath
                 )
@@ -2138,33 +2168,19 @@ class KITSU_OT_sqe_scan_for_media_updates(bpy.types.Operator):
                 continue
 
             # Check if source media path contains version string.
-            if not current_version:
+            if not media.get_version_key(media_path_old.name):
                 no_version.append(strip)
                 continue
 
-            # Gather valid files to compare source media to.
-            media_folder = media_path_old.parent
-            media_all: List[Path] = [
-                f
-                for f in media_folder.iterdir()
-                if f.is_file() and util.get_version(f.name)
-            ]
-            # List of files that are named as source except for version str.
-            valid_files: List[Path] = []
-
-            for file in media_all:
-                # Version should exists here, we already check for that in list comprehension.
-                version = util.get_version(file.name)
-
-                # We only want to consider files that have the same name except for version string.
-                if file.name.replace(version, "") != media_path_old.name.replace(
-                    current_version, ""
-                ):
-                    continue
+            candidates.append((strip, media_path_old))
 
-                valid_files.append(file)
+        # List each media folder once, in parallel.
+        media_index = media.get_media_index()
+        media_index.update(media_path.parent for _, media_path in candidates)
 
-            valid_files.sort(reverse=True)
+        for strip, media_path_old in candidates:
+            # Files that are named as source except for version str, latest first.
+            valid_files = media_index.get_versions(media_path_old)
 
             # No valid files found, should not happen source file should be at least here.
             if not valid_files:
@@ -2180,7 +2196,7 @@ class KITSU_OT_sqe_scan_for_media_updates(bpy.types.Operator):
             logger.info(
                 "%s newer version of source media available: %s > %s",
                 strip.name,
-                current_version,
+                util.get_version(media_path_old.name),
                 util.get_version(valid_files[0].name),
             )
 
@@ -2279,33 +2295,13 @@ class KITSU_OT_sqe_change_strip_source(bpy.types.Operator):
             )
             return {"CANCELLED"}
 
-        # Gather valid files to compare source media to.
-        media_folder = media_path_old.parent
-        media_all: List[Path] = [
-            f
-            for f in media_folder.iterdir()
-            if f.is_file() and util.get_version(f.name)
-        ]
-        # List of files that are named as source except for version str.
-        valid_files: List[Path] = []
-
-        for file in media_all:
-            # Version should exists here, we already check for that in list comprehension.
-            version = util.get_version(file.name)
-
-            # We only want to consider files that have the same name except for version string.
-            if file.name.replace(version, "") != media_path_old.name.replace(
-                current_version, ""
-            ):
-                continue
-
-            valid_files.append(file)
-
-        valid_files.sort(reverse=True)
+        # Files that are named as source except for version str, latest first.
+        valid_files = media.get_media_index().get_versions(media_path_old)
 
         # No valid files found, should not happen source file should be at least here.
-        if not valid_files:
+        if media_path_old not in valid_files:
             self.report({"WARNING"}, f"{strip.name} no other files available")
+            return {"CANCELLED"}
 
         current_idx = valid_files.index(media_path_old)
 
@@ -2531,7 +2527,15 @@ class KITSU_OT_vse_publish_edit_revision(bpy.types.Operator):
         new_comment = gazu.task.add_comment(
             task_entity, task_entity["task_status"], self.comment
         )
-        new_preview = gazu.task.add_preview(task_entity, new_comment, render_path)
+        with util.transfer_progress(
+            context, f"Uploading {render_name}"
+        ) as progress_callback:
+            new_preview = gazu.task.add_preview(
+                task_entity,
+                new_comment,
+                render_path.as_posix(),
+                progress_callback=progress_callback,
+            )
 
         # Update edit_entry's frame_start if 'frame_start' is found on server
         if self.use_frame_start:
@@ -23,7 +23,9 @@ from pathlib import Path
 from typing import Any, Dict, List, Tuple, Union, Optional
 
 import bpy
+from bpy.app.handlers import persistent
 
+from blender_kitsu import cache
 from blender_kitsu.logger import LoggerFactory
 from blender_kitsu.types import Sequence, Task, TaskStatus, Shot, TaskType
 
@@ -33,6 +35,8 @@ _sqe_shot_enum_list: List[Tuple[str, str, str]] = []
 _sqe_not_linked: List[Tuple[str, str, str]] = []
 _sqe_duplicates: List[Tuple[str, str, str]] = []
 _sqe_multi_project: List[Tuple[str, str, str]] = []
+# Scene and selection the diagnostics lists above were built for.
+_sqe_diagnostics_key: Optional[Tuple[Any, ...]] = None
 
 
 def sqe_get_not_linked(self, context):
@@ -47,88 +51,100 @@ def sqe_get_multi_project(self, context):
     return _sqe_multi_project
 
 
-def sqe_update_not_linked(context: bpy.types.Context) -> List[Tuple[str, str, str]]:
-    """get all strips that are initialized but not linked yet"""
-    enum_list = []
-
+def _get_diagnostics_strips(context: bpy.types.Context) -> List[bpy.types.Sequence]:
     if context.selected_sequences:
-        strips = context.selected_sequences
-    else:
-        strips = context.scene.sequence_editor.sequences_all
+        return context.selected_sequences
+    return context.scene.sequence_editor.sequences_all
 
-    for strip in strips:
-        if strip.kitsu.initialized and not strip.kitsu.linked:
-            enum_list.append((strip.name, strip.name, ""))
 
-    return enum_list
-
-
-def sqe_update_duplicates(context: bpy.types.Context) -> List[Tuple[str, str, str]]:
-    """get all strips that are initialized but not linked yet"""
-    enum_list = []
-    data_dict = {}
-    if context.selected_sequences:
-        strips = context.selected_sequences
-    else:
-        strips = context.scene.sequence_editor.sequences_all
+def _get_diagnostics_key(context: bpy.types.Context) -> Tuple[Any, ...]:
+    return (
+        context.scene.as_pointer(),
+        tuple(strip.name for strip in context.selected_sequences or []),
+    )
 
-    # Create data dict that holds all shots ids and the corresponding strips that are linked to it.
-    for i in range(len(strips)):
 
-        if strips[i].kitsu.linked:
-            # Get shot_id, shot_name, create entry in data_dict if id not existent.
-            shot_id = strips[i].kitsu.shot_id
-            shot_name = strips[i].kitsu.shot_name
-            if shot_id not in data_dict:
-                data_dict[shot_id] = {"name": shot_name, "strips": []}
+def sqe_update_diagnostics(context: bpy.types.Context) -> None:
+    """
+    Groups strips by shot id, project name and link state in a single pass and
+    stores the enum lists of the debug operators. The result is reused until the
+    scene or the selection changes.
+    """
+    global _sqe_diagnostics_key
+
+    key = _get_diagnostics_key(context)
+    if key == _sqe_diagnostics_key:
+        return
+
+    not_linked: List[Tuple[str, str, str]] = []
+    strips_by_shot: Dict[str, List[bpy.types.Sequence]] = {}
+    shot_names: Dict[str, str] = {}
+    strips_by_project: Dict[str, List[bpy.types.Sequence]] = {}
+
+    for strip in _get_diagnostics_strips(context):
+        if not strip.kitsu.linked:
+            if strip.kitsu.initialized:
+                not_linked.append((strip.name, strip.name, ""))
+            continue
+
+        shot_id = strip.kitsu.shot_id
+        shot_names.setdefault(shot_id, strip.kitsu.shot_name)
+        strips_by_shot.setdefault(shot_id, []).append(strip)
+        strips_by_project.setdefault(strip.kitsu.project_name, []).append(strip)
+
+    # Convert in data structure for enum property.
+    duplicates: List[Tuple[str, str, str]] = []
+    for shot_id, strips in strips_by_shot.items():
+        if len(strips) > 1:
+            duplicates.append(("", shot_names[shot_id], shot_id))
+            duplicates.extend((strip.name, strip.name, "") for strip in strips)
+
+    multi_project: List[Tuple[str, str, str]] = []
+    for project, strips in strips_by_project.items():
+        multi_project.append(("", project, ""))
+        multi_project.extend((strip.name, strip.name, "") for strip in strips)
+
+    _sqe_not_linked[:] = not_linked
+    _sqe_duplicates[:] = duplicates
+    _sqe_multi_project[:] = multi_project
+    _sqe_diagnostics_key = key
 
-            # Append i to strips list.
-            if strips[i] not in set(data_dict[shot_id]["strips"]):
-                data_dict[shot_id]["strips"].append(strips[i])
 
-            # Comparet to all other strip.
-            for j in range(i + 1, len(strips)):
-                if shot_id == strips[j].kitsu.shot_id:
-                    data_dict[shot_id]["strips"].append(strips[j])
+def sqe_update_not_linked(context: bpy.types.Context) -> List[Tuple[str, str, str]]:
+    """get all strips that are initialized but not linked yet"""
+    sqe_update_diagnostics(context)
+    return list(_sqe_not_linked)
 
-    # Convert in data strucutre for enum property.
-    for shot_id, data in data_dict.items():
-        if len(data["strips"]) > 1:
-            enum_list.append(("", data["name"], shot_id))
-            for strip in data["strips"]:
-                enum_list.append((strip.name, strip.name, ""))
 
-    return enum_list
+def sqe_update_duplicates(context: bpy.types.Context) -> List[Tuple[str, str, str]]:
+    """get all strips that are linked to the same shot id, grouped by shot"""
+    sqe_update_diagnostics(context)
+    return list(_sqe_duplicates)
 
 
 def sqe_update_multi_project(context: bpy.types.Context) -> List[Tuple[str, str, str]]:
-    """get all strips that are initialized but not linked yet"""
-    enum_list: List[Tuple[str, str, str]] = []
-    data_dict: Dict[str, Any] = {}
+    """get all linked strips grouped by project name"""
+    sqe_update_diagnostics(context)
+    return list(_sqe_multi_project)
 
-    if context.selected_sequences:
-        strips = context.selected_sequences
-    else:
-        strips = context.scene.sequence_editor.sequences_all
 
-    # Create data dict that holds project names as key and values the corresponding sequence strips.
-    for strip in strips:
-        if strip.kitsu.linked:
-            project = strip.kitsu.project_name
-            if project not in data_dict:
-                data_dict[project] = []
+def sqe_diagnostics_reset() -> None:
+    global _sqe_diagnostics_key
+    _sqe_diagnostics_key = None
+
 
-            # Append i to strips list.
-            if strip not in set(data_dict[project]):
-                data_dict[project].append(strip)
+@persistent
+def depsgraph_update_post_handler_reset_diagnostics(
+    scene: bpy.types.Scene, depsgraph: bpy.types.Depsgraph
+) -> None:
+    # Strip changes are reported as scene updates.
+    if _sqe_diagnostics_key is not None and depsgraph.id_type_updated("SCENE"):
+        sqe_diagnostics_reset()
 
-    # Convert in data strucutre for enum property.
-    for project, strips in data_dict.items():
-        enum_list.append(("", project, ""))
-        for strip in strips:
-            enum_list.append((strip.name, strip.name, ""))
 
-    return enum_list
+@persistent
+def load_post_handler_reset_diagnostics(dummy: Any) -> None:
+    sqe_diagnostics_reset()
 
 
 def resolve_pattern(pattern: str, var_lookup_table: Dict[str, str]) -> str:
@@ -160,12 +176,15 @@ def get_shots_enum_for_link_shot_op(
     if not self.sequence_enum:
         return []
 
-    zseq_active = Sequence.by_id(self.sequence_enum)
+    index = cache.project_index_get()
+    zseq_active = index.get_sequence(self.sequence_enum) if index else None
+    if zseq_active:
+        shots = index.get_shots_for_sequence(zseq_active)
+    else:
+        shots = Sequence.by_id(self.sequence_enum).get_all_shots()
 
     _sqe_shot_enum_list.clear()
-    _sqe_shot_enum_list.extend(
-        [(s.id, s.name, s.description or "") for s in zseq_active.get_all_shots()]
-    )
+    _sqe_shot_enum_list.extend([(s.id, s.name, s.description or "") for s in shots])
     return _sqe_shot_enum_list
 
 
@@ -247,3 +266,20 @@ def push_sequence_color(context: bpy.types.Context, sequence: Sequence) -> None:
     else:
         sequence.update_data({"color": list(item.color)})
         logger.info("%s pushed sequence color", sequence.name)
+
+
+# ---------REGISTER ----------.
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(
+        depsgraph_update_post_handler_reset_diagnostics
+    )
+    bpy.app.handlers.load_post.append(load_post_handler_reset_diagnostics)
+
+
+def unregister():
+    bpy.app.handlers.load_post.remove(load_post_handler_reset_diagnostics)
+    bpy.app.handlers.depsgraph_update_post.remove(
+        depsgraph_update_post_handler_reset_diagnostics
+    )
@@ -18,9 +18,12 @@
 #
 # (c) 2021, Blender Foundation - Paul Golter
 
+from typing import Dict, List, Optional, Tuple
+
 import bpy
 
 from blender_kitsu import bkglobals
+from blender_kitsu.sqe import checksqe
 from blender_kitsu.types import Cache, Sequence, Project, Shot
 from blender_kitsu.logger import LoggerFactory
 
@@ -57,3 +60,71 @@ def shot_meta(strip: bpy.types.Sequence, shot: Shot, clear_cache: bool = True) -
 
     # Log.
     logger.info("Pulled meta from shot: %s to strip: %s", shot.name, strip.name)
+
+
+def edit_placement(
+    shots: List[Shot],
+    channel: int,
+    occupied_ranges: checksqe.OccupiedRanges,
+    shot_strips: Dict[str, bpy.types.Sequence],
+) -> Dict[str, Optional[Tuple[int, int]]]:
+    """
+    Returns the frame start and end at which Pull Edit places the strip of each
+    shot in channel, by shot id. It is None if the shot is missing frame range
+    information or the range is occupied. Shots without data are left out.
+    Shots that are already linked to a strip in shot_strips keep the frame range
+    of that strip. occupied_ranges is updated with the placed strips.
+    """
+    placement: Dict[str, Optional[Tuple[int, int]]] = {}
+
+    for shot in shots:
+        # Can happen, propably when shot is missing frame information on
+        # kitsu.
+        if not shot.data:
+            logger.warning(
+                "Shot %s, is missing 'data' dictionary. Can't determine frame_in and frame_out. Skip.",
+                shot.name,
+            )
+            continue
+
+        # Get frame range information.
+        frame_start = shot.data.get("frame_in")
+        frame_end = shot.data.get("frame_out")
+
+        # Continue if frame range information is missing.
+        if not frame_start or not frame_end:
+            placement[shot.id] = None
+            logger.error(
+                "Failed to create shot %s. Missing frame range information",
+                shot.name,
+            )
+            continue
+
+        # Frame info comes in str format from kitsu.
+        frame_start = int(frame_start)
+        frame_end = int(frame_end)
+
+        # Check if on the specified channel there is space to put the strip.
+        if occupied_ranges.is_occupied(channel, range(frame_start, frame_end + 1)):
+            placement[shot.id] = None
+            logger.error(
+                "Failed to create shot %s. Channel: %i Range: %i - %i is occupied",
+                shot.name,
+                channel,
+                frame_start,
+                frame_end,
+            )
+            continue
+
+        placement[shot.id] = (frame_start, frame_end)
+
+        # Keep indices up to date for the following shots.
+        strip = shot_strips.get(shot.id)
+        if strip:
+            occupied_ranges.add(
+                channel, strip.frame_final_start, strip.frame_final_end
+            )
+        else:
+            occupied_ranges.add(channel, frame_start, frame_end)
+
+    return placement
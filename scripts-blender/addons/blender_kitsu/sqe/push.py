@@ -22,7 +22,7 @@ from typing import Tuple
 
 import bpy
 
-from blender_kitsu import bkglobals
+from blender_kitsu import bkglobals, cache
 from blender_kitsu.types import Sequence, Project, Shot
 from blender_kitsu.logger import LoggerFactory
 
@@ -36,7 +36,7 @@ def shot_meta(strip: bpy.types.Sequence, shot: Shot) -> None:
     try:
         kitsu_3d_start = shot.data["3d_start"]
     except:
-        kitsu_3d_start = 101  # TODO REPLACE WITH BAKED GLOBAL VALUE
+        kitsu_3d_start = bkglobals.FRAME_START
 
     shot.name = strip.kitsu.shot_name
     shot.description = strip.kitsu.shot_description
@@ -82,6 +82,11 @@ def new_shot(
 
     # Set project name locally, will be available on next pull.
     shot.project_name = project.name
+
+    # Keep project index up to date so the new shot can be looked up by name.
+    index = cache.project_index_get()
+    if index and index.project.id == project.id:
+        index.add_shot(shot)
     logger.info("Pushed create shot: %s for project: %s", shot.name, project.name)
     return shot
 
@@ -90,6 +95,9 @@ def new_sequence(strip: bpy.types.Sequence, project: Project) -> Sequence:
     sequence = project.create_sequence(
         strip.kitsu.sequence_name,
     )
+    index = cache.project_index_get()
+    if index and index.project.id == project.id:
+        index.add_sequence(sequence)
     logger.info(
         "Pushed create sequence: %s for project: %s", sequence.name, project.name
     )
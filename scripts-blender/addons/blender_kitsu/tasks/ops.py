@@ -23,7 +23,7 @@ from blender_kitsu import tasks
 
 import bpy
 
-from blender_kitsu import cache, prefs, gazu, util
+from blender_kitsu import cache, prefs, gazu
 
 from blender_kitsu.tasks import opsdata
 from blender_kitsu.logger import LoggerFactory
@@ -45,19 +45,12 @@ class KITSU_OT_tasks_user_laod(bpy.types.Operator):
         return prefs.session_auth(context)
 
     def execute(self, context: bpy.types.Context) -> Set[str]:
-        addon_prefs = prefs.addon_prefs_get(context)
-        tasks_coll_prop = addon_prefs.tasks
         active_user = cache.user_active_get()
 
-        # load tasks this also updates the collection property
-        cache.load_user_all_tasks(context)
+        # Load tasks in background, this also updates the collection property.
+        cache.load_user_all_tasks_background()
 
-        util.ui_redraw()
-
-        self.report(
-            {"INFO"},
-            f"Fetched {len(tasks_coll_prop.items())} tasks for {active_user.full_name}",
-        )
+        self.report({"INFO"}, f"Fetching tasks for {active_user.full_name}")
         return {"FINISHED"}
 
 
@@ -20,8 +20,22 @@
 from __future__ import annotations
 
 import inspect
+import logging
+import time
+from copy import deepcopy
 from dataclasses import asdict, dataclass, field
-from typing import Any, Dict, List, Optional, Union, Tuple, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Set,
+    Union,
+    Tuple,
+    TypeVar,
+)
 
 from blender_kitsu import gazu
 from blender_kitsu.logger import LoggerFactory
@@ -161,6 +175,19 @@ class BaseDataClass:
     Base class that gives us some useful methods we need on all other dataclasses.
     """
 
+    # Maps each class to the names of its init parameters. Filled on first use,
+    # as inspecting the signature is costly compared to converting a dict.
+    _field_names_cache: Dict[type, FrozenSet[str]] = {}
+
+    @classmethod
+    def _get_field_names(cls) -> FrozenSet[str]:
+        try:
+            return BaseDataClass._field_names_cache[cls]
+        except KeyError:
+            field_names = frozenset(inspect.signature(cls).parameters)
+            BaseDataClass._field_names_cache[cls] = field_names
+            return field_names
+
     @classmethod
     def from_dict(cls: type[D], env: Dict[str, Any]) -> D:
         """
@@ -172,18 +199,16 @@ class BaseDataClass:
         # API is subject to change. With this we can avoid a Situation in which we
         # constantly have to synchronize the DataClass Parameters with the current state
         # of the Kitsu API.
-        valid_key_values = {}
+        field_names = cls._get_field_names()
+        valid_key_values = {k: v for k, v in env.items() if k in field_names}
 
         # At least keep track of unexpected arguments and log them.
-        unexpected_args: List[str] = []
-        for k, v in env.items():
-            if k not in inspect.signature(cls).parameters:
-                unexpected_args.append(f"{k}:{type(v).__name__}={str(v)}")
-                continue
-            valid_key_values[k] = v
-
-        # Log unexpected args.
-        if unexpected_args:
+        if len(valid_key_values) != len(env) and logger.isEnabledFor(logging.DEBUG):
+            unexpected_args = [
+                f"{k}:{type(v).__name__}={str(v)}"
+                for k, v in env.items()
+                if k not in field_names
+            ]
             logger.debug(
                 "%s received unexpected arguments: %s",
                 cls.__name__,
@@ -193,6 +218,31 @@ class BaseDataClass:
         # Return final class with fitting parameters.
         return cls(**valid_key_values)
 
+    @classmethod
+    def from_dicts(cls: type[D], envs: List[Dict[str, Any]]) -> List[D]:
+        """
+        Initializes a list of DataClasses from a list of dictionaries, like a
+        whole API response. Unexpected arguments are logged once per call.
+        """
+        field_names = cls._get_field_names()
+        unexpected_keys: Set[str] = set()
+        entities = []
+
+        for env in envs:
+            valid_key_values = {k: v for k, v in env.items() if k in field_names}
+            if len(valid_key_values) != len(env):
+                unexpected_keys.update(env.keys() - field_names)
+            entities.append(cls(**valid_key_values))
+
+        if unexpected_keys and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "%s received unexpected arguments: %s",
+                cls.__name__,
+                ", ".join(sorted(unexpected_keys)),
+            )
+
+        return entities
+
 
 class Entity(BaseDataClass):
     """
@@ -303,10 +353,9 @@ class Project(Entity):
         return Sequence.by_name(self, seq_name, episode=episode)
 
     def get_sequences_all(self) -> List[Sequence]:
-        sequences = [
-            Sequence.from_dict(s)
-            for s in gazu.shot.all_sequences_for_project(asdict(self))
-        ]
+        sequences = Sequence.from_dicts(
+            gazu.shot.all_sequences_for_project(asdict(self))
+        )
         return sorted(sequences, key=lambda x: x.name)
 
     def create_sequence(self, sequence_name: str) -> Sequence:
@@ -321,9 +370,7 @@ class Project(Entity):
         return Shot.by_id(shot_id)
 
     def get_shots_all(self) -> List[Shot]:
-        shots = [
-            Shot.from_dict(s) for s in gazu.shot.all_shots_for_project(asdict(self))
-        ]
+        shots = Shot.from_dicts(gazu.shot.all_shots_for_project(asdict(self)))
         return sorted(shots, key=lambda x: x.name)
 
     def get_shot_by_name(self, sequence: Sequence, name: str) -> Optional[Shot]:
@@ -357,10 +404,9 @@ class Project(Entity):
     # ---------------
 
     def get_all_asset_types(self) -> List[AssetType]:
-        assettypes = [
-            AssetType.from_dict(at)
-            for at in gazu.asset.all_asset_types_for_project(asdict(self))
-        ]
+        assettypes = AssetType.from_dicts(
+            gazu.asset.all_asset_types_for_project(asdict(self))
+        )
         return sorted(assettypes, key=lambda x: x.name)
 
     def get_asset_type_by_name(self, asset_type_name: str) -> Optional[AssetType]:
@@ -370,21 +416,16 @@ class Project(Entity):
     # ---------------
 
     def get_all_assets(self) -> List[Asset]:
-        assets = [
-            Asset.from_dict(a) for a in gazu.asset.all_assets_for_project(asdict(self))
-        ]
+        assets = Asset.from_dicts(gazu.asset.all_assets_for_project(asdict(self)))
         return sorted(assets, key=lambda x: x.name)
 
     def get_asset_by_name(self, asset_name: str) -> Optional[Asset]:
         return Asset.by_name(self, asset_name)
 
     def get_all_assets_for_type(self, assettype: AssetType) -> List[Asset]:
-        assets = [
-            Asset.from_dict(a)
-            for a in gazu.asset.all_assets_for_project_and_type(
-                asdict(self), asdict(assettype)
-            )
-        ]
+        assets = Asset.from_dicts(
+            gazu.asset.all_assets_for_project_and_type(asdict(self), asdict(assettype))
+        )
         return sorted(assets, key=lambda x: x.name)
 
     # TASKS
@@ -440,22 +481,14 @@ class Sequence(Entity):
         return cls.from_dict(seq_dict)
 
     def get_all_shots(self) -> List[Shot]:
-        shots = [
-            Shot.from_dict(shot)
-            for shot in gazu.shot.all_shots_for_sequence(asdict(self))
-        ]
+        shots = Shot.from_dicts(gazu.shot.all_shots_for_sequence(asdict(self)))
         return sorted(shots, key=lambda x: x.name)
 
     def get_all_task_types(self) -> List[TaskType]:
-        return [
-            TaskType.from_dict(t)
-            for t in gazu.task.all_task_types_for_sequence(asdict(self))
-        ]
+        return TaskType.from_dicts(gazu.task.all_task_types_for_sequence(asdict(self)))
 
     def get_all_tasks(self) -> List[Task]:
-        return [
-            Task.from_dict(t) for t in gazu.task.all_tasks_for_sequence(asdict(self))
-        ]
+        return Task.from_dicts(gazu.task.all_tasks_for_sequence(asdict(self)))
 
     def update(self) -> Sequence:
         gazu.shot.update_sequence(asdict(self))
@@ -550,13 +583,10 @@ class Shot(Entity):
         return cls.from_dict(shot_dict)
 
     def get_all_task_types(self) -> List[TaskType]:
-        return [
-            TaskType.from_dict(t)
-            for t in gazu.task.all_task_types_for_shot(asdict(self))
-        ]
+        return TaskType.from_dicts(gazu.task.all_task_types_for_shot(asdict(self)))
 
     def get_all_tasks(self) -> List[Task]:
-        return [Task.from_dict(t) for t in gazu.task.all_tasks_for_shot(asdict(self))]
+        return Task.from_dicts(gazu.task.all_tasks_for_shot(asdict(self)))
 
     def get_sequence(self) -> Sequence:
         return Sequence.from_dict(gazu.shot.get_sequence_from_shot(asdict(self)))
@@ -638,13 +668,10 @@ class Asset(Entity):
         return cls.from_dict(asset_dict)
 
     def get_all_task_types(self) -> List[TaskType]:
-        return [
-            TaskType.from_dict(t)
-            for t in gazu.task.all_task_types_for_asset(asdict(self))
-        ]
+        return TaskType.from_dicts(gazu.task.all_task_types_for_asset(asdict(self)))
 
     def get_all_tasks(self) -> List[Task]:
-        return [Task.from_dict(t) for t in gazu.task.all_tasks_for_asset(asdict(self))]
+        return Task.from_dicts(gazu.task.all_tasks_for_asset(asdict(self)))
 
     def __bool__(self) -> bool:
         return bool(self.id)
@@ -689,16 +716,19 @@ class TaskType(Entity):
 
     @classmethod
     def all_task_types(cls) -> List[TaskType]:
-        return [cls.from_dict(t) for t in gazu.task.all_task_types()]
+        return cls.from_dicts(gazu.task.all_task_types())
 
     @classmethod
     def all_shot_task_types(cls) -> List[TaskType]:
-        return [cls.from_dict(t) for t in gazu.task.all_task_types() if t["for_entity"] == "Shot"]
+        return cls.from_dicts(
+            [t for t in gazu.task.all_task_types() if t["for_entity"] == "Shot"]
+        )
 
     @classmethod
     def all_asset_task_types(cls) -> List[TaskType]:
-        return [
-            cls.from_dict(t) for t in gazu.task.all_task_types() if t["for_entity"] == "Asset"]
+        return cls.from_dicts(
+            [t for t in gazu.task.all_task_types() if t["for_entity"] == "Asset"]
+        )
 
     def __bool__(self) -> bool:
         return bool(self.id)
@@ -827,7 +857,7 @@ class Task(Entity):
         task_list = gazu.task.all_tasks_for_entity_and_task_type(
             asdict(entity), asdict(task_type)
         )
-        return [cls.from_dict(t) for t in task_list]
+        return cls.from_dicts(task_list)
 
     @classmethod
     def all_tasks_for_task_type(
@@ -836,16 +866,14 @@ class Task(Entity):
         task_list = gazu.task.all_tasks_for_task_type(
             asdict(project), asdict(task_type)
         )
-        return [cls.from_dict(t) for t in task_list]
+        return cls.from_dicts(task_list)
 
     def get_last_comment(self) -> Comment:
         comment_dict = gazu.task.get_last_comment_for_task(asdict(self))
         return Comment.from_dict(comment_dict)
 
     def get_all_comments(self) -> List[Comment]:
-        return [
-            Comment.from_dict(c) for c in gazu.task.all_comments_for_task(asdict(self))
-        ]
+        return Comment.from_dicts(gazu.task.all_comments_for_task(asdict(self)))
 
     def add_comment(
         self,
@@ -874,10 +902,17 @@ class Task(Entity):
         return comment_obj
 
     def add_preview_to_comment(
-        self, comment: Comment, preview_file_path: str, frame_number=0
+        self,
+        comment: Comment,
+        preview_file_path: str,
+        frame_number=0,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
     ) -> Preview:
         preview_dict = gazu.task.add_preview(
-            asdict(self), asdict(comment), preview_file_path
+            asdict(self),
+            asdict(comment),
+            preview_file_path,
+            progress_callback=progress_callback,
         )
         gazu.task.set_main_preview(preview_dict["id"], frame_number)
         return Preview.from_dict(preview_dict)
@@ -934,7 +969,7 @@ class TaskStatus(Entity):
 
     @classmethod
     def all_task_statuses(cls) -> List[TaskStatus]:
-        return [cls.from_dict(ts) for ts in gazu.task.all_task_statuses()]
+        return cls.from_dicts(gazu.task.all_task_statuses())
 
     def __bool__(self) -> bool:
         return bool(self.id)
@@ -1048,75 +1083,65 @@ class User(BaseDataClass):
             self.__dict__.update(user_dict)
 
     def all_open_projects(self) -> List[Project]:
-        project_list = [
-            Project.from_dict(project_dict)
-            for project_dict in gazu.user.all_open_projects()
-        ]
+        project_list = Project.from_dicts(gazu.user.all_open_projects())
         return project_list
 
     def all_tasks_to_do(self) -> List[Task]:
-        task_list = [
-            Task.from_dict(task_dict) for task_dict in gazu.user.all_tasks_to_do()
-        ]
+        task_list = Task.from_dicts(gazu.user.all_tasks_to_do())
         return task_list
 
+    def all_tasks_to_do_if_changed(
+        self, validators: Optional[Dict[str, Optional[str]]] = None
+    ) -> Tuple[Optional[List[Task]], Dict[str, Optional[str]]]:
+        """
+        Returns tasks to do or None if they didn't change since the request that
+        returned validators, and the validators for the next request.
+        """
+        task_dicts, validators = gazu.user.all_tasks_to_do_if_changed(validators)
+        if task_dicts is None:
+            return None, validators
+        return Task.from_dicts(task_dicts), validators
+
     # SHOTS.
 
     def all_sequences_for_project(self, project: Project) -> List[Sequence]:
-        seq_list = [
-            Sequence.from_dict(seq_dict)
-            for seq_dict in gazu.user.all_sequences_for_project(asdict(project))
-        ]
+        seq_list = Sequence.from_dicts(
+            gazu.user.all_sequences_for_project(asdict(project))
+        )
         return seq_list
 
     def all_shots_for_sequence(self, sequence: Sequence) -> List[Shot]:
-        shot_list = [
-            Shot.from_dict(shot_dict)
-            for shot_dict in gazu.user.all_shots_for_sequence(asdict(sequence))
-        ]
+        shot_list = Shot.from_dicts(gazu.user.all_shots_for_sequence(asdict(sequence)))
         return shot_list
 
     def all_tasks_for_shot(self, shot: Shot) -> List[Task]:
-        task_list = [
-            Task.from_dict(task_dict)
-            for task_dict in gazu.user.all_tasks_for_shot(asdict(shot))
-        ]
+        task_list = Task.from_dicts(gazu.user.all_tasks_for_shot(asdict(shot)))
         return task_list
 
     def all_tasks_for_sequence(self, sequence: Sequence) -> List[Task]:
-        task_list = [
-            Task.from_dict(task_dict)
-            for task_dict in gazu.user.all_tasks_for_sequence(asdict(sequence))
-        ]
+        task_list = Task.from_dicts(gazu.user.all_tasks_for_sequence(asdict(sequence)))
         return task_list
 
     # ASSETS.
 
     def all_asset_types_for_project(self, project: Project) -> List[AssetType]:
-        asset_type_list = [
-            AssetType.from_dict(asset_type_dict)
-            for asset_type_dict in gazu.user.all_asset_types_for_project(
-                asdict(project)
-            )
-        ]
+        asset_type_list = AssetType.from_dicts(
+            gazu.user.all_asset_types_for_project(asdict(project))
+        )
         return asset_type_list
 
     def all_assets_for_asset_type_and_project(
         self, project: Project, asset_type: AssetType
     ) -> List[Asset]:
-        asset_list = [
-            Asset.from_dict(asset_dict)
-            for asset_dict in gazu.user.all_assets_for_asset_type_and_project(
+        asset_list = Asset.from_dicts(
+            gazu.user.all_assets_for_asset_type_and_project(
                 asdict(project), asdict(asset_type)
             )
-        ]
+        )
         return asset_list
 
     def all_tasks_for_asset(self, asset: Asset) -> List[Task]:
-        task_list = [
-            Task.from_dict(task_dict)
-            for task_dict in gazu.user.all_tasks_for_asset(asdict(asset))
-        ]
+        task_list = Task.from_dicts(gazu.user.all_tasks_for_asset(asdict(asset)))
         return task_list
 
     def __bool__(self) -> bool:
@@ -1160,8 +1185,275 @@ class Person(Entity):
         return bool(self.id)
 
 
+class ProjectIndex:
+    """
+    In-memory snapshot of the entities of a project. Sequences, shots, assets,
+    asset types, task types and task statuses are fetched with one request
+    each and indexed by id and by (parent id, name), so enum lists and name
+    lookups don't need further server requests.
+    """
+
+    def __init__(self, project: Project, load: bool = True):
+        self.project = project
+        self.loaded_at = 0.0
+        self._clear()
+        if load:
+            self.load()
+
+    def _clear(self) -> None:
+        self._sequences: Dict[str, Sequence] = {}
+        self._shots: Dict[str, Shot] = {}
+        self._assets: Dict[str, Asset] = {}
+        self._asset_types: Dict[str, AssetType] = {}
+        self._task_types: Dict[str, TaskType] = {}
+        self._task_statuses: Dict[str, TaskStatus] = {}
+        self._sequences_by_name: Dict[Tuple[str, str], Sequence] = {}
+        self._shots_by_name: Dict[Tuple[str, str], Shot] = {}
+        self._shots_by_sequence: Dict[str, List[Shot]] = {}
+        self._assets_by_name: Dict[Tuple[str, str], Asset] = {}
+        self._assets_by_type: Dict[str, List[Asset]] = {}
+
+    def load(self) -> None:
+        self._clear()
+        project_dict = asdict(self.project)
+
+        for sequence in Sequence.from_dicts(
+            gazu.shot.all_sequences_for_project(project_dict)
+        ):
+            self.add_sequence(sequence)
+        for shot in Shot.from_dicts(gazu.shot.all_shots_for_project(project_dict)):
+            self.add_shot(shot)
+        for asset_type in AssetType.from_dicts(
+            gazu.asset.all_asset_types_for_project(project_dict)
+        ):
+            self._asset_types[asset_type.id] = asset_type
+        for asset in Asset.from_dicts(gazu.asset.all_assets_for_project(project_dict)):
+            self.add_asset(asset)
+        for task_type in TaskType.from_dicts(gazu.task.all_task_types()):
+            self._task_types[task_type.id] = task_type
+        for task_status in TaskStatus.from_dicts(gazu.task.all_task_statuses()):
+            self._task_statuses[task_status.id] = task_status
+
+        self.loaded_at = time.time()
+        logger.debug(
+            "Loaded index of project %s: %i sequences, %i shots, %i assets",
+            self.project.name,
+            len(self._sequences),
+            len(self._shots),
+            len(self._assets),
+        )
+
+    def is_expired(self, expire: float) -> bool:
+        return expire > 0 and self.loaded_at + expire < time.time()
+
+    # Updates, used to keep the index in sync with entities created or
+    # modified by the addon without reloading it.
+
+    def add_sequence(self, sequence: Sequence) -> None:
+        self.remove_sequence(sequence.id)
+        self._sequences[sequence.id] = sequence
+        self._sequences_by_name[(sequence.parent_id or "", sequence.name)] = sequence
+
+    def remove_sequence(self, sequence_id: str) -> None:
+        sequence = self._sequences.pop(sequence_id, None)
+        if not sequence:
+            return
+        key = (sequence.parent_id or "", sequence.name)
+        if self._sequences_by_name.get(key) is sequence:
+            del self._sequences_by_name[key]
+
+    def add_shot(self, shot: Shot) -> None:
+        self.remove_shot(shot.id)
+        self._shots[shot.id] = shot
+        self._shots_by_name[(shot.parent_id, shot.name)] = shot
+        self._shots_by_sequence.setdefault(shot.parent_id, []).append(shot)
+
+    def remove_shot(self, shot_id: str) -> None:
+        shot = self._shots.pop(shot_id, None)
+        if not shot:
+            return
+        key = (shot.parent_id, shot.name)
+        if self._shots_by_name.get(key) is shot:
+            del self._shots_by_name[key]
+        self._shots_by_sequence[shot.parent_id].remove(shot)
+
+    def add_asset(self, asset: Asset) -> None:
+        self.remove_asset(asset.id)
+        self._assets[asset.id] = asset
+        self._assets_by_name[(asset.entity_type_id, asset.name)] = asset
+        self._assets_by_type.setdefault(asset.entity_type_id, []).append(asset)
+
+    def remove_asset(self, asset_id: str) -> None:
+        asset = self._assets.pop(asset_id, None)
+        if not asset:
+            return
+        key = (asset.entity_type_id, asset.name)
+        if self._assets_by_name.get(key) is asset:
+            del self._assets_by_name[key]
+        self._assets_by_type[asset.entity_type_id].remove(asset)
+
+    @staticmethod
+    def fetch_event_updates(
+        project_id: str, events: List[Dict[str, Any]]
+    ) -> Optional[List[Tuple[str, str, Any]]]:
+        """
+        Fetches the sequences, shots and assets of given project that were
+        changed by Kitsu events. Only makes requests, so it can run on a worker
+        thread. Expects the server cache to be invalidated for these events
+        already.
+        Returns (model, entity id, entity) tuples for apply_updates, the entity
+        is None if it was deleted. Returns None if an event can't be applied
+        and the index needs to be reloaded.
+        """
+        entity_types = {"sequence": Sequence, "shot": Shot, "asset": Asset}
+        changed: Dict[Tuple[str, str], bool] = {}
+        for event in events:
+            model, _, action = event.get("name", "").partition(":")
+            data = event.get("data") or {}
+            event_project_id = event.get("project_id") or data.get("project_id")
+            if event_project_id and event_project_id != project_id:
+                continue
+
+            if model in ("asset-type", "task-type", "task-status"):
+                return None
+            if model not in entity_types:
+                continue
+
+            entity_id = data.get(f"{model}_id")
+            if entity_id:
+                # Several events of one entity only need one request.
+                changed[(model, entity_id)] = action == "delete"
+
+        updates: List[Tuple[str, str, Any]] = []
+        for (model, entity_id), deleted in changed.items():
+            entity = None
+            if not deleted:
+                try:
+                    entity = entity_types[model].by_id(entity_id)
+                except gazu.exception.RouteNotFoundException:
+                    pass
+            updates.append((model, entity_id, entity))
+        return updates
+
+    def apply_updates(self, updates: List[Tuple[str, str, Any]]) -> None:
+        """
+        Applies the result of fetch_event_updates, doesn't make any requests.
+        """
+        for model, entity_id, entity in updates:
+            if entity and entity.project_id == self.project.id:
+                getattr(self, f"add_{model}")(entity)
+            else:
+                getattr(self, f"remove_{model}")(entity_id)
+
+    # Lookups, lists are sorted by name like their Project counterparts.
+    # They return copies, callers modify entities before pushing them.
+
+    def get_sequence(self, sequence_id: str) -> Optional[Sequence]:
+        return deepcopy(self._sequences.get(sequence_id))
+
+    def get_sequence_by_name(
+        self, sequence_name: str, episode: Union[str, Dict[str, Any], None] = None
+    ) -> Optional[Sequence]:
+        """
+        Sequence names are only unique per episode. Without episode, returns
+        the sequence of that name outside of episodes, or the only one.
+        """
+        if isinstance(episode, dict):
+            episode = episode["id"]
+        sequence = self._sequences_by_name.get((episode or "", sequence_name))
+        if not sequence and not episode:
+            sequence = self._get_unique_by_name(self._sequences_by_name, sequence_name)
+        return deepcopy(sequence)
+
+    def get_sequences_all(self) -> List[Sequence]:
+        return deepcopy(sorted(self._sequences.values(), key=lambda x: x.name))
+
+    def get_shot(self, shot_id: str) -> Optional[Shot]:
+        return deepcopy(self._shots.get(shot_id))
+
+    def get_shot_by_name(self, sequence: Sequence, shot_name: str) -> Optional[Shot]:
+        return deepcopy(self._shots_by_name.get((sequence.id, shot_name)))
+
+    def get_shots_all(self) -> List[Shot]:
+        return deepcopy(sorted(self._shots.values(), key=lambda x: x.name))
+
+    def get_shots_for_sequence(self, sequence: Sequence) -> List[Shot]:
+        shots = self._shots_by_sequence.get(sequence.id, [])
+        return deepcopy(sorted(shots, key=lambda x: x.name))
+
+    def get_asset(self, asset_id: str) -> Optional[Asset]:
+        return deepcopy(self._assets.get(asset_id))
+
+    def get_asset_by_name(
+        self, asset_name: str, asset_type: Optional[AssetType] = None
+    ) -> Optional[Asset]:
+        """
+        Asset names are only unique per asset type. Without asset type,
+        returns the only asset of that name.
+        """
+        if asset_type:
+            asset = self._assets_by_name.get((asset_type.id, asset_name))
+        else:
+            asset = self._get_unique_by_name(self._assets_by_name, asset_name)
+        return deepcopy(asset)
+
+    def get_all_assets_for_type(self, asset_type: AssetType) -> List[Asset]:
+        assets = self._assets_by_type.get(asset_type.id, [])
+        return deepcopy(sorted(assets, key=lambda x: x.name))
+
+    def get_asset_type(self, asset_type_id: str) -> Optional[AssetType]:
+        return deepcopy(self._asset_types.get(asset_type_id))
+
+    def get_all_asset_types(self) -> List[AssetType]:
+        return deepcopy(sorted(self._asset_types.values(), key=lambda x: x.name))
+
+    def get_task_type(self, task_type_id: str) -> Optional[TaskType]:
+        return deepcopy(self._task_types.get(task_type_id))
+
+    def get_task_types_for_entity(self, for_entity: str) -> List[TaskType]:
+        return deepcopy(
+            [t for t in self._task_types.values() if t.for_entity == for_entity]
+        )
+
+    def get_task_status(self, task_status_id: str) -> Optional[TaskStatus]:
+        return deepcopy(self._task_statuses.get(task_status_id))
+
+    def get_task_status_by_short_name(self, short_name: str) -> Optional[TaskStatus]:
+        for task_status in self._task_statuses.values():
+            if task_status.short_name == short_name:
+                return deepcopy(task_status)
+        return None
+
+    def get_task_statuses_all(self) -> List[TaskStatus]:
+        return deepcopy(list(self._task_statuses.values()))
+
+    @staticmethod
+    def _get_unique_by_name(
+        entities_by_name: Dict[Tuple[str, str], Any], name: str
+    ) -> Optional[Any]:
+        matches = [
+            entity
+            for (_, entity_name), entity in entities_by_name.items()
+            if entity_name == name
+        ]
+        return matches[0] if len(matches) == 1 else None
+
+    def __bool__(self) -> bool:
+        return bool(self.loaded_at)
+
+
 class Cache:
     @classmethod
     def clear_all(cls):
         logger.debug("Cleared Server Cache")
+        if gazu.cache.persistent_settings["enabled"]:
+            gazu.cache.invalidate_persistent(host=gazu.client.get_host())
         return gazu.cache.clear_all()
+
+    @classmethod
+    def invalidate_events(cls, events: List[Dict[str, Any]]) -> int:
+        removed = gazu.cache.invalidate_for_events(
+            events, host=gazu.client.get_host()
+        )
+        logger.debug("Invalidated %i server cache entries for events", removed)
+        return removed
@@ -18,12 +18,17 @@
 #
 # (c) 2021, Blender Foundation - Paul Golter
 
+import contextlib
+import functools
 import re
-from typing import Union
+from typing import Any, Callable, Iterator, Optional, Set, Union
 
 import bpy
 
-from blender_kitsu import bkglobals
+from blender_kitsu import bkglobals, gazu
+from blender_kitsu.logger import LoggerFactory
+
+logger = LoggerFactory.getLogger()
 
 
 def ui_redraw() -> None:
@@ -35,6 +40,24 @@ def ui_redraw() -> None:
             area.tag_redraw()
 
 
+def kitsu_request_scope(
+    execute: Callable[[Any, bpy.types.Context], Set[str]]
+) -> Callable[[Any, bpy.types.Context], Set[str]]:
+    """
+    Decorator for operator execute methods. Kitsu requests that are sent more
+    than once while the operator runs, like resolving the same task status for
+    every strip, only reach the server once.
+    """
+
+    # Blender checks the number of arguments of operator methods.
+    @functools.wraps(execute)
+    def wrapper(self: Any, context: bpy.types.Context) -> Set[str]:
+        with gazu.client.request_scope():
+            return execute(self, context)
+
+    return wrapper
+
+
 def get_version(str_value: str, format: type = str) -> Union[str, int, None]:
     match = re.search(bkglobals.VERSION_PATTERN, str_value)
     if match:
@@ -44,3 +67,34 @@ def get_version(str_value: str, format: type = str) -> Union[str, int, None]:
         if format == int:
             return int(version.replace("v", ""))
     return None
+
+
+@contextlib.contextmanager
+def transfer_progress(
+    context: bpy.types.Context, label: str = "Transfer"
+) -> Iterator[Callable[[int, Optional[int]], None]]:
+    """
+    Yields a progress callback for gazu uploads and downloads, that shows the
+    progress in percent in the window manager progress indicator.
+    The callback must be called on the main thread.
+    """
+    wm = context.window_manager
+    last_percent = -1
+
+    def progress_callback(done: int, total: Optional[int]) -> None:
+        nonlocal last_percent
+        if not total:
+            return
+        percent = min(int(done * 100 / total), 100)
+        if percent == last_percent:
+            return
+        last_percent = percent
+        wm.progress_update(percent)
+        if percent % 10 == 0:
+            logger.info("%s: %i%%", label, percent)
+
+    wm.progress_begin(0, 100)
+    try:
+        yield progress_callback
+    finally:
+        wm.progress_end()
@@ -23,12 +23,15 @@ import bpy
 from cache_manager import (
     cmglobals,
     logger,
+    sampler,
+    fingerprint,
     cache,
     models,
     prefs,
     propsdata,
     props,
     opsdata,
+    workers,
     ops,
     ui
 )
@@ -55,12 +58,15 @@ if _need_reload:
 
     cmglobals = importlib.reload(cmglobals)
     logger = importlib.reload(logger)
+    sampler = importlib.reload(sampler)
+    fingerprint = importlib.reload(fingerprint)
     cache = importlib.reload(cache)
     models = importlib.reload(models)
     prefs = importlib.reload(prefs)
     propsdata = importlib.reload(propsdata)
     props = importlib.reload(props)
     opsdata = importlib.reload(opsdata)
+    workers = importlib.reload(workers)
     ops = importlib.reload(ops)
     ui = importlib.reload(ui)
 
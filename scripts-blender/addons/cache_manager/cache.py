@@ -28,9 +28,11 @@ from typing import Dict, List, Any, Union, Optional, Tuple, Dict
 from copy import deepcopy
 
 import bpy
+import numpy as np
 
-from cache_manager import prefs, propsdata, cmglobals, opsdata
+from cache_manager import prefs, propsdata, cmglobals, opsdata, fingerprint
 from cache_manager.logger import LoggerFactory, log_new_lines
+from cache_manager.sampler import DataPathSampler, split_data_path
 
 logger = LoggerFactory.getLogger(__name__)
 
@@ -95,6 +97,114 @@ def save_as_json(data: Any, filepath: Path) -> None:
         json.dump(data, file, indent=2)
 
 
+def get_data_filepath(filepath: Path) -> Path:
+    """
+    Returns path of the binary file holding the values of a columnar
+    cacheconfig.
+    """
+    return filepath.with_suffix(cmglobals.CACHECONFIG_DATA_SUFFIX)
+
+
+def save_as_columnar(data: Dict[str, Any], filepath: Path) -> None:
+    """
+    Saves cacheconfig data as json, but with the values of each data path
+    stored as one contiguous array in a binary file next to it. The json only
+    keeps offset, type and shape of each array.
+    """
+    data_filepath = get_data_filepath(filepath)
+    json_obj = dict(data)
+    json_obj["meta"] = dict(data["meta"], data_file=data_filepath.name)
+
+    # Both files are written under temporary names and then replace the old
+    # ones, so readers never see a partially written or truncated file.
+    tmp_data_filepath = data_filepath.with_name(f".{data_filepath.name}.tmp")
+    tmp_filepath = filepath.with_name(f".{filepath.name}.tmp")
+    try:
+        _write_columnar_data(data, json_obj, tmp_data_filepath)
+        save_as_json(json_obj, tmp_filepath)
+        os.replace(tmp_data_filepath, data_filepath)
+        os.replace(tmp_filepath, filepath)
+    finally:
+        for path in (tmp_data_filepath, tmp_filepath):
+            if path.exists():
+                path.unlink()
+
+
+def _write_columnar_data(
+    data: Dict[str, Any], json_obj: Dict[str, Any], data_filepath: Path
+) -> None:
+    """
+    Writes the values of data to data_filepath, offset, type and shape of each
+    array are added to json_obj.
+    """
+    with open(data_filepath.as_posix(), "wb") as file:
+        offset = 0
+        for obj_category in cmglobals.CACHECONFIG_OBJ_CATEGORIES:
+            json_obj[obj_category] = {}
+
+            for obj_name, obj_dict in data[obj_category].items():
+                obj_dict = dict(obj_dict, data_paths={})
+                json_obj[obj_category][obj_name] = obj_dict
+
+                for data_path, data_path_dict in data[obj_category][obj_name][
+                    "data_paths"
+                ].items():
+                    array = np.asarray(data_path_dict["value"])
+                    # Blender stores float properties in single precision.
+                    if array.dtype == np.float64:
+                        array = array.astype(np.float32)
+
+                    padding = -offset % cmglobals.CACHECONFIG_DATA_ALIGNMENT
+                    file.write(bytes(padding))
+                    offset += padding
+
+                    obj_dict["data_paths"][data_path] = {
+                        "offset": offset,
+                        "dtype": array.dtype.str,
+                        "shape": list(array.shape),
+                    }
+                    file.write(array.tobytes())
+                    offset += array.nbytes
+
+
+def ensure_action(
+    id_data: Union[bpy.types.Object, bpy.types.Camera]
+) -> bpy.types.Action:
+    """
+    Returns the action of id_data, creates one like keyframe_insert() does if
+    it has none. Linked actions are replaced by a local copy, so they can be
+    edited.
+    """
+    anim_data = id_data.animation_data or id_data.animation_data_create()
+    action = anim_data.action
+
+    if not action:
+        action = bpy.data.actions.new(f"{id_data.name}Action")
+        anim_data.action = action
+    elif action.library:
+        action = action.copy()
+        anim_data.action = action
+
+    return action
+
+
+def get_enum_items(
+    id_data: Union[bpy.types.Object, bpy.types.Camera], data_path: str
+) -> Dict[str, int]:
+    """
+    Returns mapping of identifier to value of the enum property at data_path.
+    Empty if it is not an enum property, like custom properties.
+    """
+    struct_path, prop_name, is_subscript = split_data_path(data_path)
+    if is_subscript:
+        return {}
+    struct = id_data.path_resolve(struct_path) if struct_path else id_data
+    prop = struct.bl_rna.properties.get(prop_name)
+    if not prop or prop.type != "ENUM":
+        return {}
+    return {item.identifier: item.value for item in prop.enum_items}
+
+
 @contextlib.contextmanager
 def temporary_current_frame(context):
     """Allows the context to set the scene current frame, restores it on exit.
@@ -115,6 +225,7 @@ class CacheConfig:
 
     def _load(self, filepath: Path) -> None:
         self._json_obj: Dict[str, Any] = read_json(self.filepath)
+        self._data: Optional[np.memmap] = None
         self.filepath = filepath
         logger.info("Loaded cacheconfig from: %s", filepath.as_posix())
 
@@ -122,6 +233,28 @@ class CacheConfig:
     def json_obj(self) -> Any:
         return self._json_obj
 
+    @property
+    def is_columnar(self) -> bool:
+        return "data_file" in self._json_obj["meta"]
+
+    def _get_data(self) -> np.memmap:
+        # Map the data file on first access, pages are only read when used.
+        if self._data is None:
+            data_file = self.filepath.parent / self._json_obj["meta"]["data_file"]
+            self._data = np.memmap(data_file.as_posix(), mode="r")
+        return self._data
+
+    def _get_array(self, data_path_dict: Dict[str, Any]) -> np.ndarray:
+        dtype = np.dtype(data_path_dict["dtype"])
+        shape = tuple(data_path_dict["shape"])
+        count = int(np.prod(shape))
+        if not count:
+            return np.empty(shape, dtype=dtype)
+        array = np.frombuffer(
+            self._get_data(), dtype=dtype, count=count, offset=data_path_dict["offset"]
+        )
+        return array.reshape(shape)
+
     # Meta.
 
     def get_meta(self) -> Dict[str, Any]:
@@ -145,9 +278,19 @@ class CacheConfig:
         ][variant]["cachefile"]
 
     def get_all_collvariants(self, libfile: str, coll_ref_name: str) -> Dict[str, Any]:
-        return deepcopy(
-            self._json_obj["libs"][libfile]["data_from"]["collections"][coll_ref_name]
-        )
+        # Returned dicts of the getters are not copied, don't modify them.
+        return self._json_obj["libs"][libfile]["data_from"]["collections"][
+            coll_ref_name
+        ]
+
+    def get_coll_variant(self, coll_var_name: str) -> Optional[Dict[str, Any]]:
+        for libfile in self._json_obj["libs"]:
+            for collvariants in self._json_obj["libs"][libfile]["data_from"][
+                "collections"
+            ].values():
+                if coll_var_name in collvariants:
+                    return collvariants[coll_var_name]
+        return None
 
     # Remapping.
     def get_coll_to_lib_mapping(self) -> Dict[str, str]:
@@ -162,7 +305,9 @@ class CacheConfig:
 
     # Objs / Cams.
     def get_animation_data(self, obj_category: str) -> Dict[str, Any]:
-        return deepcopy(self._json_obj[obj_category])
+        # For columnar cacheconfigs, data paths hold the location of their
+        # values, use get_all_data_path_values() to read them.
+        return self._json_obj[obj_category]
 
     def get_all_obj_names(self, obj_category: str) -> List[str]:
         return sorted(self._json_obj[obj_category].keys())
@@ -176,22 +321,29 @@ class CacheConfig:
                 obj_name,
             )
             return None
-        return deepcopy(anim_obj_dict)
+        return anim_obj_dict
 
     def get_all_data_paths(self, obj_category: str, obj_name: str) -> List[str]:
         return self._json_obj[obj_category][obj_name]["data_paths"].keys()
 
     def get_all_data_path_values(
         self, obj_category: str, obj_name: str, data_path: str
-    ) -> List[Any]:
-        return deepcopy(
-            self._json_obj[obj_category][obj_name]["data_paths"][data_path]["value"]
-        )
+    ) -> Union[List[Any], np.ndarray]:
+        """
+        Returns values of data_path for each frame. For columnar cacheconfigs
+        this is a read only array backed by the data file.
+        """
+        data_path_dict = self._json_obj[obj_category][obj_name]["data_paths"][
+            data_path
+        ]
+        if "value" in data_path_dict:
+            return data_path_dict["value"]
+        return self._get_array(data_path_dict)
 
     def get_data_path_value(
         self, obj_category: str, obj_name: str, data_path: str, frame: int
     ) -> Any:
-        return self._json_obj[obj_category][obj_name]["data_paths"][data_path]["value"][
+        return self.get_all_data_path_values(obj_category, obj_name, data_path)[
             frame
         ]
 
@@ -223,12 +375,33 @@ class CacheConfigBlueprint(CacheConfig):
 
     def __init__(self):
         self._json_obj: Dict[str, Any] = deepcopy(self._CACHECONFIG_TEMPL)
+        self._data = None
 
     def init_by_file(self, filepath: Path) -> None:
-        self._json_obj = read_json(filepath)
+        cacheconfig = CacheConfig(filepath)
+        self._json_obj = cacheconfig.json_obj
+
+        if not cacheconfig.is_columnar:
+            return
+
+        # Values are appended to lists, no matter in which format they were saved.
+        for obj_category in cmglobals.CACHECONFIG_OBJ_CATEGORIES:
+            for obj_name, obj_dict in self._json_obj[obj_category].items():
+                for data_path in obj_dict["data_paths"]:
+                    values = cacheconfig.get_all_data_path_values(
+                        obj_category, obj_name, data_path
+                    )
+                    obj_dict["data_paths"][data_path] = {"value": values.tolist()}
+        del self._json_obj["meta"]["data_file"]
+
+    def save_as_cacheconfig(self, filepath: Path, columnar: bool = False) -> None:
+        if columnar:
+            save_as_columnar(self._json_obj, filepath)
+            return
 
-    def save_as_cacheconfig(self, filepath: Path) -> None:
         save_as_json(self._json_obj, filepath)
+        # Remove values of a previous columnar export, they are in the json now.
+        get_data_filepath(filepath).unlink(missing_ok=True)
 
     # Meta.
 
@@ -300,6 +473,47 @@ class CacheConfigBlueprint(CacheConfig):
             value
         )
 
+    def set_data_path_values(
+        self, obj_category: str, obj_name: str, data_path: str, values: List[Any]
+    ) -> None:
+        self._json_obj[obj_category][obj_name]["data_paths"][data_path][
+            "value"
+        ] = values
+
+    def update_from_config(
+        self, cacheconfig: CacheConfig, with_libs: bool = True
+    ) -> None:
+        """
+        Adds collections, objects and cameras of cacheconfig, replacing
+        existing entries. Collections are skipped if with_libs is False.
+        """
+        for libfile in cacheconfig.get_all_libfiles() if with_libs else []:
+            for coll_ref_name in cacheconfig.get_all_coll_ref_names(libfile):
+                collvariants = cacheconfig.get_all_collvariants(libfile, coll_ref_name)
+                for coll_var_name, coll_dict in collvariants.items():
+                    self.set_coll_variant(
+                        libfile, coll_ref_name, coll_var_name, dict(coll_dict)
+                    )
+
+        for obj_category in cmglobals.CACHECONFIG_OBJ_CATEGORIES:
+            for obj_name, obj_dict in cacheconfig.get_animation_data(
+                obj_category
+            ).items():
+                for key, value in obj_dict.items():
+                    if key != "data_paths":
+                        self.set_obj_key(obj_category, obj_name, key, value)
+
+                for data_path in obj_dict["data_paths"]:
+                    values = cacheconfig.get_all_data_path_values(
+                        obj_category, obj_name, data_path
+                    )
+                    if isinstance(values, np.ndarray):
+                        values = values.tolist()
+                    self.add_obj_data_path(obj_category, obj_name, data_path)
+                    self.set_data_path_values(
+                        obj_category, obj_name, data_path, list(values)
+                    )
+
     def get_data_path_dict_templ(self) -> Dict[str, Any]:
         return deepcopy(self._DRIVERDICT_TEMPL)
 
@@ -522,7 +736,6 @@ class CacheConfigProcessor:
     ) -> None:
 
         frame_in = cacheconfig.get_meta_key("frame_start")
-        frame_out = cacheconfig.get_meta_key("frame_end")
 
         # Check if obj in collection is in cacheconfig
         # if so key all data paths with the value from cacheconfig.
@@ -553,29 +766,11 @@ class CacheConfigProcessor:
                 # For log.
                 anim_props_list.append(data_path)
 
-                # Insert keyframe for frames in json_obj.
-                for frame in range(frame_in, frame_out + 1):
-
-                    # Get value to set prop to.
-                    prop_value = cacheconfig.get_data_path_value(
-                        obj_category, obj_name, data_path, frame - frame_in
-                    )
-
-                    # Pack string prop in "" so exec works.
-                    if type(prop_value) == str:
-                        prop_value = f'"{prop_value}"'
-
-                    # Get right delimeter.
-                    deliminater = "."
-                    if data_path.startswith("["):
-                        deliminater = ""
-
-                    # Get right data category.
-                    command = f'bpy.data.{obj_category}["{obj_name}", None]{deliminater}{data_path}={prop_value}'
-
-                    # Set property and insert keyframe.
-                    exec(command)
-                    obj.keyframe_insert(data_path=data_path, frame=frame)
+                # Write all frames of json_obj to F-curves.
+                values = cacheconfig.get_all_data_path_values(
+                    obj_category, obj_name, data_path
+                )
+                cls._write_data_path_fcurves(obj, data_path, frame_in, values)
 
             if muted_drivers:
                 logger.info(
@@ -590,6 +785,59 @@ class CacheConfigProcessor:
                     " ,".join(anim_props_list),
                 )
 
+    @classmethod
+    def _write_data_path_fcurves(
+        cls,
+        obj: Union[bpy.types.Object, bpy.types.Camera],
+        data_path: str,
+        frame_in: int,
+        values: List[Any],
+    ) -> None:
+        if not len(values):
+            return
+
+        # Enum properties are stored by identifier, F-curves need the value.
+        if isinstance(values[0], str):
+            enum_items = get_enum_items(obj, data_path)
+            if not enum_items:
+                logger.warning(
+                    "%s can't animate %s, not an enum property", obj.name, data_path
+                )
+                return
+            values = [enum_items[value] for value in values]
+
+        # One row per frame, one column per array index.
+        values = np.array(values, dtype=np.float32).reshape(len(values), -1)
+        frames = np.arange(frame_in, frame_in + len(values), dtype=np.float32)
+
+        # Constant interpolation for booleans, integers and enums, so sub
+        # frames (motion blur) don't get values that were never stored.
+        discrete = isinstance(obj.path_resolve(data_path), (bool, int, str))
+        if discrete and values.shape[1] == 1:
+            interpolation = cmglobals.FCURVE_INTERPOLATION_CONSTANT
+        else:
+            interpolation = cmglobals.FCURVE_INTERPOLATION_BEZIER
+
+        action = ensure_action(obj)
+        co = np.empty(len(values) * 2, dtype=np.float32)
+        co[0::2] = frames
+
+        for index in range(values.shape[1]):
+            # Replace existing animation of this channel.
+            fcurve = action.fcurves.find(data_path, index=index)
+            if fcurve:
+                action.fcurves.remove(fcurve)
+            fcurve = action.fcurves.new(data_path, index=index)
+
+            co[1::2] = values[:, index]
+            fcurve.keyframe_points.add(len(values))
+            fcurve.keyframe_points.foreach_set("co", co)
+            fcurve.keyframe_points.foreach_set(
+                "interpolation", [interpolation] * len(values)
+            )
+            fcurve.update()
+
+
 
 class CacheConfigFactory:
 
@@ -601,8 +849,12 @@ class CacheConfigFactory:
         context: bpy.types.Context,
         colls: List[bpy.types.Collection],
         filepath: Path,
+        failed_colls: Optional[List[bpy.types.Collection]] = None,
     ) -> CacheConfig:
-
+        """
+        Generates the cacheconfig of colls at filepath. Collections in
+        failed_colls get no fingerprint, so their cache isn't reused.
+        """
         blueprint = CacheConfigBlueprint()
 
         colls = sorted(colls, key=lambda x: x.name)
@@ -623,7 +875,7 @@ class CacheConfigFactory:
         cls._populate_metadata(context, blueprint)
 
         # Populate cacheconfig with libs based on collections.
-        cls._populate_libs(context, colls, blueprint)
+        cls._populate_libs(context, colls, blueprint, failed_colls)
 
         # Populate cacheconfig with animation data.
         objects_with_anim = cls._populate_with_objs(colls, blueprint)
@@ -638,7 +890,9 @@ class CacheConfigFactory:
         cls._store_data_path_values(context, objects_with_anim, blueprint)
 
         # Save json obj to disk.
-        blueprint.save_as_cacheconfig(filepath)
+        blueprint.save_as_cacheconfig(
+            filepath, columnar=prefs.addon_prefs_get(context).use_columnar_cacheconfig
+        )
         logger.info("Generated cacheconfig and saved to: %s", filepath.as_posix())
 
         log_new_lines(1)
@@ -646,6 +900,47 @@ class CacheConfigFactory:
 
         return CacheConfig(filepath)
 
+    @classmethod
+    def merge_configs(
+        cls,
+        context: bpy.types.Context,
+        cacheconfigs: List[CacheConfig],
+        filepath: Path,
+        colls: List[bpy.types.Collection],
+        failed_colls: Optional[List[bpy.types.Collection]] = None,
+    ) -> CacheConfig:
+        """
+        Combines cacheconfigs that were generated for some of the collections
+        each, like by export workers, into the cacheconfig at filepath.
+
+        Libs entries of colls are generated in this file, as the ones of the
+        cacheconfigs point to the file they were generated in. Entries of
+        failed_colls lose their fingerprint, like in gen_config_from_colls.
+        """
+        blueprint = CacheConfigBlueprint()
+
+        if filepath.exists():
+            logger.info(
+                "Cacheconfig already exists: %s. Will update entries.",
+                filepath.as_posix(),
+            )
+            blueprint.init_by_file(filepath)
+
+        cls._populate_metadata(context, blueprint)
+        cls._populate_libs(context, colls, blueprint)
+        cls._populate_libs(context, failed_colls or [], blueprint, failed_colls)
+
+        for cacheconfig in cacheconfigs:
+            blueprint.update_from_config(cacheconfig, with_libs=False)
+            logger.info("Merged cacheconfig: %s", cacheconfig.filepath.as_posix())
+
+        blueprint.save_as_cacheconfig(
+            filepath, columnar=prefs.addon_prefs_get(context).use_columnar_cacheconfig
+        )
+        logger.info("Merged cacheconfigs and saved to: %s", filepath.as_posix())
+
+        return CacheConfig(filepath)
+
     @classmethod
     def _populate_metadata(
         cls, context: bpy.types.Context, blueprint: CacheConfigBlueprint
@@ -683,9 +978,11 @@ class CacheConfigFactory:
         context: bpy.types.Context,
         colls: List[bpy.types.Collection],
         blueprint: CacheConfigBlueprint,
+        failed_colls: Optional[List[bpy.types.Collection]] = None,
     ) -> CacheConfigBlueprint:
 
         colls = sorted(colls, key=lambda x: x.name)
+        failed_colls = failed_colls or []
 
         # Get libraries.
         for coll in colls:
@@ -699,6 +996,12 @@ class CacheConfigFactory:
                     coll, context
                 ).as_posix(),
             }
+            # A failed export might have left a broken cachefile behind, it
+            # must not be reused.
+            if coll not in failed_colls:
+                _coll_dict["fingerprint"] = fingerprint.get_collection_fingerprint(
+                    context, coll
+                )
 
             # Set blueprint coll variant.
             blueprint.set_coll_variant(libfile, coll_ref.name, coll.name, _coll_dict)
@@ -842,23 +1145,39 @@ class CacheConfigFactory:
         fout = context.scene.frame_end
         frame_range = range(fin, fout + 1)
 
-        with temporary_current_frame(context) as original_curframe:
-            for frame in frame_range:
-                context.scene.frame_set(frame)
-                logger.info("Storing animation data for frame %i", frame)
-
-                for obj in objects:
-                    obj_category = "objects"
-                    if obj.type in cmglobals.CAMERA_TYPES:
-                        obj_category = "cameras"
-
-                    for data_path in blueprint.get_all_data_paths(
-                        obj_category, obj.name
-                    ):
-                        data_path_value = obj.path_resolve(data_path)
-                        blueprint.append_value_to_data_path(
-                            obj_category, obj.name, data_path, data_path_value
-                        )
+        # Resolve all data paths once, values are read into arrays per frame.
+        sampler = DataPathSampler(len(frame_range))
+        for obj in objects:
+            obj_category = "objects"
+            if obj.type in cmglobals.CAMERA_TYPES:
+                obj_category = "cameras"
+
+            for data_path in blueprint.get_all_data_paths(obj_category, obj.name):
+                sampler.add((obj_category, obj.name, data_path), obj, data_path)
+
+        # Exclude collections that aren't needed, so frame_set() evaluates less.
+        lcolls_to_restore = []
+        if prefs.addon_prefs_get(context).use_isolated_sampling:
+            ids = set(objects)
+            needed_objs = [
+                obj for obj in context.scene.objects if obj in ids or obj.data in ids
+            ]
+            lcolls_to_restore = opsdata.set_layer_coll_exlcude(
+                opsdata.get_unrelated_layer_colls(context, needed_objs), True
+            )
+
+        try:
+            with temporary_current_frame(context) as original_curframe:
+                for frame_index, frame in enumerate(frame_range):
+                    context.scene.frame_set(frame)
+                    logger.info("Storing animation data for frame %i", frame)
+                    sampler.sample(frame_index)
+        finally:
+            opsdata.restore_layer_coll_exlude(lcolls_to_restore)
+
+        for key, values in sampler.get_values().items():
+            obj_category, obj_name, data_path = key
+            blueprint.set_data_path_values(obj_category, obj_name, data_path, values)
 
         # Log.
         logger.info(
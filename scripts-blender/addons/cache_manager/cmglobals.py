@@ -71,6 +71,25 @@ CAM_DATA_PATHS: List[str] = [
 
 INSTANCE_TYPES: List[str] = ["NONE", "COLLECTION", "VERTS", "FACES"]
 
+CACHECONFIG_OBJ_CATEGORIES: List[str] = ["objects", "cameras"]
+
+# Columnar cacheconfigs store their values in a file with this suffix
+# next to the json, each array starts at a multiple of the alignment.
+CACHECONFIG_DATA_SUFFIX = ".data"
+CACHECONFIG_DATA_ALIGNMENT = 64
+
+# Seconds between checks whether export workers finished.
+WORKER_POLL_INTERVAL = 0.5
+# Number of lines of the output of a failed worker that are logged.
+WORKER_LOG_LINES = 30
+# Workers print their exit state on a line starting with this.
+WORKER_STATUS_PREFIX = "CM_EXPORT_STATUS: "
+WORKER_STATUS_DONE = "done"
+
+# Values of Keyframe.interpolation as used by foreach_set().
+FCURVE_INTERPOLATION_CONSTANT = 0
+FCURVE_INTERPOLATION_BEZIER = 2
+
 # "lens_unit",
 # "angle",
 # "angle_x",
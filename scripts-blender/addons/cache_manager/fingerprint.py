@@ -0,0 +1,256 @@
+# ***** BEGIN GPL LICENSE BLOCK *****
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# ***** END GPL LICENCE BLOCK *****
+#
+# (c) 2023, Blender Foundation
+
+"""
+Fingerprints of cache collections. If the fingerprint of a collection is the
+same as in the cacheconfig of an earlier export, its alembic cache can be
+reused instead of exporting it again.
+
+The fingerprint covers what the cache is generated from: actions, NLA
+strips and drivers of the objects in the collection, their data, shape keys,
+driver targets, parents and the objects constraints and modifiers point to,
+the modification times of the libraries they come from, the frame range and
+the alembic export settings. Local edits that are not
+animated, like changed modifier settings, are not detected.
+"""
+
+import hashlib
+import os
+from typing import Any, List, Optional, Set
+
+import bpy
+import numpy as np
+
+from cache_manager import opsdata
+
+
+def _update(hasher: Any, key: str, value: Any) -> None:
+    hasher.update(f"{key}={value!r}\n".encode())
+
+
+def _update_array(
+    hasher: Any,
+    collection: bpy.types.bpy_prop_collection,
+    attr: str,
+    size: int,
+    dtype: type = np.float32,
+) -> None:
+    array = np.empty(len(collection) * size, dtype=dtype)
+    collection.foreach_get(attr, array)
+    hasher.update(array.tobytes())
+
+
+def _hash_fcurve(hasher: Any, fcurve: bpy.types.FCurve) -> None:
+    _update(hasher, "fcurve", (fcurve.data_path, fcurve.array_index, fcurve.mute))
+    _update(hasher, "extrapolation", fcurve.extrapolation)
+
+    keyframes = fcurve.keyframe_points
+    _update(hasher, "keyframes", len(keyframes))
+    _update_array(hasher, keyframes, "co", 2)
+    _update_array(hasher, keyframes, "handle_left", 2)
+    _update_array(hasher, keyframes, "handle_right", 2)
+    _update_array(hasher, keyframes, "interpolation", 1, dtype=np.int32)
+
+    for modifier in fcurve.modifiers:
+        _update(hasher, "modifier", (modifier.type, modifier.mute))
+
+
+def _hash_action(hasher: Any, action: Optional[bpy.types.Action]) -> None:
+    if not action:
+        _update(hasher, "action", None)
+        return
+
+    _update(hasher, "action", action.name_full)
+    for fcurve in action.fcurves:
+        _hash_fcurve(hasher, fcurve)
+
+
+def _hash_driver(hasher: Any, fcurve: bpy.types.FCurve) -> List[bpy.types.ID]:
+    # Mute state is left out, exporting changes it temporarily.
+    driver = fcurve.driver
+    _update(hasher, "driver", (fcurve.data_path, fcurve.array_index))
+    _update(hasher, "expression", (driver.type, driver.expression))
+    _update(hasher, "keyframes", len(fcurve.keyframe_points))
+    _update_array(hasher, fcurve.keyframe_points, "co", 2)
+    for modifier in fcurve.modifiers:
+        _update(hasher, "modifier", modifier.type)
+
+    target_ids: List[bpy.types.ID] = []
+    for var in driver.variables:
+        _update(hasher, "variable", (var.name, var.type))
+        for target in var.targets:
+            _update(
+                hasher,
+                "target",
+                (
+                    target.id.name_full if target.id else None,
+                    target.data_path,
+                    target.bone_target,
+                    target.transform_type,
+                    target.transform_space,
+                    target.rotation_mode,
+                ),
+            )
+            if target.id:
+                target_ids.append(target.id)
+
+    return target_ids
+
+
+def _hash_anim_data(hasher: Any, id_data: bpy.types.ID) -> List[bpy.types.ID]:
+    """
+    Hashes animation data of id_data. Returns IDs that drivers read from.
+    """
+    anim_data = getattr(id_data, "animation_data", None)
+    if not anim_data:
+        _update(hasher, "animation_data", None)
+        return []
+
+    _hash_action(hasher, anim_data.action)
+
+    for track in anim_data.nla_tracks:
+        _update(hasher, "nla_track", (track.name, track.mute, track.is_solo))
+        for strip in track.strips:
+            _update(
+                hasher,
+                "strip",
+                (
+                    strip.frame_start,
+                    strip.frame_end,
+                    strip.action_frame_start,
+                    strip.action_frame_end,
+                    strip.scale,
+                    strip.repeat,
+                    strip.blend_type,
+                    strip.influence,
+                    strip.mute,
+                ),
+            )
+            _hash_action(hasher, strip.action)
+
+    target_ids: List[bpy.types.ID] = []
+    for fcurve in anim_data.drivers:
+        target_ids.extend(_hash_driver(hasher, fcurve))
+    return target_ids
+
+
+def _get_object_dependencies(obj: bpy.types.Object) -> List[bpy.types.ID]:
+    """
+    Returns IDs the evaluated obj depends on: its data, parent and the IDs
+    that constraints and modifiers point to, like armatures or hook targets.
+    """
+    dependencies: List[bpy.types.ID] = []
+    if obj.data:
+        dependencies.append(obj.data)
+        shape_keys = getattr(obj.data, "shape_keys", None)
+        if shape_keys:
+            dependencies.append(shape_keys)
+    if obj.parent:
+        dependencies.append(obj.parent)
+
+    structs: List[bpy.types.bpy_struct] = [*obj.constraints, *obj.modifiers]
+    if obj.pose:
+        for bone in obj.pose.bones:
+            structs.extend(bone.constraints)
+
+    for struct in structs:
+        for prop in struct.bl_rna.properties:
+            if prop.type != "POINTER":
+                continue
+            value = getattr(struct, prop.identifier)
+            if isinstance(value, bpy.types.ID):
+                dependencies.append(value)
+
+        # Armature constraints have a list of targets.
+        for target in getattr(struct, "targets", []):
+            if target.target:
+                dependencies.append(target.target)
+
+    return dependencies
+
+
+def _get_library(id_data: bpy.types.ID) -> Optional[bpy.types.Library]:
+    if id_data.library:
+        return id_data.library
+    if id_data.override_library and id_data.override_library.reference:
+        return id_data.override_library.reference.library
+    return None
+
+
+def _hash_library(hasher: Any, library: bpy.types.Library) -> None:
+    filepath = os.path.abspath(bpy.path.abspath(library.filepath))
+    try:
+        mtime = os.stat(filepath).st_mtime_ns
+    except OSError:
+        mtime = None
+    _update(hasher, "library", (library.filepath, mtime))
+
+
+def get_collection_fingerprint(
+    context: bpy.types.Context, coll: bpy.types.Collection
+) -> str:
+    """
+    Returns hex digest over everything the alembic cache of coll depends on.
+    """
+    hasher = hashlib.sha1()
+    cm = context.scene.cm
+    _update(hasher, "frame_range", opsdata.get_cache_frame_range(context))
+    _update(hasher, "settings", (cm.xsamples, cm.gsamples, cm.sh_open, cm.sh_close))
+
+    # Data of the objects is hashed as one of their dependencies.
+    id_datas: List[bpy.types.ID] = [coll]
+    id_datas.extend(sorted(coll.all_objects, key=lambda obj: obj.name_full))
+
+    visited: Set[str] = set()
+    libraries: Set[bpy.types.Library] = set()
+    dependencies: List[bpy.types.ID] = []
+
+    def hash_id(id_data: bpy.types.ID) -> List[bpy.types.ID]:
+        """
+        Hashes id_data, returns the IDs it depends on.
+        """
+        key = f"{type(id_data).__name__}:{id_data.name_full}"
+        if key in visited:
+            return []
+        visited.add(key)
+
+        library = _get_library(id_data)
+        if library:
+            libraries.add(library)
+
+        _update(hasher, "id", key)
+        id_dependencies = _hash_anim_data(hasher, id_data)
+        if isinstance(id_data, bpy.types.Object):
+            id_dependencies.extend(_get_object_dependencies(id_data))
+        return id_dependencies
+
+    for id_data in id_datas:
+        dependencies.extend(hash_id(id_data))
+
+    # Animation of IDs outside of the collection that drivers, parents,
+    # constraints or modifiers read from changes the cache too, like a rig
+    # a character is parented to. Their dependencies are followed as well.
+    while dependencies:
+        dependencies.extend(hash_id(dependencies.pop(0)))
+
+    for library in sorted(libraries, key=lambda lib: lib.filepath):
+        _hash_library(hasher, library)
+
+    return hasher.hexdigest()
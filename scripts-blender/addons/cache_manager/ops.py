@@ -18,13 +18,24 @@
 #
 # (c) 2021, Blender Foundation
 
+import shutil
+import tempfile
 from typing import List, Any, Set, cast, Tuple, Dict
 from pathlib import Path
 
 import bpy
 from bpy.app.handlers import persistent
 
-from cache_manager import cache, props, propsdata, opsdata, cmglobals
+from cache_manager import (
+    cache,
+    cmglobals,
+    fingerprint,
+    opsdata,
+    prefs,
+    props,
+    propsdata,
+    workers,
+)
 from cache_manager.logger import LoggerFactory, gen_processing_string, log_new_lines
 from cache_manager.cache import CacheConfigFactory, CacheConfigProcessor
 
@@ -40,6 +51,151 @@ def ui_redraw() -> None:
             area.tag_redraw()
 
 
+def construct_mod_to_restore_vis_list(
+    *args: List[Tuple[bpy.types.Modifier, bool, bool]]
+) -> List[Tuple[bpy.types.Modifier, bool, bool]]:
+
+    mods_to_restore_vis: List[Tuple[bpy.types.Modifier, bool, bool]] = []
+
+    for arg in args:
+        for mod, show_viewport, show_render in arg:
+            if mod not in [m for m, v, r in mods_to_restore_vis]:
+                mods_to_restore_vis.append((mod, show_viewport, show_render))
+
+    return mods_to_restore_vis
+
+
+def export_collection_cache(
+    context: bpy.types.Context,
+    coll: bpy.types.Collection,
+    filepath: Path,
+    frame_range: Tuple[int, int],
+) -> bool:
+    """
+    Exports the valid cache objects of coll to an alembic file at filepath.
+    Objects of coll need to be in the view layer of the context.
+
+    Returns:
+        True if the export succeeded.
+    """
+    # Deselect all.
+    bpy.ops.object.select_all(action="DESELECT")
+
+    # Create object list to be exported.
+    object_list = cache.get_valid_cache_objects(coll)
+
+    # Mute drivers.
+    muted_vis_drivers = opsdata.disable_vis_drivers(object_list, modifiers=True)
+
+    # Ensure modifiers vis have render vis settings does not include MODIFIERS_KEEP.
+    mods_restore_vis_from_sync = opsdata.sync_modifier_vis_with_render_setting(
+        object_list
+    )
+
+    # Ensure MODIFIERS_KEEP are disabled for export (they will be enabled on import).
+    mods_restore_vis_from_keep = opsdata.config_modifiers_keep_state(
+        object_list, enable=False
+    )
+
+    # Apply modifier suffix visibility override (.nocache)
+    # > will set show_viewport, show_render to False.
+    mods_restore_vis_from_suffix = opsdata.apply_modifier_suffix_vis_override(
+        object_list, "EXPORT"
+    )
+
+    # Gen one list of tuples that contains each modifier with its original vis settings once.
+    mods_to_restore_vis = construct_mod_to_restore_vis_list(
+        mods_restore_vis_from_sync,
+        mods_restore_vis_from_keep,
+        mods_restore_vis_from_suffix,
+    )
+
+    # Ensure the all collections are visible during export
+    # otherwise object in it will not be exported.
+    colls_to_restore_vis = opsdata.set_item_vis(
+        list(opsdata.traverse_collection_tree(coll)), True
+    )
+
+    # Ensure that all objects are visible for export.
+    objs_to_restore_vis = opsdata.set_item_vis(object_list, True)
+
+    # Set instancing type of empties to None.
+    empties_to_restore = opsdata.set_instancing_type_of_empties(object_list, "NONE")
+
+    # Select objects for bpy.ops.wm.alembic_export.
+    for obj in object_list:
+        obj.select_set(True)
+
+    # Filepath.
+    if filepath.exists():
+        logger.warning(
+            "Filepath %s already exists. Will overwrite.", filepath.as_posix()
+        )
+        # Might be a hard link to the cache of an earlier version, which
+        # would be overwritten too.
+        filepath.unlink()
+
+    # Export.
+    try:
+        logger.info("Start alembic export of %s", coll.name)
+        # For each collection create separate alembic.
+        bpy.ops.wm.alembic_export(
+            filepath=filepath.as_posix(),
+            start=frame_range[0],
+            end=frame_range[1],
+            xsamples=context.scene.cm.xsamples,
+            gsamples=context.scene.cm.gsamples,
+            sh_open=context.scene.cm.sh_open,
+            sh_close=context.scene.cm.sh_close,
+            selected=True,
+            visible_objects_only=False,
+            flatten=True,
+            uvs=True,
+            packuv=True,
+            normals=True,
+            vcolors=False,
+            face_sets=True,
+            subdiv_schema=False,
+            apply_subdiv=True,
+            curves_as_mesh=True,
+            use_instancing=True,
+            global_scale=1,
+            triangulate=False,
+            quad_method="SHORTEST_DIAGONAL",
+            ngon_method="BEAUTY",
+            export_hair=False,
+            export_particles=False,
+            export_custom_properties=True,
+            as_background_job=False,
+            init_scene_frame_range=False,
+        )
+        logger.info("Alembic export of %s finished", coll.name)
+
+    except Exception as e:
+        logger.info("Failed to export %s", coll.name)
+        logger.exception(str(e))
+        return False
+
+    # Restore instancing types of empties.
+    opsdata.restore_instancing_type(empties_to_restore)
+
+    # Hide objects again.
+    opsdata.restore_item_vis(objs_to_restore_vis)
+
+    # Hide colls again.
+    opsdata.restore_item_vis(colls_to_restore_vis)
+
+    # Restore modifier viewport vis / render vis.
+    opsdata.restore_modifier_vis(mods_to_restore_vis)
+
+    # Entmute driver.
+    opsdata.enable_muted_drivers(muted_vis_drivers)
+
+    # Success log for this collections.
+    logger.info("Exported %s to %s", coll.name, filepath.as_posix())
+    return True
+
+
 class CM_OT_cache_export(bpy.types.Operator):
     bl_idname = "cm.cache_export"
     bl_label = "Export Cache"
@@ -69,9 +225,11 @@ class CM_OT_cache_export(bpy.types.Operator):
             self.report({"WARNING"}, "Exporting cache aborted.")
             return {"CANCELLED"}
 
+        if context.scene.cm.use_parallel_export and not bpy.data.filepath:
+            self.report({"ERROR"}, "Parallel export needs a saved blend file.")
+            return {"CANCELLED"}
+
         cacheconfig_path: Path = context.scene.cm.cacheconfig_path
-        succeeded: List[bpy.types.Collection] = []
-        failed: List[bpy.types.Collection] = []
 
         log_new_lines(1)
 
@@ -94,12 +252,112 @@ class CM_OT_cache_export(bpy.types.Operator):
             filedir.mkdir(parents=True, exist_ok=True)
             logger.info("Created directory %s", filedir.as_posix())
 
-        # Frame range.
-        frame_range = opsdata.get_cache_frame_range(context)
-
         # Begin progress update.
         context.window_manager.progress_begin(0, len(collections))
 
+        # Collections that didn't change since an earlier export.
+        reused: List[bpy.types.Collection] = []
+        if context.scene.cm.use_incremental_export:
+            reused = self._reuse_unchanged_caches(context, collections)
+        colls_to_export = [coll for coll in collections if coll not in reused]
+
+        succeeded: List[bpy.types.Collection] = []
+        failed: List[bpy.types.Collection] = []
+
+        if context.scene.cm.use_parallel_export:
+            # Workers only write cacheconfigs for the collections they export.
+            if reused:
+                CacheConfigFactory.gen_config_from_colls(
+                    context, reused, cacheconfig_path
+                )
+            if colls_to_export:
+                succeeded, failed = self._export_caches_parallel(
+                    context, colls_to_export, cacheconfig_path
+                )
+        else:
+            if colls_to_export:
+                succeeded, failed = self._export_caches(context, colls_to_export)
+
+            # Generate cacheconfig.
+            CacheConfigFactory.gen_config_from_colls(
+                context, collections, cacheconfig_path, failed
+            )
+
+        # End progress update.
+        context.window_manager.progress_update(len(collections))
+        context.window_manager.progress_end()
+
+        # Update cache version property to jump to latest version.
+        propsdata.update_cache_version_property(context)
+
+        # If it was do all reset after.
+        if self.do_all:
+            self.do_all = False
+
+        # Log.
+        self.report(
+            {"INFO"},
+            f"Exported {len(succeeded)} Collections | Reused: {len(reused)} "
+            f"| Failed: {len(failed)}.",
+        )
+
+        log_new_lines(1)
+        logger.info(
+            "-END- Exporting Cache of %s", ", ".join([c.name for c in succeeded])
+        )
+
+        # Clear deleted collections from list.
+        propsdata.rm_deleted_colls_from_list(context)
+
+        return {"FINISHED"}
+
+    def _reuse_unchanged_caches(
+        self, context: bpy.types.Context, collections: List[bpy.types.Collection]
+    ) -> List[bpy.types.Collection]:
+        """
+        Reuses the cachefiles of collections whose fingerprint is the same as in
+        the latest cacheconfig they are in. Returns the reused collections.
+        """
+        reused: List[bpy.types.Collection] = []
+        cacheconfig_paths = propsdata.get_cacheconfig_paths_up_to_version()
+        cacheconfigs: Dict[Path, cache.CacheConfig] = {}
+
+        for coll in collections:
+            coll_fingerprint = fingerprint.get_collection_fingerprint(context, coll)
+
+            # Only the latest export of the collection counts.
+            coll_dict = None
+            for path in cacheconfig_paths:
+                if path not in cacheconfigs:
+                    cacheconfigs[path] = cache.CacheConfig(path)
+                coll_dict = cacheconfigs[path].get_coll_variant(coll.name)
+                if coll_dict:
+                    break
+
+            if not coll_dict or coll_dict.get("fingerprint") != coll_fingerprint:
+                continue
+
+            source = Path(coll_dict["cachefile"])
+            if not source.exists():
+                continue
+
+            filepath = Path(propsdata.gen_cachepath_collection(coll, context))
+            opsdata.reuse_cachefile(source, filepath)
+            logger.info("%s didn't change since last export. Reused cache.", coll.name)
+            reused.append(coll)
+
+        return reused
+
+    def _export_caches(
+        self, context: bpy.types.Context, collections: List[bpy.types.Collection]
+    ) -> Tuple[List[bpy.types.Collection], List[bpy.types.Collection]]:
+
+        succeeded: List[bpy.types.Collection] = []
+        failed: List[bpy.types.Collection] = []
+
+        # Frame range.
+        frame_range = opsdata.get_cache_frame_range(context)
+
         # Create new scene.
         scene_orig = bpy.context.scene
         bpy.ops.scene.new(type="EMPTY")  # Changes active scene.
@@ -139,127 +397,15 @@ class CM_OT_cache_export(bpy.types.Operator):
                 cache_colls_active_exluded, False
             )
 
-            # Deselect all.
-            bpy.ops.object.select_all(action="DESELECT")
-
-            # Create object list to be exported.
-            object_list = cache.get_valid_cache_objects(coll)
-
-            # Mute drivers.
-            muted_vis_drivers = opsdata.disable_vis_drivers(object_list, modifiers=True)
-
-            # Ensure modifiers vis have render vis settings does not include MODIFIERS_KEEP.
-            mods_restore_vis_from_sync = opsdata.sync_modifier_vis_with_render_setting(
-                object_list
-            )
-
-            # Ensure MODIFIERS_KEEP are disabled for export (they will be enabled on import).
-            mods_restore_vis_from_keep = opsdata.config_modifiers_keep_state(
-                object_list, enable=False
-            )
-
-            # Apply modifier suffix visibility override (.nocache)
-            # > will set show_viewport, show_render to False.
-            mods_restore_vis_from_suffix = opsdata.apply_modifier_suffix_vis_override(
-                object_list, "EXPORT"
-            )
-
-            # Gen one list of tuples that contains each modifier with its original vis settings once.
-            mods_to_restore_vis = self._construct_mod_to_restore_vis_list(
-                mods_restore_vis_from_sync,
-                mods_restore_vis_from_keep,
-                mods_restore_vis_from_suffix,
-            )
-
-            # Ensure the all collections are visible during export
-            # otherwise object in it will not be exported.
-            colls_to_restore_vis = opsdata.set_item_vis(
-                list(opsdata.traverse_collection_tree(coll)), True
-            )
-
-            # Ensure that all objects are visible for export.
-            objs_to_restore_vis = opsdata.set_item_vis(object_list, True)
-
-            # Set instancing type of empties to None.
-            empties_to_restore = opsdata.set_instancing_type_of_empties(
-                object_list, "NONE"
-            )
-
-            # Select objects for bpy.ops.wm.alembic_export.
-            for obj in object_list:
-                obj.select_set(True)
-
-            # Filepath.
             filepath = Path(propsdata.gen_cachepath_collection(coll, context))
-            if filepath.exists():
-                logger.warning(
-                    "Filepath %s already exists. Will overwrite.", filepath.as_posix()
-                )
-
-            # Export.
-            try:
-                logger.info("Start alembic export of %s", coll.name)
-                # For each collection create separate alembic.
-                bpy.ops.wm.alembic_export(
-                    filepath=filepath.as_posix(),
-                    start=frame_range[0],
-                    end=frame_range[1],
-                    xsamples=context.scene.cm.xsamples,
-                    gsamples=context.scene.cm.gsamples,
-                    sh_open=context.scene.cm.sh_open,
-                    sh_close=context.scene.cm.sh_close,
-                    selected=True,
-                    visible_objects_only=False,
-                    flatten=True,
-                    uvs=True,
-                    packuv=True,
-                    normals=True,
-                    vcolors=False,
-                    face_sets=True,
-                    subdiv_schema=False,
-                    apply_subdiv=True,
-                    curves_as_mesh=True,
-                    use_instancing=True,
-                    global_scale=1,
-                    triangulate=False,
-                    quad_method="SHORTEST_DIAGONAL",
-                    ngon_method="BEAUTY",
-                    export_hair=False,
-                    export_particles=False,
-                    export_custom_properties=True,
-                    as_background_job=False,
-                    init_scene_frame_range=False,
-                )
-                logger.info("Alembic export of %s finished", coll.name)
-
-            except Exception as e:
-                logger.info("Failed to export %s", coll.name)
-                logger.exception(str(e))
+            if export_collection_cache(context, coll, filepath, frame_range):
+                succeeded.append(coll)
+            else:
                 failed.append(coll)
-                continue
-
-            # Restore instancing types of empties.
-            opsdata.restore_instancing_type(empties_to_restore)
-
-            # Hide objects again.
-            opsdata.restore_item_vis(objs_to_restore_vis)
-
-            # Hide colls again.
-            opsdata.restore_item_vis(colls_to_restore_vis)
-
-            # Restore modifier viewport vis / render vis.
-            opsdata.restore_modifier_vis(mods_to_restore_vis)
-
-            # Entmute driver.
-            opsdata.enable_muted_drivers(muted_vis_drivers)
 
             # Include other cache collections again.
             opsdata.restore_item_vis(excluded_colls_to_restore_vis)
 
-            # Success log for this collections.
-            logger.info("Exported %s to %s", coll.name, filepath.as_posix())
-            succeeded.append(coll)
-
         # Restore simplify state.
         opsdata.set_simplify(was_simplify)
 
@@ -271,35 +417,86 @@ class CM_OT_cache_export(bpy.types.Operator):
         logger.info("Remove tmp scene: %s", scene_tmp.name)
         bpy.data.scenes.remove(scene_tmp)
 
-        # Generate cacheconfig.
-        CacheConfigFactory.gen_config_from_colls(context, collections, cacheconfig_path)
+        return succeeded, failed
 
-        # End progress update.
-        context.window_manager.progress_update(len(collections))
-        context.window_manager.progress_end()
+    def _export_caches_parallel(
+        self,
+        context: bpy.types.Context,
+        collections: List[bpy.types.Collection],
+        cacheconfig_path: Path,
+    ) -> Tuple[List[bpy.types.Collection], List[bpy.types.Collection]]:
 
-        # Update cache version property to jump to latest version.
-        propsdata.update_cache_version_property(context)
-
-        # If it was do all reset after.
-        if self.do_all:
-            self.do_all = False
-
-        # Log.
-        self.report(
-            {"INFO"},
-            f"Exported {len(succeeded)} Collections | Failed: {len(failed)}.",
+        succeeded: List[bpy.types.Collection] = []
+        failed: List[bpy.types.Collection] = []
+        addon_prefs = prefs.addon_prefs_get(context)
+
+        # Workers open a copy of this file. Relative paths are remapped, as it
+        # is saved to another folder.
+        blendfile = Path(bpy.data.filepath)
+        tmpdir = Path(tempfile.mkdtemp(prefix="cm_export_"))
+        blendfile_copy = tmpdir / blendfile.name
+        jobs = [
+            workers.ExportJob(
+                coll,
+                Path(propsdata.gen_cachepath_collection(coll, context)),
+                addon_prefs.cachedir_root_path,
+                tmpdir,
+                idx,
+            )
+            for idx, coll in enumerate(collections)
+        ]
+        jobs_colls = dict(zip(jobs, collections))
+        worker_count = workers.get_worker_count(
+            len(jobs),
+            addon_prefs.export_workers_max,
+            int(addon_prefs.export_worker_memory * 1024**3),
         )
+        logger.info("Exporting %i collections with %i workers", len(jobs), worker_count)
 
-        log_new_lines(1)
-        logger.info(
-            "-END- Exporting Cache of %s", ", ".join([c.name for c in succeeded])
-        )
+        def on_job_done(job: workers.ExportJob) -> None:
+            coll = jobs_colls[job]
+            if job.succeeded:
+                succeeded.append(coll)
+                logger.info("Exported %s to %s", coll.name, job.filepath.as_posix())
+            else:
+                failed.append(coll)
+                logger.error(
+                    "Failed to export %s (exit code %i, status: %s):\n%s",
+                    coll.name,
+                    job.returncode,
+                    job.status or "none",
+                    job.read_log(),
+                )
+            done = len(succeeded) + len(failed)
+            logger.info("Finished %i/%i collections", done, len(jobs))
+            context.window_manager.progress_update(done)
 
-        # Clear deleted collections from list.
-        propsdata.rm_deleted_colls_from_list(context)
+        try:
+            bpy.ops.wm.save_as_mainfile(
+                filepath=blendfile_copy.as_posix(), copy=True, relative_remap=True
+            )
+            logger.info("Saved copy for export workers: %s", blendfile_copy.as_posix())
+            workers.run_export_jobs(blendfile_copy, jobs, worker_count, on_job_done)
+
+            # Combine cacheconfigs of the workers.
+            CacheConfigFactory.merge_configs(
+                context,
+                [
+                    cache.CacheConfig(job.cacheconfig_path)
+                    for job in jobs
+                    if job.succeeded
+                ],
+                cacheconfig_path,
+                succeeded,
+                failed,
+            )
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
 
-        return {"FINISHED"}
+        # Keep order of the cache collection list.
+        succeeded.sort(key=collections.index)
+        failed.sort(key=collections.index)
+        return succeeded, failed
 
     def invoke(self, context, event):
         filedir = Path(context.scene.cm.cachedir_path)
@@ -325,19 +522,6 @@ class CM_OT_cache_export(bpy.types.Operator):
             text="Overwrite?",
         )
 
-    def _construct_mod_to_restore_vis_list(
-        self, *args: List[Tuple[bpy.types.Modifier, bool, bool]]
-    ) -> List[Tuple[bpy.types.Modifier, bool, bool]]:
-
-        mods_to_restore_vis: List[Tuple[bpy.types.Modifier, bool, bool]] = []
-
-        for arg in args:
-            for mod, show_viewport, show_render in arg:
-                if mod not in [m for m, v, r in mods_to_restore_vis]:
-                    mods_to_restore_vis.append((mod, show_viewport, show_render))
-
-        return mods_to_restore_vis
-
 
 class CM_OT_cacheconfig_export(bpy.types.Operator):
     bl_idname = "cm.cacheconfig_export"
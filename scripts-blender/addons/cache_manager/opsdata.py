@@ -20,6 +20,7 @@
 
 import re
 import os
+import shutil
 from pathlib import Path
 from typing import List, Tuple, Generator, Dict, Union, Any, Optional
 
@@ -510,6 +511,29 @@ def get_layer_colls_from_colls(
     return layer_colls
 
 
+def get_unrelated_layer_colls(
+    context: bpy.types.Context, objects: List[bpy.types.Object]
+) -> List[bpy.types.LayerCollection]:
+    """
+    Returns topmost layer collections of the view layer that contain none of
+    objects. They can be excluded without affecting the evaluation of objects.
+    """
+    objects = set(objects)
+    layer_colls: List[bpy.types.LayerCollection] = []
+
+    def traverse(lcoll: bpy.types.LayerCollection) -> None:
+        for child in lcoll.children:
+            if child.exclude:
+                continue
+            if objects.isdisjoint(child.collection.all_objects):
+                layer_colls.append(child)
+            else:
+                traverse(child)
+
+    traverse(context.view_layer.layer_collection)
+    return layer_colls
+
+
 def set_layer_coll_exlcude(
     layer_collections: List[bpy.types.LayerCollection], exclude: bool
 ) -> List[Tuple[bpy.types.LayerCollection, bool]]:
@@ -596,6 +620,23 @@ def enable_muted_drivers(
     return muted_drivers
 
 
+def reuse_cachefile(source: Path, filepath: Path) -> None:
+    """
+    Makes the cachefile at source available at filepath. Uses a hard link if
+    possible, which doesn't take any disk space, a copy otherwise.
+    """
+    if source == filepath:
+        return
+
+    filepath.unlink(missing_ok=True)
+    try:
+        os.link(source, filepath)
+        logger.info("Linked %s to %s", source.as_posix(), filepath.as_posix())
+    except OSError:
+        shutil.copy2(source, filepath)
+        logger.info("Copied %s to %s", source.as_posix(), filepath.as_posix())
+
+
 def gen_abc_object_path(obj: bpy.types.Object) -> str:
     # If object is duplicated (multiple copies of the same object that get different cachses)
     # we have to kill the .001 postfix that gets created auto on duplication
@@ -39,6 +39,35 @@ class CM_AddonPreferences(bpy.types.AddonPreferences):
         update=propsdata.category_upate_version_model,
     )
 
+    use_columnar_cacheconfig: bpy.props.BoolProperty(  # type: ignore
+        name="Columnar Cacheconfig",
+        default=False,
+        description="Store the animation values of cacheconfigs as binary arrays in a .data file next to the json. "
+        "Loads a lot faster and is smaller for long shots",
+    )
+
+    use_isolated_sampling: bpy.props.BoolProperty(  # type: ignore
+        name="Isolate Cacheconfig Sampling",
+        default=True,
+        description="Exclude collections without cached objects while animation values are sampled for the cacheconfig. "
+        "Frames are evaluated faster when less is in the view layer",
+    )
+
+    export_workers_max: bpy.props.IntProperty(  # type: ignore
+        name="Max Export Workers",
+        default=0,
+        min=0,
+        description="Maximum number of background Blender processes of a parallel export. 0 uses the number of cores",
+    )
+
+    export_worker_memory: bpy.props.FloatProperty(  # type: ignore
+        name="Memory per Export Worker (GB)",
+        default=4.0,
+        min=0.0,
+        description="Memory a background Blender process of a parallel export needs. "
+        "Less workers are started if there isn't enough memory available. 0 disables the check",
+    )
+
     def draw(self, context: bpy.types.Context) -> None:
         layout = self.layout
         box = layout.box()
@@ -55,6 +84,11 @@ class CM_AddonPreferences(bpy.types.AddonPreferences):
                 icon="ERROR",
             )
 
+        box.row().prop(self, "use_columnar_cacheconfig")
+        box.row().prop(self, "use_isolated_sampling")
+        box.row().prop(self, "export_workers_max")
+        box.row().prop(self, "export_worker_memory")
+
     @property
     def cachedir_root_path(self) -> Optional[Path]:
         if not self.is_cachedir_root_valid:
@@ -143,6 +143,20 @@ class CM_property_group_scene(bpy.types.PropertyGroup):
         step=0.1,
     )
 
+    use_parallel_export: bpy.props.BoolProperty(
+        name="Parallel Export",
+        description="Export each cache collection in its own background Blender process. "
+        "Needs a saved blend file and more memory, but is a lot faster for many collections",
+        default=False,
+    )
+
+    use_incremental_export: bpy.props.BoolProperty(
+        name="Incremental Export",
+        description="Reuse the cache of the last export of collections whose animation, drivers, libraries and frame range didn't change. "
+        "Local edits that are not animated are not detected",
+        default=False,
+    )
+
     frame_handles_left: bpy.props.IntProperty(
         name="Frame Handles Start",
         description="Caching starts at the frame in of the scene minus the specified amount of frame handles",
@@ -20,7 +20,7 @@
 
 import os
 from pathlib import Path
-from typing import Any
+from typing import Any, List
 
 import bpy
 from bpy.app.handlers import persistent
@@ -128,6 +128,29 @@ def gen_cachepath_collection(
     return cachedir_path.joinpath(gen_cache_coll_filename(collection)).absolute()
 
 
+def get_cacheconfig_paths_up_to_version() -> List[Path]:
+    """
+    Returns existing cacheconfigs of the current and all earlier cache
+    versions, latest version first.
+    """
+    version_dir = get_cache_version_dir_path_str(None)
+    current_version = opsdata.get_version(bpy.context.scene.cm.cache_version, int)
+    if not version_dir or current_version is None or not Path(version_dir).exists():
+        return []
+
+    cacheconfigs = []
+    for path in Path(version_dir).iterdir():
+        version = opsdata.get_version(path.name, int)
+        if not path.is_dir() or version is None or version > current_version:
+            continue
+
+        cacheconfig = path / f"{_get_shot_name()}.cacheconfig.{path.name}.json"
+        if cacheconfig.exists():
+            cacheconfigs.append((version, cacheconfig))
+
+    return [cacheconfig for version, cacheconfig in sorted(cacheconfigs, reverse=True)]
+
+
 def get_cache_version_dir_path_str(self: Any) -> str:
     addon_prefs = addon_prefs_get(bpy.context)
 
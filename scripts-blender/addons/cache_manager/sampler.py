@@ -0,0 +1,102 @@
+# ***** BEGIN GPL LICENSE BLOCK *****
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# ***** END GPL LICENCE BLOCK *****
+#
+# (c) 2023, Blender Foundation
+
+import ast
+import functools
+import operator
+import re
+from typing import Any, Callable, Dict, Hashable, List, Tuple, Union
+
+import bpy
+import numpy as np
+
+# Matches the last subscript of a data path, like ["prop"] or [0].
+_SUBSCRIPT_PATTERN = re.compile(r'\[("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|\d+)\]$')
+
+
+def split_data_path(data_path: str) -> Tuple[str, Union[str, int], bool]:
+    """
+    Splits data_path in the path of the struct that holds the property and
+    the property itself. Last item of the returned tuple is True if the
+    property is accessed by subscript, like custom properties.
+    """
+    match = _SUBSCRIPT_PATTERN.search(data_path)
+    if match:
+        return data_path[: match.start()], ast.literal_eval(match.group(1)), True
+
+    struct_path, _, prop_name = data_path.rpartition(".")
+    return struct_path, prop_name, False
+
+
+def get_property_accessor(id_data: bpy.types.ID, data_path: str) -> Callable[[], Any]:
+    """
+    Resolves data_path once and returns a function that reads the current
+    value of the property.
+    """
+    struct_path, key, is_subscript = split_data_path(data_path)
+    struct = id_data.path_resolve(struct_path) if struct_path else id_data
+
+    if is_subscript:
+        return functools.partial(operator.getitem, struct, key)
+    return functools.partial(getattr, struct, key)
+
+
+class DataPathSampler:
+    """
+    Reads the values of a fixed set of data paths once per frame into arrays
+    that are allocated up front. Data paths are only resolved when added.
+    """
+
+    def __init__(self, frame_count: int):
+        self.frame_count = frame_count
+        self._keys: List[Hashable] = []
+        self._accessors: List[Callable[[], Any]] = []
+        self._buffers: List[Union[np.ndarray, List[Any]]] = []
+
+    def add(self, key: Hashable, id_data: bpy.types.ID, data_path: str) -> None:
+        accessor = get_property_accessor(id_data, data_path)
+
+        # Shape and type of the property don't change between frames.
+        value = accessor()
+        if isinstance(value, str):
+            buffer = [value] * self.frame_count
+        else:
+            value = np.asarray(value)
+            buffer = np.empty((self.frame_count,) + value.shape, dtype=value.dtype)
+
+        self._keys.append(key)
+        self._accessors.append(accessor)
+        self._buffers.append(buffer)
+
+    def sample(self, frame_index: int) -> None:
+        """
+        Stores the current value of all data paths at frame_index.
+        """
+        for accessor, buffer in zip(self._accessors, self._buffers):
+            buffer[frame_index] = accessor()
+
+    def get_values(self) -> Dict[Hashable, List[Any]]:
+        """
+        Returns values of each data path as list with one entry per frame.
+        """
+        return {
+            key: buffer if isinstance(buffer, list) else buffer.tolist()
+            for key, buffer in zip(self._keys, self._buffers)
+        }
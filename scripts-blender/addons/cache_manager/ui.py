@@ -305,6 +305,10 @@ class CM_PT_vi3d_advanced(bpy.types.Panel):
         col.prop(context.scene.cm, "xsamples")
         col.prop(context.scene.cm, "gsamples")
 
+        # Parallel export.
+        box.row().prop(context.scene.cm, "use_parallel_export")
+        box.row().prop(context.scene.cm, "use_incremental_export")
+
 
 class CM_UL_collection_cache_list_export(bpy.types.UIList):
     def draw_item(
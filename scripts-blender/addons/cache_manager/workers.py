@@ -0,0 +1,325 @@
+# ***** BEGIN GPL LICENSE BLOCK *****
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# ***** END GPL LICENCE BLOCK *****
+#
+# (c) 2023, Blender Foundation
+
+"""
+Exports cache collections in parallel, each one in its own background
+Blender process that opens a copy of the current file.
+
+A worker exports the alembic cache of one collection and writes a
+cacheconfig for it. The cacheconfigs of all workers are merged afterwards.
+"""
+
+import argparse
+import ctypes
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import bpy
+import addon_utils
+
+from cache_manager import cmglobals
+from cache_manager.logger import LoggerFactory
+
+logger = LoggerFactory.getLogger(__name__)
+
+
+def get_available_memory() -> Optional[int]:
+    """
+    Returns available physical memory in bytes, None if it can't be
+    determined on this platform.
+    """
+    if sys.platform == "win32":
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+        if not ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return None
+        return status.ullAvailPhys
+
+    # MemAvailable includes caches that can be freed, unlike free pages.
+    try:
+        with open("/proc/meminfo") as file:
+            for line in file:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def get_worker_count(job_count: int, max_workers: int, memory_per_worker: int) -> int:
+    """
+    Returns how many workers can run at the same time. Limited by max_workers,
+    or the number of cores if 0, and by the available memory.
+    """
+    count = max_workers or os.cpu_count() or 1
+
+    available_memory = get_available_memory()
+    if available_memory is not None and memory_per_worker > 0:
+        count = min(count, available_memory // memory_per_worker)
+
+    return max(1, min(count, job_count))
+
+
+def get_library_path(library: bpy.types.Library) -> str:
+    """
+    Returns normalized absolute path of library. Relative library paths
+    change when the file is saved to another folder, this doesn't.
+    """
+    return os.path.normpath(bpy.path.abspath(library.filepath, library=library.parent))
+
+
+def find_collection(name: str, library_path: str) -> bpy.types.Collection:
+    """
+    Returns collection with given name of the library at library_path, a local
+    one if library_path is empty.
+    """
+    for coll in bpy.data.collections:
+        if coll.name != name:
+            continue
+        if not library_path and not coll.library:
+            return coll
+        if coll.library and get_library_path(coll.library) == library_path:
+            return coll
+    raise KeyError(f"Collection {name} of library '{library_path}' not found")
+
+
+class ExportJob:
+    """
+    Exports one collection in a background Blender process.
+    """
+
+    def __init__(
+        self,
+        coll: bpy.types.Collection,
+        filepath: Path,
+        cachedir_root: Path,
+        tmpdir: Path,
+        index: int,
+    ):
+        self.coll_name = coll.name
+        self.library = get_library_path(coll.library) if coll.library else ""
+        self.filepath = filepath
+        self.cachedir_root = cachedir_root
+        self.cacheconfig_path = tmpdir / f"{index:03}.cacheconfig.json"
+        self.log_path = tmpdir / f"{index:03}.log"
+        self.returncode: Optional[int] = None
+        self.status = ""
+        self._process: Optional[subprocess.Popen] = None
+        self._log_file = None
+
+    @property
+    def succeeded(self) -> bool:
+        return (
+            self.returncode == 0
+            and self.status == cmglobals.WORKER_STATUS_DONE
+            and self.cacheconfig_path.exists()
+        )
+
+    def get_command(self, blendfile: Path) -> List[str]:
+        return [
+            bpy.app.binary_path,
+            "--background",
+            blendfile.as_posix(),
+            "--python-exit-code",
+            "1",
+            "--python-expr",
+            "from cache_manager import workers; workers.main()",
+            "--",
+            "--collection",
+            self.coll_name,
+            "--library",
+            self.library,
+            "--filepath",
+            self.filepath.as_posix(),
+            "--cachedir-root",
+            self.cachedir_root.as_posix(),
+            "--cacheconfig",
+            self.cacheconfig_path.as_posix(),
+        ]
+
+    def start(self, blendfile: Path) -> None:
+        logger.info("Start export worker for %s", self.coll_name)
+        self._log_file = open(self.log_path, "wb")
+        self._process = subprocess.Popen(
+            self.get_command(blendfile),
+            stdin=subprocess.DEVNULL,
+            stdout=self._log_file,
+            stderr=subprocess.STDOUT,
+        )
+
+    def poll(self) -> Optional[int]:
+        """
+        Returns exit code of the worker, None if it is still running.
+        """
+        self.returncode = self._process.poll()
+        if self.returncode is not None:
+            self._close_log()
+            self.status = self.read_status()
+        return self.returncode
+
+    def kill(self) -> None:
+        if self._process and self._process.poll() is None:
+            self._process.kill()
+            self.returncode = self._process.wait()
+        self._close_log()
+
+    def read_log(self, max_lines: int = cmglobals.WORKER_LOG_LINES) -> str:
+        """
+        Returns the last lines the worker printed.
+        """
+        if not self.log_path.exists():
+            return ""
+        lines = self.log_path.read_text(errors="replace").splitlines()
+        return "\n".join(lines[-max_lines:])
+
+    def read_status(self) -> str:
+        """
+        Returns the exit state the worker printed last, empty if it printed
+        none, e.g. because it crashed.
+        """
+        if not self.log_path.exists():
+            return ""
+        status = ""
+        for line in self.log_path.read_text(errors="replace").splitlines():
+            if line.startswith(cmglobals.WORKER_STATUS_PREFIX):
+                status = line[len(cmglobals.WORKER_STATUS_PREFIX) :].strip()
+        return status
+
+    def _close_log(self) -> None:
+        if self._log_file:
+            self._log_file.close()
+            self._log_file = None
+
+
+def run_export_jobs(
+    blendfile: Path,
+    jobs: List[ExportJob],
+    worker_count: int,
+    on_job_done: Callable[[ExportJob], None],
+) -> None:
+    """
+    Runs jobs with at most worker_count workers at the same time. Blocks until
+    all are done, on_job_done is called for each job when it finishes.
+    """
+    pending = list(jobs)
+    running: List[ExportJob] = []
+
+    try:
+        while pending or running:
+            while pending and len(running) < worker_count:
+                job = pending.pop(0)
+                job.start(blendfile)
+                running.append(job)
+
+            for job in running.copy():
+                if job.poll() is None:
+                    continue
+                running.remove(job)
+                on_job_done(job)
+
+            time.sleep(cmglobals.WORKER_POLL_INTERVAL)
+    finally:
+        # Don't leave workers behind if this got interrupted.
+        for job in running:
+            job.kill()
+
+
+def main() -> None:
+    """
+    Entry point of a worker, exports the collection passed on the command line.
+    """
+    argv = sys.argv[sys.argv.index("--") + 1 :]
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--collection", required=True)
+    parser.add_argument("--library", default="")
+    parser.add_argument("--filepath", required=True, type=Path)
+    parser.add_argument("--cachedir-root", required=True, type=Path)
+    parser.add_argument("--cacheconfig", required=True, type=Path)
+    args = parser.parse_args(argv)
+
+    try:
+        _export(args)
+    except Exception as exc:
+        print(f"{cmglobals.WORKER_STATUS_PREFIX}failed: {exc}", flush=True)
+        raise
+
+    print(f"{cmglobals.WORKER_STATUS_PREFIX}{cmglobals.WORKER_STATUS_DONE}", flush=True)
+
+
+def _export(args: argparse.Namespace) -> None:
+    """
+    Exports the collection and writes its cacheconfig. Libs entries of it
+    are generated again on merge, as they depend on the path of the file.
+    """
+    # The addon might only be enabled in the session that started the worker.
+    if not addon_utils.check(__package__)[1]:
+        addon_utils.enable(__package__, default_set=False)
+
+    from cache_manager import cache, ops, opsdata, prefs
+    from cache_manager.cache import CacheConfigFactory
+
+    context = bpy.context
+
+    # Isn't saved in the preferences, but the cacheconfig paths depend on it.
+    prefs.addon_prefs_get(context).cachedir_root = args.cachedir_root.as_posix()
+    coll = find_collection(args.collection, args.library)
+    frame_range = opsdata.get_cache_frame_range(context)
+    opsdata.set_simplify(False)
+
+    # Objects need to be in the view layer to be exported, the collection
+    # might be excluded in it. This is a copy of the file, so nothing of the
+    # following needs to be restored, except what the cacheconfig needs.
+    if coll.name not in context.scene.collection.children:
+        context.scene.collection.children.link(coll)
+
+    # Exclude everything else, so only coll is evaluated during the export.
+    lcolls_to_restore = opsdata.set_layer_coll_exlcude(
+        opsdata.get_unrelated_layer_colls(context, cache.get_valid_cache_objects(coll)),
+        True,
+    )
+    if not ops.export_collection_cache(context, coll, args.filepath, frame_range):
+        raise RuntimeError(f"Failed to export {coll.name}")
+
+    # Cameras of the cacheconfig can be in other collections.
+    opsdata.restore_layer_coll_exlude(lcolls_to_restore)
+
+    CacheConfigFactory.gen_config_from_colls(context, [coll], args.cacheconfig)
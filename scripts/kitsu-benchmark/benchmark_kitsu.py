@@ -0,0 +1,232 @@
+# ***** BEGIN GPL LICENSE BLOCK *****
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# ***** END GPL LICENCE BLOCK *****
+#
+# (c) 2023, Blender Foundation
+
+"""
+Times the Kitsu code paths of blender_kitsu against a mock Kitsu server.
+
+Has to run inside Blender, as blender_kitsu imports bpy:
+
+    blender -b --factory-startup --python benchmark_kitsu.py -- --shots 50
+
+A mock server is started in the same process, unless --host points to a
+running one. Results can be written to JSON and compared with an earlier run.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Blender doesn't add the folder of the script to the module search path.
+sys.path.insert(0, Path(__file__).parent.as_posix())
+import mock_kitsu
+
+REPO_ROOT_DIR = Path(__file__).parent.parent.parent
+ADDONS_DIR = REPO_ROOT_DIR.joinpath("scripts-blender", "addons")
+
+
+class Benchmark:
+    """
+    Calls func a number of rounds and keeps the wall time of each round.
+    setup is called before every round and isn't timed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        setup: Optional[Callable[[], None]] = None,
+    ):
+        self.name = name
+        self.func = func
+        self.setup = setup
+        self.times: List[float] = []
+
+    def run(self, rounds: int) -> None:
+        for _ in range(rounds):
+            if self.setup:
+                self.setup()
+            start = time.perf_counter()
+            self.func()
+            self.times.append(time.perf_counter() - start)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "min": min(self.times),
+            "median": statistics.median(self.times),
+            "mean": statistics.mean(self.times),
+            "rounds": len(self.times),
+        }
+
+
+def create_benchmarks() -> List[Benchmark]:
+    from blender_kitsu import background, gazu
+    from blender_kitsu.types import Project, ProjectIndex, Shot
+    from blender_kitsu.sqe import batch, checksqe, pull
+    from blender_kitsu.sqe.ops import KITSU_OT_sqe_pull_edit
+
+    project = Project.from_dict(gazu.project.all_projects()[0])
+    project_dict = asdict(project)
+    shot_dicts = gazu.shot.all_shots_for_project(project_dict)
+    shots = Shot.from_dicts(shot_dicts)
+    job = background.BackgroundJob("benchmark", lambda job: None)
+
+    def clear_cache() -> None:
+        gazu.cache.clear_all()
+
+    def warm_cache() -> None:
+        gazu.cache.enable()
+        project.get_shots_all()
+
+    def pull_edit_placement() -> None:
+        # Placement of strips of Pull Edit, without creating strips.
+        pull.edit_placement(shots, 1, checksqe.OccupiedRanges(), {})
+
+    push_round = 0
+
+    def push_shot_meta() -> None:
+        # Every round changes all shots, so each one is pushed.
+        nonlocal push_round
+        push_round += 1
+        changes_list = [
+            {"id": shot.id, "description": f"benchmark {push_round}"} for shot in shots
+        ]
+        for _, _, exc in batch.push_shot_meta_changes(changes_list):
+            if exc:
+                raise exc
+
+    return [
+        Benchmark("get_shots_all (cache miss)", project.get_shots_all, clear_cache),
+        Benchmark("get_shots_all (cache hit)", project.get_shots_all, warm_cache),
+        Benchmark("Shot.from_dicts", lambda: Shot.from_dicts(shot_dicts)),
+        Benchmark(
+            "Shot.from_dict",
+            lambda: [Shot.from_dict(shot_dict) for shot_dict in shot_dicts],
+        ),
+        Benchmark("ProjectIndex load", lambda: ProjectIndex(project), clear_cache),
+        Benchmark(
+            "Pull Edit fetch",
+            lambda: KITSU_OT_sqe_pull_edit._fetch_edit(job, project),
+            clear_cache,
+        ),
+        Benchmark("Pull Edit placement", pull_edit_placement),
+        Benchmark("Push shot meta", push_shot_meta),
+    ]
+
+
+def print_results(
+    benchmarks: List[Benchmark], baseline: Optional[Dict[str, Any]] = None
+) -> None:
+    header = f"{'Benchmark':<30} {'min':>10} {'median':>10} {'mean':>10}"
+    if baseline:
+        header += f" {'vs base':>10}"
+    print(header)
+    print("-" * len(header))
+
+    for benchmark in benchmarks:
+        result = benchmark.as_dict()
+        line = (
+            f"{benchmark.name:<30} {result['min'] * 1000:>8.2f}ms "
+            f"{result['median'] * 1000:>8.2f}ms {result['mean'] * 1000:>8.2f}ms"
+        )
+        base = (baseline or {}).get("results", {}).get(benchmark.name)
+        if base:
+            line += f" {result['median'] / base['median']:>9.2f}x"
+        print(line)
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", help="URL of a running (mock) Kitsu server")
+    parser.add_argument("--email", default="bench@example.com")
+    parser.add_argument("--password", default="benchmark")
+    parser.add_argument("--sequences", type=int, default=10)
+    parser.add_argument("--shots", type=int, default=20, help="Shots per sequence")
+    parser.add_argument("--tasks", type=int, default=4, help="Tasks per shot")
+    parser.add_argument("--assets", type=int, default=50)
+    parser.add_argument("--fixture", type=Path, help="Recorded production fixture")
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--filter", default="", help="Only run benchmarks containing this text"
+    )
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    parser.add_argument(
+        "--compare", type=Path, help="Results of an earlier run to compare to"
+    )
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    # Arguments after '--' are for this script, the rest are Blender's.
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    args = parse_args(argv)
+
+    sys.path.insert(0, ADDONS_DIR.as_posix())
+    from blender_kitsu import gazu
+
+    server = None
+    host = args.host
+    if not host:
+        if args.fixture:
+            fixture = json.loads(args.fixture.read_text())
+        else:
+            fixture = mock_kitsu.generate_fixture(
+                args.sequences, args.shots, args.tasks, args.assets
+            )
+        server = mock_kitsu.start_server(
+            fixture, latency=args.latency, jitter=args.jitter
+        )
+        host = server.url
+        print(f"Started mock Kitsu on {host}")
+
+    gazu.client.set_host(host)
+    gazu.log_in(args.email, args.password)
+    gazu.cache.enable()
+
+    benchmarks = [b for b in create_benchmarks() if args.filter in b.name]
+    for benchmark in benchmarks:
+        print(f"Running {benchmark.name}")
+        benchmark.run(args.rounds)
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print()
+    print_results(benchmarks, baseline)
+
+    if args.json:
+        results = {
+            "host": host if args.host else "mock",
+            "args": {k: str(v) for k, v in vars(args).items()},
+            "results": {b.name: b.as_dict() for b in benchmarks},
+        }
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"Wrote results to {args.json}")
+
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,629 @@
+# ***** BEGIN GPL LICENSE BLOCK *****
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# ***** END GPL LICENCE BLOCK *****
+#
+# (c) 2023, Blender Foundation
+
+"""
+Local stand-in for a Kitsu (Zou) server, to measure blender_kitsu offline.
+
+Serves a synthetic production of N sequences with M shots and K tasks each, or
+a fixture recorded from a real server, with a configurable latency per request.
+Only the parts of the Zou API that blender_kitsu uses are implemented.
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+UUID_NAMESPACE = uuid.UUID("6c6b1f0a-6d0b-4b6e-9c55-6b6974737500")
+TIMESTAMP = "2023-01-01T00:00:00"
+
+TASK_TYPE_NAMES = ["Layout", "Animation", "Lighting", "Rendering", "FX", "Comp"]
+TASK_STATUSES = [("Todo", "todo"), ("WIP", "wip"), ("Done", "done")]
+ASSET_TYPE_NAMES = ["Character", "Prop", "Set"]
+
+# Query parameters that are not filters on entity fields.
+IGNORED_PARAMS = {"page", "page_size", "relations", "limit", "after", "before"}
+
+# Collections that are looked up for the 'entities' routes of Zou.
+ENTITY_COLLECTIONS = ["shots", "sequences", "assets"]
+
+# Matching event names of changed collections, used by the event listener.
+EVENT_NAMES = {"shots": "shot", "sequences": "sequence", "assets": "asset"}
+
+Fixture = Dict[str, List[Dict[str, Any]]]
+
+
+def make_id(kind: str, index: int) -> str:
+    """
+    Returns an id that is the same for every run, so benchmark results of the
+    same fixture can be compared.
+    """
+    return str(uuid.uuid5(UUID_NAMESPACE, f"{kind}:{index}"))
+
+
+def generate_fixture(
+    sequences: int, shots: int, tasks: int, assets: int = 0
+) -> Fixture:
+    """
+    Creates a production with the given number of sequences, shots per sequence,
+    tasks per shot and assets.
+    """
+    person = {
+        "id": make_id("person", 0),
+        "type": "Person",
+        "first_name": "Bench",
+        "last_name": "Mark",
+        "full_name": "Bench Mark",
+        "email": "bench@example.com",
+        "role": "admin",
+        "active": True,
+    }
+    project = {
+        "id": make_id("project", 0),
+        "type": "Project",
+        "name": "Benchmark",
+        "code": "bench",
+        "fps": "24",
+        "resolution": "2048x858",
+        "production_type": "short",
+        "project_status_name": "Open",
+        "created_at": TIMESTAMP,
+        "updated_at": TIMESTAMP,
+        "data": {},
+    }
+    task_statuses = [
+        {
+            "id": make_id("task-status", i),
+            "type": "TaskStatus",
+            "name": name,
+            "short_name": short_name,
+            "color": "#f5f5f5",
+            "is_default": i == 0,
+            "is_done": short_name == "done",
+            "created_at": TIMESTAMP,
+            "updated_at": TIMESTAMP,
+        }
+        for i, (name, short_name) in enumerate(TASK_STATUSES)
+    ]
+    task_types = [
+        {
+            "id": make_id("task-type", i),
+            "type": "TaskType",
+            "name": TASK_TYPE_NAMES[i % len(TASK_TYPE_NAMES)]
+            + ("" if i < len(TASK_TYPE_NAMES) else f" {i}"),
+            "short_name": TASK_TYPE_NAMES[i % len(TASK_TYPE_NAMES)][:4].lower(),
+            "for_entity": "Shot",
+            "for_shots": True,
+            "priority": i,
+            "created_at": TIMESTAMP,
+            "updated_at": TIMESTAMP,
+        }
+        for i in range(max(tasks, 1))
+    ]
+    asset_types = [
+        {
+            "id": make_id("asset-type", i),
+            "type": "AssetType",
+            "name": name,
+            "created_at": TIMESTAMP,
+            "updated_at": TIMESTAMP,
+        }
+        for i, name in enumerate(ASSET_TYPE_NAMES)
+    ]
+
+    fixture: Fixture = {
+        "persons": [person],
+        "projects": [project],
+        "task-status": task_statuses,
+        "task-types": task_types,
+        "asset-types": asset_types,
+        "sequences": [],
+        "shots": [],
+        "assets": [],
+        "tasks": [],
+    }
+
+    frame = 101
+    for seq_index in range(sequences):
+        sequence_name = f"{(seq_index + 1) * 10:03}"
+        sequence = {
+            "id": make_id("sequence", seq_index),
+            "type": "Sequence",
+            "name": sequence_name,
+            "project_id": project["id"],
+            "parent_id": None,
+            "description": "",
+            "data": {"color": [0.5, 0.5, 0.5]},
+            "created_at": TIMESTAMP,
+            "updated_at": TIMESTAMP,
+        }
+        fixture["sequences"].append(sequence)
+
+        for shot_index in range(shots):
+            index = seq_index * shots + shot_index
+            nb_frames = 24 + (index * 7) % 96
+            shot = {
+                "id": make_id("shot", index),
+                "type": "Shot",
+                "name": f"{sequence_name}_{(shot_index + 1) * 10:04}_A",
+                "project_id": project["id"],
+                "project_name": project["name"],
+                "parent_id": sequence["id"],
+                "sequence_id": sequence["id"],
+                "sequence_name": sequence_name,
+                "description": "",
+                "nb_frames": nb_frames,
+                "frame_in": str(frame),
+                "frame_out": str(frame + nb_frames - 1),
+                "fps": project["fps"],
+                "canceled": False,
+                "data": {
+                    "frame_in": frame,
+                    "frame_out": frame + nb_frames - 1,
+                    "3d_start": 101,
+                },
+                "created_at": TIMESTAMP,
+                "updated_at": TIMESTAMP,
+            }
+            fixture["shots"].append(shot)
+            frame += nb_frames
+
+            for task_index in range(tasks):
+                task_type = task_types[task_index]
+                fixture["tasks"].append(
+                    {
+                        "id": make_id("task", index * tasks + task_index),
+                        "type": "Task",
+                        "name": "main",
+                        "project_id": project["id"],
+                        "entity_id": shot["id"],
+                        "entity_name": shot["name"],
+                        "task_type_id": task_type["id"],
+                        "task_type_name": task_type["name"],
+                        "task_status_id": task_statuses[0]["id"],
+                        "assignees": [person["id"]],
+                        "data": {},
+                        "created_at": TIMESTAMP,
+                        "updated_at": TIMESTAMP,
+                    }
+                )
+
+    for asset_index in range(assets):
+        asset_type = asset_types[asset_index % len(asset_types)]
+        fixture["assets"].append(
+            {
+                "id": make_id("asset", asset_index),
+                "type": "Asset",
+                "name": f"{asset_type['name']}{asset_index:03}",
+                "project_id": project["id"],
+                "entity_type_id": asset_type["id"],
+                "asset_type_name": asset_type["name"],
+                "description": "",
+                "data": {},
+                "created_at": TIMESTAMP,
+                "updated_at": TIMESTAMP,
+            }
+        )
+
+    return fixture
+
+
+class MockKitsu:
+    """
+    In-memory Zou data store that answers API requests.
+    """
+
+    def __init__(self, fixture: Fixture):
+        self.collections: Fixture = {
+            name: list(items) for name, items in fixture.items()
+        }
+        for name in ["persons", "comments", "preview-files", "events"]:
+            self.collections.setdefault(name, [])
+        self._by_id: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        for name, items in self.collections.items():
+            for item in items:
+                if "id" in item:
+                    self._by_id[item["id"]] = (name, item)
+        self._lock = threading.Lock()
+
+    @property
+    def user(self) -> Dict[str, Any]:
+        persons = self.collections["persons"]
+        if persons:
+            return persons[0]
+        return {"id": make_id("person", 0), "full_name": "Bench Mark"}
+
+    def get(self, id: str, collection: Optional[str] = None) -> Dict[str, Any]:
+        name, item = self._by_id.get(id, (None, None))
+        if item is None or (collection and name != collection):
+            raise KeyError(id)
+        return item
+
+    def create(self, collection: str, values: Dict[str, Any]) -> Dict[str, Any]:
+        item = {
+            "id": str(uuid.uuid4()),
+            "created_at": self._now(),
+            "updated_at": self._now(),
+            "data": {},
+        }
+        item.update(values)
+        self.collections.setdefault(collection, []).append(item)
+        self._by_id[item["id"]] = (collection, item)
+        self._add_event(collection, "new", item)
+        return item
+
+    def update(self, id: str, values: Dict[str, Any]) -> Dict[str, Any]:
+        collection, item = self._by_id[id]
+        item.update({k: v for k, v in values.items() if k != "id"})
+        item["updated_at"] = self._now()
+        self._add_event(collection, "update", item)
+        return item
+
+    def remove(self, id: str) -> None:
+        collection, item = self._by_id.pop(id)
+        self.collections[collection].remove(item)
+        self._add_event(collection, "delete", item)
+
+    def _now(self) -> str:
+        return datetime.datetime.utcnow().isoformat()
+
+    def _add_event(self, collection: str, action: str, item: Dict[str, Any]) -> None:
+        event_name = EVENT_NAMES.get(collection)
+        if not event_name:
+            return
+        self.collections["events"].append(
+            {
+                "id": str(uuid.uuid4()),
+                "name": f"{event_name}:{action}",
+                "created_at": self._now(),
+                "user_id": self.user["id"],
+                "project_id": item.get("project_id"),
+                "data": {f"{event_name}_id": item["id"]},
+            }
+        )
+
+    def query(
+        self, collection: str, params: Dict[str, str], **filters: Any
+    ) -> List[Dict[str, Any]]:
+        if collection == "entities":
+            items = [
+                item for name in ENTITY_COLLECTIONS for item in self.collections[name]
+            ]
+        else:
+            items = self.collections.get(collection, [])
+
+        filters.update({k: v for k, v in params.items() if k not in IGNORED_PARAMS})
+        return [
+            item
+            for item in items
+            if all(k not in item or str(item[k]) == str(v) for k, v in filters.items())
+        ]
+
+    def get_children(
+        self, parent: str, parent_id: str, child: str, params: Dict[str, str]
+    ) -> List[Dict[str, Any]]:
+        if child in ("task-types", "task-status", "asset-types"):
+            return self.query(child, params)
+        if child == "comments":
+            return self.query(child, params, object_id=parent_id)
+        if parent == "projects":
+            return self.query(child, params, project_id=parent_id)
+        if child == "tasks":
+            return self.query(child, params, entity_id=parent_id)
+        return self.query(child, params, parent_id=parent_id)
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        params: Dict[str, str],
+        body: Any,
+    ) -> Tuple[int, Any]:
+        """
+        Returns status code and JSON response of a request.
+        """
+        parts = [p for p in path.split("/") if p]
+        if parts and parts[0] == "api":
+            parts = parts[1:]
+
+        with self._lock:
+            try:
+                return self._route(method, parts, params, body)
+            except KeyError as e:
+                return 404, {"message": f"Not found: {e}"}
+
+    def _route(
+        self, method: str, parts: List[str], params: Dict[str, str], body: Any
+    ) -> Tuple[int, Any]:
+        if not parts:
+            return 200, {"api": "Zou", "version": "mock"}
+
+        if parts[0] == "auth":
+            if parts[1:] == ["login"]:
+                return 200, {
+                    "login": True,
+                    "user": self.user,
+                    "access_token": "mock-access-token",
+                    "refresh_token": "mock-refresh-token",
+                }
+            if parts[1:] == ["authenticated"]:
+                return 200, {"authenticated": True, "user": self.user}
+            return 200, {}
+
+        if parts[0] == "pictures":
+            # Preview uploads, the file itself is discarded.
+            return 200, self.get(parts[-1])
+
+        if parts[0] == "actions":
+            return self._route_action(method, parts[1:], body)
+
+        if parts[0] != "data":
+            return 404, {"message": "Unknown route"}
+        parts = parts[1:]
+
+        if parts == ["events", "last"]:
+            events = self.collections["events"]
+            after = params.get("after")
+            if after:
+                events = [e for e in events if e["created_at"] > after]
+            return 200, events[-int(params.get("page_size", 100)) :]
+
+        # Tasks and entities of the logged in user.
+        if parts[0] == "user":
+            parts = parts[1:]
+            if parts == ["tasks"]:
+                return 200, [
+                    task
+                    for task in self.collections["tasks"]
+                    if self.user["id"] in task.get("assignees", [])
+                ]
+            if parts[:2] == ["projects", "open"]:
+                return 200, self.collections["projects"]
+            if parts and parts[-1] in ("done-tasks", "context"):
+                return 200, []
+
+        # Zou lists e.g. shots of all projects on 'data/shots/all'.
+        if len(parts) == 2 and parts[1] == "all":
+            parts = parts[:1]
+
+        if len(parts) == 1:
+            if method == "POST":
+                return 201, self.create(parts[0], body)
+            return 200, self.query(parts[0], params)
+
+        if len(parts) == 2:
+            if method == "PUT":
+                return 200, self.update(parts[1], body)
+            if method == "DELETE":
+                self.remove(parts[1])
+                return 204, None
+            collection = None if parts[0] == "entities" else parts[0]
+            return 200, self.get(parts[1], collection)
+
+        parent, parent_id, child = parts[0], parts[1], parts[-1]
+        if child == "casting":
+            return 200, []
+        if method == "POST":
+            values = dict(body)
+            if parent == "projects":
+                values.setdefault("project_id", parent_id)
+                # Zou stores the sequence of new shots as their parent.
+                if "sequence_id" in values:
+                    values.setdefault("parent_id", values["sequence_id"])
+            else:
+                values.setdefault("parent_id", parent_id)
+            return 201, self.create(child, values)
+        return 200, self.get_children(parent, parent_id, child, params)
+
+    def _route_action(
+        self, method: str, parts: List[str], body: Any
+    ) -> Tuple[int, Any]:
+        if parts[:1] == ["tasks"] and parts[-1] == "comment":
+            task = self.get(parts[1], "tasks")
+            comment = self.create(
+                "comments",
+                {
+                    "object_id": task["id"],
+                    "task_status_id": body.get("task_status_id"),
+                    "text": body.get("comment", ""),
+                    "person_id": self.user["id"],
+                },
+            )
+            if body.get("task_status_id"):
+                task["task_status_id"] = body["task_status_id"]
+            return 201, comment
+
+        if parts[:1] == ["tasks"] and parts[-1] == "add-preview":
+            preview_file = self.create(
+                "preview-files",
+                {"task_id": parts[1], "comment_id": parts[3], "revision": 1},
+            )
+            return 201, preview_file
+
+        # Setting main previews and other actions don't change anything that
+        # blender_kitsu reads back.
+        return 200, {}
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    server: "MockKitsuServer"
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self) -> None:
+        self.server.delay()
+
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        body = self._read_body()
+
+        status, response = self.server.kitsu.handle(
+            self.command, url.path, params, body
+        )
+        payload = b"" if response is None else json.dumps(response).encode()
+
+        # Answer conditional requests like a caching proxy in front of Zou would.
+        etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+        if self.command == "GET" and self.headers.get("If-None-Match") == etag:
+            status, payload = 304, b""
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if self.command == "GET":
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    def _read_body(self) -> Any:
+        length = int(self.headers.get("Content-Length") or 0)
+        data = self.rfile.read(length) if length else b""
+        if not data:
+            return {}
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            return json.loads(data)
+        # Multipart uploads are only counted, not parsed.
+        return {"size": len(data)}
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = _handle
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class MockKitsuServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        kitsu: MockKitsu,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        verbose: bool = False,
+    ):
+        super().__init__(address, RequestHandler)
+        self.kitsu = kitsu
+        self.latency = latency
+        self.jitter = jitter
+        self.verbose = verbose
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def delay(self) -> None:
+        """
+        Simulates network and server time of a request.
+        """
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+
+def start_server(
+    fixture: Fixture,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+) -> MockKitsuServer:
+    """
+    Starts a mock server on a daemon thread. Port 0 picks a free port, the
+    actual address is in server.url.
+    """
+    server = MockKitsuServer((host, port), MockKitsu(fixture), latency, jitter)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sequences", type=int, default=10)
+    parser.add_argument("--shots", type=int, default=20, help="Shots per sequence")
+    parser.add_argument("--tasks", type=int, default=4, help="Tasks per shot")
+    parser.add_argument("--assets", type=int, default=50)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added to every request"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Random seconds added on top"
+    )
+    parser.add_argument(
+        "--fixture",
+        type=Path,
+        help="JSON file with a list of entities per collection, used instead of "
+        "a generated production",
+    )
+    parser.add_argument(
+        "--dump", type=Path, help="Write the generated production to a JSON file"
+    )
+    parser.add_argument("--verbose", action="store_true", help="Log all requests")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+
+    if args.fixture:
+        fixture = json.loads(args.fixture.read_text())
+    else:
+        fixture = generate_fixture(args.sequences, args.shots, args.tasks, args.assets)
+
+    if args.dump:
+        args.dump.write_text(json.dumps(fixture, indent=2))
+        print(f"Wrote fixture to {args.dump}")
+
+    server = MockKitsuServer(
+        (args.host, args.port),
+        MockKitsu(fixture),
+        args.latency,
+        args.jitter,
+        args.verbose,
+    )
+    print(
+        f"Mock Kitsu serving {len(fixture.get('sequences', []))} sequences, "
+        f"{len(fixture.get('shots', []))} shots and "
+        f"{len(fixture.get('tasks', []))} tasks on {server.url}"
+    )
+    print("Login with any email and password. Stop with Ctrl+C")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()